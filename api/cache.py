@@ -0,0 +1,122 @@
+"""
+In-process response cache for the read-heavy public endpoints.
+
+/api/stats, /api/companies, /api/collections and the first pages of
+/api/jobs only change when a crawl finishes, so their responses are cached
+per API process. Entries are keyed by the data version in site_stats
+(src/services/data_version.py): prod_scraper bumps it at the end of every
+crawl that changed jobs, and the next request on any instance sees the new
+version and drops the old entries. A size-bounded LRU plus a TTL caps
+memory and staleness for writes that don't bump the version.
+
+Settings (env): API_CACHE_SIZE entries (512, 0 disables), API_CACHE_TTL
+seconds (300), API_CACHE_VERSION_TTL seconds between data version reads (10).
+"""
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """LRU + TTL cache keyed by (endpoint, params..., data version)"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 version_ttl: Optional[float] = None):
+        self.max_entries = int(os.getenv("API_CACHE_SIZE", 512)) if max_entries is None else max_entries
+        self.ttl = float(os.getenv("API_CACHE_TTL", 300)) if ttl is None else ttl
+        self.version_ttl = float(os.getenv("API_CACHE_VERSION_TTL", 10)) if version_ttl is None else version_ttl
+
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._version_checked = 0.0
+        self.counters = Counter()
+        self.endpoint_counters: Dict[str, Counter] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    async def data_version(self, repos) -> Optional[int]:
+        """site_stats 中的数据版本，每 version_ttl 秒最多读一次；版本变化时清空缓存"""
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked < self.version_ttl:
+            return self._version
+        try:
+            version = await repos.site_stats.get_data_version()
+        except Exception:
+            # 读不到版本时沿用上一个，TTL 仍然限制过期时间
+            self.counters["version_errors"] += 1
+            return self._version
+        if version != self._version:
+            if self._version is not None:
+                self.counters["version_changes"] += 1
+            self.clear()
+            self._version = version
+        self._version_checked = now
+        return version
+
+    async def get_or_set(self, repos, key: Tuple[Hashable, ...], compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached value for key[0] (endpoint name) + params, computed on a miss
+
+        The cached object is returned as is, so callers must not mutate it.
+        Exceptions from compute propagate and nothing is cached.
+        """
+        if not self.enabled:
+            return await compute()
+
+        endpoint = self.endpoint_counters.setdefault(str(key[0]), Counter())
+        full_key = (*key, await self.data_version(repos))
+        now = time.monotonic()
+        entry = self._entries.get(full_key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(full_key)
+                self.counters["hits"] += 1
+                endpoint["hits"] += 1
+                return value
+            del self._entries[full_key]
+            self.counters["expired"] += 1
+
+        self.counters["misses"] += 1
+        endpoint["misses"] += 1
+        value = await compute()
+        self._entries[full_key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+        return value
+
+    async def invalidate(self, repos, reason: str):
+        """数据在 API 中被修改（如新增公司）：提升数据版本，让所有实例的缓存失效"""
+        self.clear()
+        try:
+            self._version = await repos.site_stats.bump_data_version(reason)
+            self._version_checked = time.monotonic()
+        except Exception:
+            self._version = None
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        """命中率等计数（/api/health 中返回）"""
+        hits, misses = self.counters["hits"], self.counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl,
+            "data_version": self._version,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            **{name: self.counters[name] for name in
+               ("hits", "misses", "expired", "evictions", "version_changes", "version_errors")},
+            "endpoints": {name: dict(counter) for name, counter in sorted(self.endpoint_counters.items())},
+        }
+
+
+# 进程内共享
+response_cache = ResponseCache()
@@ -1,7 +1,9 @@
-
 import os
-import pymongo
-from pymongo import MongoClient
+import asyncio
+import threading
+import time
+from pymongo import MongoClient, monitoring
+from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -11,12 +13,202 @@ import certifi
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
-def get_db():
-    """Get MongoDB database connection"""
-    # Use environment variable or default local URI
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters for one MongoClient (exposed on /api/health)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.total_checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "total_checkouts": self.total_checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": round(self.total_wait_ms / self.total_checkouts, 3) if self.total_checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+    def _wait_ms(self) -> float:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return (time.perf_counter() - started) * 1000 if started else 0.0
+
+    # Checkout start/finish happen on the same thread, so the wait is timed thread-locally
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            self.checked_out += 1
+            self.total_checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def connection_check_out_failed(self, event):
+        self._wait_ms()
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+
+# Process-wide clients. Each is tagged with the pid that created it so a forked
+# uvicorn worker builds its own pool instead of inheriting the parent's sockets;
+# warm serverless invocations reuse the module-level client.
+_client_lock = threading.Lock()
+_sync_client = None
+_sync_client_pid = None
+_sync_metrics = PoolMetrics()
+
+# Async client is additionally bound to the event loop it was created on
+_async_client = None
+_async_client_pid = None
+_async_client_loop = None
+_async_metrics = PoolMetrics()
+
+
+def _mongo_settings():
     mongo_uri = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/')
     db_name = os.environ.get('MONGODB_DATABASE', 'job_detector')
-    
-    # Use certifi for SSL verification
-    client = MongoClient(mongo_uri, tlsCAFile=certifi.where())
-    return client[db_name]
+    return mongo_uri, db_name
+
+
+def _pool_options() -> dict:
+    """Pool sizing / idle settings, configurable via environment"""
+    return {
+        "maxPoolSize": int(os.environ.get('MONGODB_MAX_POOL_SIZE', 50)),
+        "minPoolSize": int(os.environ.get('MONGODB_MIN_POOL_SIZE', 0)),
+        "maxIdleTimeMS": int(os.environ.get('MONGODB_MAX_IDLE_TIME_MS', 60000)),
+        "waitQueueTimeoutMS": int(os.environ.get('MONGODB_WAIT_QUEUE_TIMEOUT_MS', 10000)),
+    }
+
+
+def get_client() -> MongoClient:
+    """Get the process-wide synchronous MongoClient (created lazily)"""
+    global _sync_client, _sync_client_pid
+    pid = os.getpid()
+    if _sync_client is None or _sync_client_pid != pid:
+        with _client_lock:
+            if _sync_client is None or _sync_client_pid != pid:
+                mongo_uri, _ = _mongo_settings()
+                # Use certifi for SSL verification
+                _sync_client = MongoClient(
+                    mongo_uri,
+                    tlsCAFile=certifi.where(),
+                    event_listeners=[_sync_metrics],
+                    **_pool_options()
+                )
+                _sync_client_pid = pid
+    return _sync_client
+
+
+def get_db():
+    """Get MongoDB database connection"""
+    _, db_name = _mongo_settings()
+    return get_client()[db_name]
+
+
+def get_async_db():
+    """
+    Get the async (Motor) database used by the API routes.
+
+    The client is created lazily once per process and reused by every request.
+    Motor clients are tied to an event loop, so a new one is created if the
+    running loop changes (e.g. a fresh loop per serverless invocation).
+    """
+    global _async_client, _async_client_pid, _async_client_loop
+    mongo_uri, db_name = _mongo_settings()
+    pid = os.getpid()
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if (
+        _async_client is None
+        or _async_client_pid != pid
+        or (loop is not None and loop is not _async_client_loop)
+    ):
+        if _async_client is not None and _async_client_pid == pid:
+            _async_client.close()
+        _async_client = AsyncIOMotorClient(
+            mongo_uri,
+            tlsCAFile=certifi.where(),
+            event_listeners=[_async_metrics],
+            **_pool_options()
+        )
+        _async_client_pid = pid
+        _async_client_loop = loop
+
+    return _async_client[db_name]
+
+
+async def warm_up():
+    """Open the async pool and run a ping so the first request doesn't pay for it"""
+    await get_async_db().command('ping')
+
+
+def pool_stats() -> dict:
+    """Pool metrics for both clients"""
+    return {
+        "options": _pool_options(),
+        "async": _async_metrics.snapshot(),
+        "sync": _sync_metrics.snapshot(),
+    }
+
+
+def close_db():
+    """Close the process-wide sync client"""
+    global _sync_client, _sync_client_pid
+    with _client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+        _sync_client = None
+        _sync_client_pid = None
+
+
+def close_async_db():
+    """Close the process-wide async client"""
+    global _async_client, _async_client_pid, _async_client_loop
+    if _async_client is not None:
+        _async_client.close()
+    _async_client = None
+    _async_client_pid = None
+    _async_client_loop = None
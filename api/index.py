@@ -7,7 +7,6 @@ from pathlib import Path
 from dotenv import load_dotenv
 import re
 import secrets
-from bson import ObjectId
 
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
@@ -17,7 +16,10 @@ project_root_path = Path(__file__).parent.parent
 project_root = str(project_root_path)
 sys.path.insert(0, project_root)
 
-from api.db import get_db
+from api.cache import response_cache
+from api.db import close_async_db, close_db, pool_stats, warm_up
+from api.pagination import InvalidCursor
+from api.repositories import get_repos
 from api.email_service import get_email_service
 try:
     from api.auth_utils import (
@@ -33,6 +35,10 @@ except ImportError:
     )
 
 from src.database.models import Company, ATSSystem, CompanyMetadata
+from src.services import search
+from src.services import location as location_facets
+from src.services import job_classifier
+from src.services.company_stats import NEW_JOB_WINDOW
 from datetime import datetime, timedelta, timezone
 
 load_dotenv(dotenv_path=project_root_path / ".env")
@@ -47,6 +53,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def warm_up_database():
+    """Open the MongoDB pool before the first request arrives"""
+    try:
+        await warm_up()
+    except Exception as e:
+        # Don't block startup; the pool is created lazily on first use anyway
+        print(f"⚠️ MongoDB warm-up failed: {e}")
+
+@app.on_event("shutdown")
+async def close_database():
+    """Release the process-wide MongoDB clients"""
+    close_async_db()
+    close_db()
+
 # Serve index.html at root
 # Simple Rate Limiting State (In-memory, reset on server restart)
 rate_limit_store = {}
@@ -125,7 +146,12 @@ async def read_about():
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "ok", "message": "JobDetector API is running"}
+    return {
+        "status": "ok",
+        "message": "JobDetector API is running",
+        "db_pool": pool_stats(),
+        "cache": response_cache.stats()
+    }
 
 # Mount static folders if they exist
 # Mount static folders if they exist
@@ -153,28 +179,53 @@ async def get_jobs(
     category: Optional[str] = None,
     days: Optional[int] = None,
     companies: Optional[List[str]] = Query(None),
-    skip: int = 0,
-    limit: int = 100
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    include_total: Optional[bool] = None,
+    search_mode: Optional[str] = None
 ):
-    """Fetch jobs with search and filtering"""
-    db = get_db()
+    """
+    Fetch job cards with search and filtering
+
+    Each job is a compact card (title, company, location, dates, tags and a
+    description `snippet`); /api/jobs/{id} returns the full job.
+
+    `q` uses the stemmed search index (relevance ordered) by default.
+    search_mode=regex (or JOB_SEARCH_MODE=regex) switches back to substring
+    regex matching, which also covers jobs not yet backfilled.
+
+    Paging: pass the `next_cursor` of the previous page as `cursor`; `skip`
+    is counted from the cursor (or from the start without one). `total` is
+    only counted for the first page unless include_total=true, and is null
+    otherwise - clients keep the first page's total.
+    """
+    repos = get_repos()
     
     query = {"is_active": True}
     and_conditions = []
+    search_stems = []
     
     if q:
-        # Support multi-keyword search (AND logic)
-        terms = q.strip().split()
-        for term in terms:
-            escaped_term = re.escape(term)
-            and_conditions.append({
-                "$or": [
-                    {"title": {"$regex": escaped_term, "$options": "i"}},
-                    {"company": {"$regex": escaped_term, "$options": "i"}},
-                    {"description": {"$regex": escaped_term, "$options": "i"}},
-                    {"skills": {"$in": [re.compile(escaped_term, re.I)]}}
-                ]
-            })
+        mode = (search_mode or os.getenv("JOB_SEARCH_MODE", "index")).lower()
+        if mode != "regex":
+            search_stems = search.parse_query(q)
+
+        if search_stems:
+            query.update(search.match_stage(search_stems))
+        else:
+            # Regex fallback: support multi-keyword search (AND logic)
+            terms = q.strip().split()
+            for term in terms:
+                escaped_term = re.escape(term)
+                and_conditions.append({
+                    "$or": [
+                        {"title": {"$regex": escaped_term, "$options": "i"}},
+                        {"company": {"$regex": escaped_term, "$options": "i"}},
+                        {"description": {"$regex": escaped_term, "$options": "i"}},
+                        {"skills": {"$in": [re.compile(escaped_term, re.I)]}}
+                    ]
+                })
     
     if company:
         query["company"] = company
@@ -188,74 +239,16 @@ async def get_jobs(
     if remote_type:
         query["remote_type"] = remote_type
 
-    # Multi-location logic
+    # Multi-location logic: resolved through the gazetteer to indexed country/city/region/is_remote
     effective_locations = locations or ([location] if location else [])
     if effective_locations:
-        location_conditions = []
-        country_map = {
-            "usa": "United States|USA|U.S.",
-            "japan": "Japan|Tokyo|Osaka|Kyoto",
-            "china": "China|Shanghai|Beijing|Shenzhen",
-            "uk": "United Kingdom|UK|London",
-            "germany": "Germany|Berlin|Munich",
-            "france": "France|Paris",
-        }
-        
-        for loc in effective_locations:
-            if not loc: continue
-            
-            if loc.lower() == "remote":
-                location_conditions.append({
-                    "$or": [
-                        {"location": {"$regex": "remote", "$options": "i"}},
-                        {"remote_type": "Remote"}
-                    ]
-                })
-            else:
-                search_val = country_map.get(loc.lower(), loc)
-                location_conditions.append({
-                    "$or": [
-                        {"location": {"$regex": search_val, "$options": "i"}},
-                        {"company_location": {"$regex": search_val, "$options": "i"}}
-                    ]
-                })
-        
-        if location_conditions:
-            if len(location_conditions) == 1:
-                and_conditions.append(location_conditions[0])
-            else:
-                and_conditions.append({"$or": location_conditions})
-
-    if category:
-        # Map common categories to keywords
-        category_map = {
-            "Engineering": ["engineer", "developer", "software", "tech", "backend", "frontend", "fullstack", "infrastructure"],
-            "Product": ["product manager", "pm", "product owner"],
-            "Design": ["design", "ux", "ui", "product designer"],
-            "Marketing": ["marketing", "growth", "seo", "brand"],
-            "Sales": ["sales", "account executive", "ae", "business development"],
-            "Finance": ["finance", "accounting", "tax", "treasury"],
-            "Legal": ["legal", "law", "counsel", "compliance"],
-            "Finance": ["finance", "accounting", "tax", "treasury"],
-            "Legal": ["legal", "law", "counsel", "compliance"],
-            "People": ["people", "hr", "recruiting", "talent"],
-            "AI": [
-                "ai engineer", "artificial intelligence", "machine learning", "deep learning", 
-                "computer vision", "nlp", "natural language", "llm", "generative ai", 
-                "gpt", "ai architect", "ml engineer", "ml ops", "mlops",
-                r"\bml\b", r"\bai\b"
-            ]
-        }
-        
-        keywords = category_map.get(category)
-        if keywords:
-            category_regex = "|".join(keywords)
-            and_conditions.append({
-                "$or": [
-                    {"title": {"$regex": category_regex, "$options": "i"}},
-                    {"skills": {"$in": [re.compile(category_regex, re.I)]}}
-                ]
-            })
+        location_condition = location_facets.location_filter(effective_locations)
+        if location_condition:
+            and_conditions.append(location_condition)
+
+    if category and category in job_classifier.CATEGORY_RULES:
+        # Categories are assigned at ingestion time (indexed array)
+        query["category"] = category
 
     if days:
         from datetime import timedelta
@@ -267,12 +260,18 @@ async def get_jobs(
 
     print(f"DEBUG QUERY: {query}")
 
-    try:
-        # 1. Get total matching count (without limit)
-        total_count = db.jobs.count_documents(query)
-        
-        # 2. Get jobs sorted by date (newest first) with pagination
-        jobs = list(db.jobs.find(query).sort("posted_date", -1).skip(skip).limit(limit))
+    # Total matching count: first page only, later pages reuse it
+    if include_total is None:
+        include_total = cursor is None
+
+    async def load_page():
+        total_count = await repos.jobs.count(query) if include_total else None
+
+        # Jobs by relevance for keyword search, otherwise newest first
+        if search_stems:
+            jobs, next_cursor = await repos.jobs.search_page(query, search_stems, limit, cursor, skip)
+        else:
+            jobs, next_cursor = await repos.jobs.find_page(query, limit, cursor, skip)
         
         # Format for API (handle ObjectId and datetime)
         for job in jobs:
@@ -284,22 +283,49 @@ async def get_jobs(
                 
         return {
             "jobs": jobs,
-            "total": total_count
+            "total": total_count,
+            "next_cursor": next_cursor
         }
+
+    try:
+        if cursor is None and not skip:
+            # First pages of common listings are served from the response cache
+            cache_key = (
+                "jobs", q, company, job_type, remote_type, tuple(effective_locations), category, days,
+                tuple(sorted(companies or [])), limit, include_total, search_mode,
+            )
+            return await response_cache.get_or_set(repos, cache_key, load_page)
+        return await load_page()
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Full job for the detail view (description included, raw scrape data left out)"""
+    repos = get_repos()
+    job = await repos.jobs.find_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job["_id"] = str(job["_id"])
+    for key, value in job.items():
+        if isinstance(value, datetime):
+            job[key] = value.isoformat()
+    return job
+
 @app.get("/api/companies")
 async def get_companies(q: Optional[str] = None):
     """Fetch all companies with search"""
-    db = get_db()
+    repos = get_repos()
     query = {}
     if q:
         query["name"] = {"$regex": q, "$options": "i"}
     
-    try:
+    async def load_companies():
         # Fetch all companies (MongoDB sort on nested fields can be unreliable)
-        companies = list(db.companies.find(query))
+        companies = await repos.companies.find(query)
         
         # Sort in Python: first by active_jobs descending, then by name ascending
         companies.sort(key=lambda c: (-c.get('stats', {}).get('active_jobs', 0), c.get('name', '')))
@@ -312,20 +338,34 @@ async def get_companies(q: Optional[str] = None):
             if not comp.get("stats"):
                 comp["stats"] = {"active_jobs": 0, "total_jobs_found": 0}
         return companies
+
+    try:
+        return await response_cache.get_or_set(repos, ("companies", q), load_companies)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/companies/{company_name}/jobs")
-async def get_company_jobs(company_name: str):
-    """Fetch jobs for a specific company"""
-    db = get_db()
+async def get_company_jobs(
+    company_name: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Fetch jobs for a specific company, newest first, one cursor page at a time"""
+    repos = get_repos()
     try:
-        jobs = list(db.jobs.find({"company": company_name, "is_active": True}).sort("posted_date", -1))
+        total_count = None if cursor else await repos.jobs.count({"company": company_name, "is_active": True})
+        jobs, next_cursor = await repos.jobs.find_by_company(company_name, limit, cursor)
         for job in jobs:
             job["_id"] = str(job["_id"])
             if job.get("posted_date"):
                 job["posted_date"] = job["posted_date"].isoformat() if hasattr(job["posted_date"], "isoformat") else str(job["posted_date"])
-        return jobs
+        return {
+            "jobs": jobs,
+            "total": total_count,
+            "next_cursor": next_cursor
+        }
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -343,9 +383,9 @@ async def register(request: Request):
     if not email or not password:
         raise HTTPException(status_code=400, detail="Email and password required")
 
-    db = get_db()
+    repos = get_repos()
     # Check if user exists
-    if db.users.find_one({"email": email}):
+    if await repos.users.find_by_email(email):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Generate verification token
@@ -363,7 +403,7 @@ async def register(request: Request):
         "verification_token_expires": verification_expires
     }
     
-    db.users.insert_one(user_doc)
+    await repos.users.insert(user_doc)
     
     # Send verification email
     base_url = os.getenv("BASE_URL", "http://localhost:8123")
@@ -384,8 +424,8 @@ async def login(request: Request):
     email = data.get("email")
     password = data.get("password")
 
-    db = get_db()
-    user = db.users.find_one({"email": email})
+    repos = get_repos()
+    user = await repos.users.find_by_email(email)
     
     if not user or not verify_password(password, user["hashed_password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
@@ -407,10 +447,10 @@ async def login(request: Request):
 @app.get("/api/auth/verify-email")
 async def verify_email(token: str = Query(...)):
     """Verify user email with token"""
-    db = get_db()
+    repos = get_repos()
     
     # Find user with this verification token
-    user = db.users.find_one({"verification_token": token})
+    user = await repos.users.find_by_verification_token(token)
     
     if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired verification token")
@@ -420,8 +460,8 @@ async def verify_email(token: str = Query(...)):
         raise HTTPException(status_code=400, detail="Verification token has expired. Please request a new one.")
     
     # Update user as verified
-    db.users.update_one(
-        {"_id": user["_id"]},
+    await repos.users.update(
+        user["_id"],
         {
             "$set": {"is_verified": True},
             "$unset": {"verification_token": "", "verification_token_expires": ""}
@@ -445,8 +485,8 @@ async def forgot_password(request: Request):
         print("Error: No email provided in request")
         raise HTTPException(status_code=400, detail="Email required")
     
-    db = get_db()
-    user = db.users.find_one({"email": email})
+    repos = get_repos()
+    user = await repos.users.find_by_email(email)
     
     # Don't reveal if email exists or not (security best practice)
     if not user:
@@ -460,8 +500,8 @@ async def forgot_password(request: Request):
     
     # Save reset token
     print("Saving reset token to DB...")
-    db.users.update_one(
-        {"_id": user["_id"]},
+    await repos.users.update(
+        user["_id"],
         {
             "$set": {
                 "reset_token": reset_token,
@@ -494,10 +534,10 @@ async def reset_password(request: Request):
     if not token or not new_password:
         raise HTTPException(status_code=400, detail="Token and new password required")
     
-    db = get_db()
+    repos = get_repos()
     
     # Find user with this reset token
-    user = db.users.find_one({"reset_token": token})
+    user = await repos.users.find_by_reset_token(token)
     
     if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
@@ -507,8 +547,8 @@ async def reset_password(request: Request):
         raise HTTPException(status_code=400, detail="Reset token has expired. Please request a new one.")
     
     # Update password and remove reset token
-    db.users.update_one(
-        {"_id": user["_id"]},
+    await repos.users.update(
+        user["_id"],
         {
             "$set": {"hashed_password": get_password_hash(new_password)},
             "$unset": {"reset_token": "", "reset_token_expires": ""}
@@ -533,8 +573,8 @@ async def get_me(request: Request):
     if not email:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    db = get_db()
-    user = db.users.find_one({"email": email})
+    repos = get_repos()
+    user = await repos.users.find_by_email(email)
     
     if not user:
         # User might have been deleted
@@ -568,9 +608,9 @@ async def get_saved_searches(request: Request):
         raise HTTPException(status_code=401, detail="Invalid token")
     
     email = payload.get("sub")
-    db = get_db()
+    repos = get_repos()
     
-    searches = list(db.saved_searches.find({"user_email": email}))
+    searches = await repos.saved_searches.list_for_user(email)
     for s in searches:
         s["id"] = str(s["_id"])
         del s["_id"]
@@ -603,10 +643,10 @@ async def save_search(request: Request):
     if not name:
         raise HTTPException(status_code=400, detail="Search name is required")
         
-    db = get_db()
+    repos = get_repos()
     
     # Limit to 5
-    count = db.saved_searches.count_documents({"user_email": email})
+    count = await repos.saved_searches.count_for_user(email)
     if count >= 5:
         raise HTTPException(status_code=400, detail="Maximum 5 saved searches allowed")
         
@@ -619,7 +659,7 @@ async def save_search(request: Request):
         "last_emailed_at": None
     }
     
-    res = db.saved_searches.insert_one(search_doc)
+    res = await repos.saved_searches.insert(search_doc)
     return {"message": "Search saved", "id": str(res.inserted_id)}
 
 @app.delete("/api/user/searches/{search_id}")
@@ -635,8 +675,8 @@ async def delete_search(search_id: str, request: Request):
         raise HTTPException(status_code=401, detail="Invalid token")
     email = payload.get("sub")
     
-    db = get_db()
-    res = db.saved_searches.delete_one({"_id": ObjectId(search_id), "user_email": email})
+    repos = get_repos()
+    res = await repos.saved_searches.delete(search_id, email)
     
     if res.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Search not found")
@@ -657,77 +697,70 @@ async def update_search(search_id: str, request: Request):
     data = await request.json()
     email_alert = data.get("email_alert")
     
-    db = get_db()
+    repos = get_repos()
     update_data = {}
     if email_alert is not None:
         update_data["email_alert"] = email_alert
         
-    res = db.saved_searches.update_one(
-        {"_id": ObjectId(search_id), "user_email": email},
-        {"$set": update_data}
-    )
+    res = await repos.saved_searches.update(search_id, email, update_data)
     
     if res.matched_count == 0:
         raise HTTPException(status_code=404, detail="Search not found")
         
     return {"message": "Search updated"}
-    
-    db = get_db()
-    user = db.users.find_one({"email": payload["sub"]})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-        
-    return {
-        "email": user["email"],
-        "full_name": user.get("full_name"),
-        "created_at": user["created_at"].isoformat() if hasattr(user.get("created_at"), "isoformat") else str(user.get("created_at", ""))
-    }
 
 @app.get("/api/collections")
 async def get_collections():
     """Fetch all curated job collections"""
-    db = get_db()
-    collections = list(db.collections.find({}, {"_id": 0}))
-    return collections
+    repos = get_repos()
+    return await response_cache.get_or_set(repos, ("collections",), repos.collections.list_all)
 
 @app.get("/api/stats")
 async def get_stats():
     """Get dashboard stats"""
-    db = get_db()
-    try:
-        total_jobs = db.jobs.count_documents({"is_active": True})
+    repos = get_repos()
+
+    async def load_stats():
+        # Per-company counts precomputed after each crawl (src/services/company_stats.py)
+        rows = await repos.company_stats.with_active_jobs()
+        if rows:
+            return {
+                "total_jobs": sum(r["active_jobs"] for r in rows),
+                "company_stats": [{"_id": r["_id"], "count": r["active_jobs"]} for r in rows],
+                "remote_count": sum(r.get("remote_jobs", 0) for r in rows),
+                "new_jobs_this_week": sum(r.get("new_jobs_this_week", 0) for r in rows)
+            }
+
+        # company_stats not built yet (no crawl / sync since deploy): group the jobs live
+        total_jobs = await repos.jobs.count({"is_active": True})
         
         # Distribution by company
-        company_pipeline = [
-            {"$match": {"is_active": True}},
-            {"$group": {"_id": "$company", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        company_stats = list(db.jobs.aggregate(company_pipeline))
+        company_stats = await repos.jobs.company_distribution()
         
         # Remote counts
-        remote_count = db.jobs.count_documents({"is_active": True, "remote_type": "Remote"})
+        remote_count = await repos.jobs.count({"is_active": True, "remote_type": "Remote"})
+
+        new_jobs_this_week = await repos.jobs.count_new_since(datetime.utcnow() - NEW_JOB_WINDOW)
         
         return {
             "total_jobs": total_jobs,
             "company_stats": company_stats,
-            "remote_count": remote_count
+            "remote_count": remote_count,
+            "new_jobs_this_week": new_jobs_this_week
         }
+
+    try:
+        return await response_cache.get_or_set(repos, ("stats",), load_stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/stats/visit")
 async def record_visit(request: Request):
     """Increment global visit count and log detailed visitor info"""
-    db = get_db()
+    repos = get_repos()
     try:
         # 1. Atomic increment of global counter
-        result = db.site_stats.find_one_and_update(
-            {"_id": "global"},
-            {"$inc": {"visits": 1}},
-            upsert=True,
-            return_document=True
-        ) or {"visits": 0}
+        result = await repos.visitor_logs.increment_visits()
 
         # 2. Detailed logging
         visitor_info = {
@@ -740,15 +773,14 @@ async def record_visit(request: Request):
         }
         
         # Insert log asynchronously (fire and forget pattern if possible, but here we just wait)
-        db.visitor_logs.insert_one(visitor_info)
+        await repos.visitor_logs.insert(visitor_info)
         
         return {"visits": result.get("visits", 0)}
     except Exception as e:
         print(f"Detailed visit logging error: {e}")
         # Still try to return the global count if possible
         try:
-            stats = db.site_stats.find_one({"_id": "global"})
-            return {"visits": stats.get("visits", 0) if stats else 0}
+            return {"visits": await repos.visitor_logs.get_visits()}
         except:
             return {"visits": 0}
 
@@ -758,26 +790,21 @@ async def get_visitor_stats(request: Request, limit: int = 50):
     # Simple check for now - can be enhanced with proper auth
     # For now, we'll just allow it if it's coming from a local dev machine or has a specific secret 
     # (In a real app, this would be behind @login_required + admin role)
-    db = get_db()
+    repos = get_repos()
     try:
         # Get recent logs
-        logs = list(db.visitor_logs.find().sort("timestamp", -1).limit(limit))
+        logs = await repos.visitor_logs.recent(limit)
         for log in logs:
             log["_id"] = str(log["_id"])
             
         # Basic aggregation for stats
-        total_visits = db.visitor_logs.count_documents({})
+        total_visits = await repos.visitor_logs.count()
         
         # Unique visitors (by IP)
-        unique_ips = len(db.visitor_logs.distinct("ip_address"))
+        unique_ips = await repos.visitor_logs.unique_ips()
         
         # Top referrers
-        referrer_pipeline = [
-            {"$group": {"_id": "$referrer", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]
-        top_referrers = list(db.visitor_logs.aggregate(referrer_pipeline))
+        top_referrers = await repos.visitor_logs.top_referrers(10)
         
         return {
             "total_logs": total_visits,
@@ -802,10 +829,10 @@ async def get_favorites(request: Request):
         raise HTTPException(status_code=401, detail="Invalid token")
     email = payload.get("sub")
     
-    db = get_db()
+    repos = get_repos()
     
     # Get favorite records
-    favorites = list(db.user_favorites.find({"user_email": email}))
+    favorites = await repos.favorites.list_for_user(email)
     
     if not favorites:
         return []
@@ -813,7 +840,7 @@ async def get_favorites(request: Request):
     company_names = [f["company_name"] for f in favorites]
     
     # Fetch full company details
-    companies = list(db.companies.find({"name": {"$in": company_names}}))
+    companies = await repos.companies.find_by_names(company_names)
     
     for comp in companies:
         comp["_id"] = str(comp["_id"])
@@ -868,7 +895,8 @@ async def add_favorite(request: Request):
             is_monitor = True # Fallback to monitor
     
     # Check if company exists in master DB
-    existing_company = db.companies.find_one({"name": {"$regex": f"^{final_company_name}$", "$options": "i"}})
+    repos = get_repos()
+    existing_company = await repos.companies.find_by_name_ci(final_company_name)
     
     if existing_company:
         final_company_id = existing_company.get('company_id')
@@ -882,7 +910,8 @@ async def add_favorite(request: Request):
             update_fields['ats_system'] = {'type': ats_type, 'detected_at': datetime.now(timezone.utc).replace(tzinfo=None)}
             
         if update_fields:
-            db.companies.update_one({'_id': existing_company['_id']}, {'$set': update_fields})
+            await repos.companies.update_fields(existing_company['_id'], update_fields)
+            await response_cache.invalidate(repos, "company updated")
             
     else:
         # Create new company record stub
@@ -903,8 +932,9 @@ async def add_favorite(request: Request):
             is_active=True
         )
         
-        res = db.companies.insert_one(new_company.to_dict())
+        res = await repos.companies.insert(new_company.to_dict())
         final_company_id = str(res.inserted_id)
+        await response_cache.invalidate(repos, "company added")
         
     # Upsert User Favorite
     fav_entry = {
@@ -916,13 +946,7 @@ async def add_favorite(request: Request):
         fav_entry['monitor_url'] = monitor_url
         fav_entry['last_checked_at'] = None
         
-    db.user_favorites.update_one(
-        {"user_email": email, "company_name": final_company_name},
-        {
-            "$set": fav_entry
-        },
-        upsert=True
-    )
+    await repos.favorites.upsert(email, final_company_name, fav_entry)
     
     return {
         "status": "success", 
@@ -952,7 +976,7 @@ async def submit_feedback(data: dict, request: Request):
         if payload:
             user_email = payload.get("sub")
 
-    db = get_db()
+    repos = get_repos()
     feedback_doc = {
         "content": content,
         "provided_email": email,
@@ -962,7 +986,7 @@ async def submit_feedback(data: dict, request: Request):
         "status": "new"
     }
     
-    db.user_feedbacks.insert_one(feedback_doc)
+    await repos.feedbacks.insert(feedback_doc)
     return {"message": "Feedback submitted successfully"}
 
 @app.get("/api/admin/feedbacks")
@@ -983,17 +1007,14 @@ async def get_feedbacks(request: Request, page: int = 1, limit: int = 10):
     # Case-insensitive check
     is_admin = (admin_email and email.lower() == admin_email.lower())
     
-    if not is_admin:
-        # Fallback: check if the user has is_admin=True in the DB
-        db = get_db()
-        user = db.users.find_one({"email": email})
-        if not user or not user.get("is_admin"):
-            raise HTTPException(status_code=403, detail="Forbidden: Admin only")
+    repos = get_repos()
+    # Fallback: check if the user has is_admin=True in the DB
+    if not is_admin and not await repos.users.is_admin(email):
+        raise HTTPException(status_code=403, detail="Forbidden: Admin only")
 
-    db = get_db()
-    total = db.user_feedbacks.count_documents({})
+    total = await repos.feedbacks.count()
     skip = (page - 1) * limit
-    feedbacks = list(db.user_feedbacks.find().sort("created_at", -1).skip(skip).limit(limit))
+    feedbacks = await repos.feedbacks.find_page(skip, limit)
     
     for f in feedbacks:
         f["_id"] = str(f["_id"])
@@ -1021,15 +1042,12 @@ async def delete_feedback(feedback_id: str, request: Request):
     admin_email = os.getenv("ADMIN_EMAIL")
     is_admin = (admin_email and email.lower() == admin_email.lower())
     
-    if not is_admin:
-        db = get_db()
-        user = db.users.find_one({"email": email})
-        if not user or not user.get("is_admin"):
-            raise HTTPException(status_code=403, detail="Forbidden: Admin only")
+    repos = get_repos()
+    if not is_admin and not await repos.users.is_admin(email):
+        raise HTTPException(status_code=403, detail="Forbidden: Admin only")
 
-    db = get_db()
     try:
-        result = db.user_feedbacks.delete_one({"_id": ObjectId(feedback_id)})
+        result = await repos.feedbacks.delete(feedback_id)
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Feedback not found")
         return {"message": "Feedback deleted successfully"}
@@ -1058,18 +1076,15 @@ async def request_company(request: Request):
     if not company_name:
         raise HTTPException(status_code=400, detail="Company name is required")
 
-    db = get_db()
+    repos = get_repos()
     
     # 1. Check if already exists in active companies
-    existing = db.companies.find_one({"name": {"$regex": f"^{company_name}$", "$options": "i"}})
+    existing = await repos.companies.find_by_name_ci(company_name)
     if existing:
         raise HTTPException(status_code=400, detail="This company is already being crawled")
 
     # 2. Check if already in requests
-    existing_req = db.company_requests.find_one({
-        "name": {"$regex": f"^{company_name}$", "$options": "i"},
-        "status": "pending"
-    })
+    existing_req = await repos.company_requests.find_pending_by_name(company_name)
     if existing_req:
         raise HTTPException(status_code=400, detail="A request for this company is already pending")
 
@@ -1081,7 +1096,7 @@ async def request_company(request: Request):
         "created_at": datetime.utcnow()
     }
     
-    db.company_requests.insert_one(request_doc)
+    await repos.company_requests.insert(request_doc)
     return {"message": "Request submitted successfully. Our team will review it soon."}
 
 @app.get("/api/admin/company-requests")
@@ -1100,14 +1115,11 @@ async def get_company_requests(request: Request):
     admin_email = os.getenv("ADMIN_EMAIL")
     is_admin = (admin_email and email.lower() == admin_email.lower())
     
-    if not is_admin:
-        db = get_db()
-        user = db.users.find_one({"email": email})
-        if not user or not user.get("is_admin"):
-            raise HTTPException(status_code=403, detail="Forbidden: Admin only")
+    repos = get_repos()
+    if not is_admin and not await repos.users.is_admin(email):
+        raise HTTPException(status_code=403, detail="Forbidden: Admin only")
 
-    db = get_db()
-    requests = list(db.company_requests.find().sort("created_at", -1))
+    requests = await repos.company_requests.list_all()
     for r in requests:
         r["_id"] = str(r["_id"])
     return requests
@@ -1128,11 +1140,9 @@ async def process_company_request(request_id: str, request: Request):
     admin_email = os.getenv("ADMIN_EMAIL")
     is_admin = (admin_email and email.lower() == admin_email.lower())
     
-    if not is_admin:
-        db = get_db()
-        user = db.users.find_one({"email": email})
-        if not user or not user.get("is_admin"):
-            raise HTTPException(status_code=403, detail="Forbidden: Admin only")
+    repos = get_repos()
+    if not is_admin and not await repos.users.is_admin(email):
+        raise HTTPException(status_code=403, detail="Forbidden: Admin only")
 
     data = await request.json()
     action = data.get("action") # "approve" or "reject"
@@ -1140,8 +1150,7 @@ async def process_company_request(request_id: str, request: Request):
     if action not in ["approve", "reject"]:
         raise HTTPException(status_code=400, detail="Invalid action. Use 'approve' or 'reject'.")
 
-    db = get_db()
-    req_doc = db.company_requests.find_one({"_id": ObjectId(request_id)})
+    req_doc = await repos.company_requests.get(request_id)
     if not req_doc:
         raise HTTPException(status_code=404, detail="Request not found")
 
@@ -1163,11 +1172,12 @@ async def process_company_request(request_id: str, request: Request):
                 "tags": ["User Requested"]
             }
         }
-        db.companies.insert_one(new_company)
-        db.company_requests.update_one({"_id": ObjectId(request_id)}, {"$set": {"status": "approved"}})
+        await repos.companies.insert(new_company)
+        await repos.company_requests.set_status(request_id, "approved")
+        await response_cache.invalidate(repos, "company request approved")
         return {"message": f"Company '{req_doc['name']}' approved and added to crawl queue."}
     else:
-        db.company_requests.update_one({"_id": ObjectId(request_id)}, {"$set": {"status": "rejected"}})
+        await repos.company_requests.set_status(request_id, "rejected")
         return {"message": "Request rejected."}
 
 @app.post("/api/user/favorites/{company_name}/check")
@@ -1181,11 +1191,11 @@ async def check_monitor(company_name: str, request: Request):
     payload = decode_access_token(token)
     email = payload.get("sub")
     
-    db = get_db()
+    repos = get_repos()
     
-    result = db.user_favorites.update_one(
-        {"user_email": email, "company_name": company_name},
-        {"$set": {"last_checked_at": datetime.now(timezone.utc).replace(tzinfo=None)}}
+    result = await repos.favorites.update(
+        email, company_name,
+        {"last_checked_at": datetime.now(timezone.utc).replace(tzinfo=None)}
     )
     
     if result.matched_count == 0:
@@ -1204,11 +1214,8 @@ async def remove_favorite(company_name: str, request: Request):
     payload = decode_access_token(token)
     email = payload.get("sub")
     
-    db = get_db()
-    db.user_favorites.delete_one({
-        "user_email": email, 
-        "company_name": company_name
-    })
+    repos = get_repos()
+    await repos.favorites.delete(email, company_name)
     
     return {"message": "Removed from favorites"}
 
@@ -1300,9 +1307,9 @@ async def run_personal_digest(request: Request):
 async def get_digest_settings(request: Request):
     """Get current user's digest subscription settings."""
     email = _get_user_email_from_request(request)
-    db = get_db()
+    repos = get_repos()
     
-    settings = db.user_digest_settings.find_one({"user_email": email})
+    settings = await repos.digests.get_settings(email)
     if not settings:
         # Default settings for new users
         return {
@@ -1327,18 +1334,12 @@ async def update_digest_settings(request: Request):
     frequency = data.get("frequency", "off") # daily, weekly, off
     is_active = data.get("is_active", frequency != "off")
     
-    db = get_db()
-    db.user_digest_settings.update_one(
-        {"user_email": email},
-        {
-            "$set": {
-                "frequency": frequency,
-                "is_active": is_active,
-                "updated_at": datetime.now(timezone.utc).replace(tzinfo=None)
-            }
-        },
-        upsert=True
-    )
+    repos = get_repos()
+    await repos.digests.upsert_settings(email, {
+        "frequency": frequency,
+        "is_active": is_active,
+        "updated_at": datetime.now(timezone.utc).replace(tzinfo=None)
+    })
     
     return {"status": "success", "message": "Subscription settings updated"}
 
@@ -1348,9 +1349,9 @@ async def get_digest_log(request: Request, limit: int = 20):
     """Return recent digest run history. Admin only."""
     _get_user_email_from_request(request)
 
-    db = get_db()
+    repos = get_repos()
     try:
-        logs = list(db.digest_log.find().sort("run_at", -1).limit(limit))
+        logs = await repos.digests.recent_logs(limit)
         for log in logs:
             log["_id"] = str(log["_id"])
             if log.get("run_at") and hasattr(log["run_at"], "isoformat"):
@@ -0,0 +1,85 @@
+"""
+Keyset (cursor) pagination for job listings.
+
+Pages are ordered by a list of descending sort keys that always ends with
+_id, so every position is unique. The cursor is the sort-key values of the
+last row on a page, base64 encoded; the next page starts with a range seek
+on the matching compound index instead of skipping over the earlier rows.
+
+Missing / null values (jobs without posted_date) sort last in a descending
+MongoDB sort, so the seek treats them as smaller than any value.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not issued by this API (or the sort keys changed)"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$date" in value:
+            return datetime.fromisoformat(value["$date"])
+        if "$oid" in value:
+            return ObjectId(value["$oid"])
+        raise ValueError(f"unknown cursor value {value!r}")
+    return value
+
+
+def encode_cursor(doc: Dict, keys: Sequence[str]) -> str:
+    """Cursor pointing just after `doc` (a raw document, before API formatting)"""
+    payload = [_encode_value(doc.get(key)) for key in keys]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(v) for v in json.loads(raw)]
+    except (binascii.Error, ValueError, TypeError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+    if len(values) != len(keys):
+        raise InvalidCursor("Invalid cursor: sort keys do not match")
+    return values
+
+
+def seek_after(keys: Sequence[str], values: Sequence[Any]) -> Dict:
+    """
+    Match the rows after (keys = values) in a descending sort on all keys
+
+    (a, b, _id) < (va, vb, vid) expands to
+        a < va  OR  (a = va AND b < vb)  OR  (a = va AND b = vb AND _id < vid)
+    where "x < None" never matches and "x < v" also matches nulls.
+    """
+    branches = []
+    equal: Dict = {}
+    for key, value in zip(keys, values):
+        if value is not None:
+            branches.append({**equal, key: {"$lt": value}})
+            if key != "_id":
+                branches.append({**equal, key: None})
+        equal[key] = value
+    return {"$or": branches} if branches else {"_id": {"$exists": False}}
+
+
+def with_condition(query: Dict, condition: Optional[Dict]) -> Dict:
+    """AND an extra condition into a query without touching the caller's dict"""
+    if not condition:
+        return query
+    return {**query, "$and": [*query.get("$and", []), condition]}
@@ -0,0 +1,397 @@
+"""
+Async data access layer for the API.
+
+All route handlers go through these repositories instead of calling pymongo
+directly, so database I/O never blocks the event loop.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from api import pagination
+from api.db import get_async_db
+from src.services import search
+from src.services.data_version import DATA_VERSION_ID
+
+
+# 检索词数组只用于查询，不返回给前端
+HIDDEN_JOB_FIELDS = {field: 0 for field in search.SEARCH_FIELDS}
+# 抓取器内部状态（board ETag / 摘要、熔断计数），不返回给前端
+HIDDEN_COMPANY_FIELDS = {"board_cache": 0, "circuit_breaker": 0}
+
+# 列表页只返回卡片需要的字段；描述只取开头一段作为摘要，完整描述走 /api/jobs/{id}
+SNIPPET_CHARS = 240
+JOB_CARD_FIELDS = {
+    **{field: 1 for field in (
+        "job_id", "title", "company", "location", "job_type", "remote_type", "category",
+        "skills", "salary", "source", "source_url", "posted_date", "scraped_at",
+    )},
+    "snippet": {"$substrCP": [{"$ifNull": ["$description", ""]}, 0, SNIPPET_CHARS]},
+}
+# 详情页不需要抓取时的原始响应（Ashby 的 raw_data 含整段 descriptionHtml）
+JOB_DETAIL_HIDDEN_FIELDS = {**HIDDEN_JOB_FIELDS, "raw_data": 0}
+
+# 列表排序键（全部降序），_id 保证排序唯一，游标分页依赖这一点
+JOB_SORT_KEYS = ("posted_date", "_id")
+JOB_SORT = [(key, -1) for key in JOB_SORT_KEYS]
+SEARCH_SORT_KEYS = ("_score", "posted_date", "_id")
+
+
+class JobRepository:
+    """jobs collection"""
+
+    def __init__(self, db):
+        self.collection = db.jobs
+
+    async def count(self, query: Dict) -> int:
+        return await self.collection.count_documents(query)
+
+    async def find_by_id(self, job_id: str) -> Optional[Dict]:
+        """Full job (with description) for the detail view; None for unknown / malformed ids"""
+        if not ObjectId.is_valid(job_id):
+            return None
+        return await self.collection.find_one({"_id": ObjectId(job_id)}, JOB_DETAIL_HIDDEN_FIELDS)
+
+    async def find_page(self, query: Dict, limit: int = 100, cursor: Optional[str] = None,
+                        skip: int = 0) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of job cards, newest first, plus the cursor of the next page (None on the last page)
+
+        With a cursor the page starts with a range seek on
+        (is_active, posted_date, _id); `skip` is then counted from the cursor.
+        """
+        if cursor:
+            query = pagination.with_condition(
+                query, pagination.seek_after(JOB_SORT_KEYS, pagination.decode_cursor(cursor, JOB_SORT_KEYS))
+            )
+        found = self.collection.find(query, JOB_CARD_FIELDS).sort(JOB_SORT).skip(skip).limit(limit + 1)
+        jobs = await found.to_list(length=None)
+        return self._page(jobs, limit, JOB_SORT_KEYS)
+
+    async def search_page(self, query: Dict, stems: List[str], limit: int = 100, cursor: Optional[str] = None,
+                          skip: int = 0) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Keyword search over the search index, ordered by relevance then recency.
+
+        `query` must already contain search.match_stage(stems) so only matching
+        documents are scored. The cursor carries the relevance score as well.
+        """
+        pipeline = [
+            {"$match": query},
+            {"$addFields": {"_score": search.score_expression(stems)}},
+        ]
+        if cursor:
+            values = pagination.decode_cursor(cursor, SEARCH_SORT_KEYS)
+            pipeline.append({"$match": pagination.seek_after(SEARCH_SORT_KEYS, values)})
+        pipeline += [
+            {"$sort": {key: -1 for key in SEARCH_SORT_KEYS}},
+            {"$skip": skip},
+            {"$limit": limit + 1},
+            {"$project": {**JOB_CARD_FIELDS, "_score": 1}},
+        ]
+        jobs = await self.collection.aggregate(pipeline).to_list(length=None)
+        jobs, next_cursor = self._page(jobs, limit, SEARCH_SORT_KEYS)
+        for job in jobs:
+            job.pop("_score", None)
+        return jobs, next_cursor
+
+    @staticmethod
+    def _page(jobs: List[Dict], limit: int, keys) -> Tuple[List[Dict], Optional[str]]:
+        """多取的一行只用来判断是否还有下一页"""
+        if len(jobs) <= limit:
+            return jobs, None
+        jobs = jobs[:limit]
+        return jobs, pagination.encode_cursor(jobs[-1], keys)
+
+    async def find_by_company(self, company_name: str, limit: int = 100,
+                              cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        return await self.find_page({"company": company_name, "is_active": True}, limit, cursor)
+
+    async def company_distribution(self) -> List[Dict]:
+        """Live grouping; /api/stats only uses it until company_stats has been built"""
+        pipeline = [
+            {"$match": {"is_active": True}},
+            {"$group": {"_id": "$company", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+    async def count_new_since(self, since: datetime) -> int:
+        """
+        Live count of active jobs posted since `since` (first crawl time, i.e. the
+        _id timestamp, when there is no posted_date) - same rule as company_stats
+        """
+        return await self.count({"is_active": True, "$or": [
+            {"posted_date": {"$gte": since}},
+            {"posted_date": None, "_id": {"$gte": ObjectId.from_datetime(since)}},
+        ]})
+
+
+class CompanyRepository:
+    """companies collection"""
+
+    def __init__(self, db):
+        self.collection = db.companies
+
+    async def find(self, query: Optional[Dict] = None) -> List[Dict]:
+        return await self.collection.find(query or {}, HIDDEN_COMPANY_FIELDS).to_list(length=None)
+
+    async def find_by_names(self, names: List[str]) -> List[Dict]:
+        return await self.collection.find({"name": {"$in": names}}, HIDDEN_COMPANY_FIELDS).to_list(length=None)
+
+    async def find_by_name_ci(self, name: str) -> Optional[Dict]:
+        """Case-insensitive exact name lookup"""
+        return await self.collection.find_one({"name": {"$regex": f"^{name}$", "$options": "i"}})
+
+    async def insert(self, doc: Dict):
+        return await self.collection.insert_one(doc)
+
+    async def update_fields(self, company_id, fields: Dict):
+        return await self.collection.update_one({"_id": company_id}, {"$set": fields})
+
+
+class CompanyStatsRepository:
+    """company_stats collection, rebuilt after every crawl by src/services/company_stats.py"""
+
+    def __init__(self, db):
+        self.collection = db.company_stats
+
+    async def with_active_jobs(self) -> List[Dict]:
+        cursor = self.collection.find(
+            {"active_jobs": {"$gt": 0}}, {"active_jobs": 1, "new_jobs_this_week": 1, "remote_jobs": 1}
+        ).sort("active_jobs", -1)
+        return await cursor.to_list(length=None)
+
+
+class UserRepository:
+    """users collection"""
+
+    def __init__(self, db):
+        self.collection = db.users
+
+    async def find_by_email(self, email: str) -> Optional[Dict]:
+        return await self.collection.find_one({"email": email})
+
+    async def find_by_verification_token(self, token: str) -> Optional[Dict]:
+        return await self.collection.find_one({"verification_token": token})
+
+    async def find_by_reset_token(self, token: str) -> Optional[Dict]:
+        return await self.collection.find_one({"reset_token": token})
+
+    async def insert(self, doc: Dict):
+        return await self.collection.insert_one(doc)
+
+    async def update(self, user_id, update: Dict):
+        return await self.collection.update_one({"_id": user_id}, update)
+
+    async def is_admin(self, email: str) -> bool:
+        user = await self.find_by_email(email)
+        return bool(user and user.get("is_admin"))
+
+
+class SavedSearchRepository:
+    """saved_searches collection"""
+
+    def __init__(self, db):
+        self.collection = db.saved_searches
+
+    async def list_for_user(self, email: str) -> List[Dict]:
+        return await self.collection.find({"user_email": email}).to_list(length=None)
+
+    async def count_for_user(self, email: str) -> int:
+        return await self.collection.count_documents({"user_email": email})
+
+    async def insert(self, doc: Dict):
+        return await self.collection.insert_one(doc)
+
+    async def delete(self, search_id: str, email: str):
+        return await self.collection.delete_one({"_id": ObjectId(search_id), "user_email": email})
+
+    async def update(self, search_id: str, email: str, fields: Dict):
+        return await self.collection.update_one(
+            {"_id": ObjectId(search_id), "user_email": email},
+            {"$set": fields}
+        )
+
+
+class FavoriteRepository:
+    """user_favorites collection"""
+
+    def __init__(self, db):
+        self.collection = db.user_favorites
+
+    async def list_for_user(self, email: str) -> List[Dict]:
+        return await self.collection.find({"user_email": email}).to_list(length=None)
+
+    async def upsert(self, email: str, company_name: str, fields: Dict):
+        return await self.collection.update_one(
+            {"user_email": email, "company_name": company_name},
+            {"$set": fields},
+            upsert=True
+        )
+
+    async def update(self, email: str, company_name: str, fields: Dict):
+        return await self.collection.update_one(
+            {"user_email": email, "company_name": company_name},
+            {"$set": fields}
+        )
+
+    async def delete(self, email: str, company_name: str):
+        return await self.collection.delete_one({"user_email": email, "company_name": company_name})
+
+
+class VisitorLogRepository:
+    """visitor_logs collection and the global visit counter in site_stats"""
+
+    def __init__(self, db):
+        self.collection = db.visitor_logs
+        self.site_stats = db.site_stats
+
+    async def increment_visits(self) -> Dict:
+        return await self.site_stats.find_one_and_update(
+            {"_id": "global"},
+            {"$inc": {"visits": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        ) or {"visits": 0}
+
+    async def get_visits(self) -> int:
+        stats = await self.site_stats.find_one({"_id": "global"})
+        return stats.get("visits", 0) if stats else 0
+
+    async def insert(self, doc: Dict):
+        return await self.collection.insert_one(doc)
+
+    async def recent(self, limit: int = 50) -> List[Dict]:
+        return await self.collection.find().sort("timestamp", -1).limit(limit).to_list(length=None)
+
+    async def count(self) -> int:
+        return await self.collection.count_documents({})
+
+    async def unique_ips(self) -> int:
+        return len(await self.collection.distinct("ip_address"))
+
+    async def top_referrers(self, limit: int = 10) -> List[Dict]:
+        pipeline = [
+            {"$group": {"_id": "$referrer", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": limit}
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+
+class SiteStatsRepository:
+    """site_stats collection: data version for the API response cache"""
+
+    def __init__(self, db):
+        self.collection = db.site_stats
+
+    async def get_data_version(self) -> int:
+        doc = await self.collection.find_one({"_id": DATA_VERSION_ID}, {"version": 1})
+        return doc.get("version", 0) if doc else 0
+
+    async def bump_data_version(self, reason: str) -> int:
+        doc = await self.collection.find_one_and_update(
+            {"_id": DATA_VERSION_ID},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow(), "reason": reason}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["version"]
+
+
+class FeedbackRepository:
+    """user_feedbacks collection"""
+
+    def __init__(self, db):
+        self.collection = db.user_feedbacks
+
+    async def insert(self, doc: Dict):
+        return await self.collection.insert_one(doc)
+
+    async def count(self) -> int:
+        return await self.collection.count_documents({})
+
+    async def find_page(self, skip: int, limit: int) -> List[Dict]:
+        cursor = self.collection.find().sort("created_at", -1).skip(skip).limit(limit)
+        return await cursor.to_list(length=None)
+
+    async def delete(self, feedback_id: str):
+        return await self.collection.delete_one({"_id": ObjectId(feedback_id)})
+
+
+class CompanyRequestRepository:
+    """company_requests collection"""
+
+    def __init__(self, db):
+        self.collection = db.company_requests
+
+    async def find_pending_by_name(self, name: str) -> Optional[Dict]:
+        return await self.collection.find_one({
+            "name": {"$regex": f"^{name}$", "$options": "i"},
+            "status": "pending"
+        })
+
+    async def get(self, request_id: str) -> Optional[Dict]:
+        return await self.collection.find_one({"_id": ObjectId(request_id)})
+
+    async def list_all(self) -> List[Dict]:
+        return await self.collection.find().sort("created_at", -1).to_list(length=None)
+
+    async def insert(self, doc: Dict):
+        return await self.collection.insert_one(doc)
+
+    async def set_status(self, request_id: str, status: str):
+        return await self.collection.update_one({"_id": ObjectId(request_id)}, {"$set": {"status": status}})
+
+
+class CollectionRepository:
+    """collections (curated job lists)"""
+
+    def __init__(self, db):
+        self.collection = db.collections
+
+    async def list_all(self) -> List[Dict]:
+        return await self.collection.find({}, {"_id": 0}).to_list(length=None)
+
+
+class DigestRepository:
+    """user_digest_settings and digest_log collections"""
+
+    def __init__(self, db):
+        self.settings = db.user_digest_settings
+        self.log = db.digest_log
+
+    async def get_settings(self, email: str) -> Optional[Dict]:
+        return await self.settings.find_one({"user_email": email})
+
+    async def upsert_settings(self, email: str, fields: Dict):
+        return await self.settings.update_one({"user_email": email}, {"$set": fields}, upsert=True)
+
+    async def recent_logs(self, limit: int = 20) -> List[Dict]:
+        return await self.log.find().sort("run_at", -1).limit(limit).to_list(length=None)
+
+
+class Repositories:
+    """Bundle of all repositories bound to one database"""
+
+    def __init__(self, db):
+        self.jobs = JobRepository(db)
+        self.companies = CompanyRepository(db)
+        self.company_stats = CompanyStatsRepository(db)
+        self.users = UserRepository(db)
+        self.saved_searches = SavedSearchRepository(db)
+        self.favorites = FavoriteRepository(db)
+        self.visitor_logs = VisitorLogRepository(db)
+        self.site_stats = SiteStatsRepository(db)
+        self.feedbacks = FeedbackRepository(db)
+        self.company_requests = CompanyRequestRepository(db)
+        self.collections = CollectionRepository(db)
+        self.digests = DigestRepository(db)
+
+
+def get_repos() -> Repositories:
+    """Repositories on the process-wide async client"""
+    return Repositories(get_async_db())
@@ -3,6 +3,7 @@ console.warn('--- JOB DETECTOR MAIN.JS ATTACHED v1.0.3 ---');
 let jobs = [];
 let companies = [];
 let currentCompanyJobs = [];
+let companyJobsCursor = null;
 let filteredJobs = [];
 let filteredCompanies = [];
 let currentFilters = {
@@ -52,6 +53,9 @@ const filterPills = document.querySelectorAll('.filter-pill');
 // Pagination State
 let currentPage = 1;
 const PAGE_LIMIT = 50;
+// Keyset paging: pageCursors[n] is the API cursor that starts page n (filled in as pages are visited)
+let pageCursors = {};
+const COMPANY_JOBS_LIMIT = 50;
 const paginationContainer = document.getElementById('pagination-container');
 const adminPaginationContainer = document.getElementById('admin-pagination-container');
 let currentFeedbackPage = 1;
@@ -218,10 +222,16 @@ async function fetchJobs(page = 1) {
         if (currentFilters.days) params.append('days', currentFilters.days);
         if (currentFilters.company) params.append('company', currentFilters.company);
 
-        // Pagination params
-        const skip = (page - 1) * PAGE_LIMIT;
-        params.append('skip', skip);
+        // Pagination params: seek from the nearest visited page, skip the rest
+        if (page === 1) pageCursors = {};
+        let basePage = page;
+        while (basePage > 1 && !pageCursors[basePage]) basePage--;
+        if (basePage > 1) params.append('cursor', pageCursors[basePage]);
+        const skip = (page - basePage) * PAGE_LIMIT;
+        if (skip) params.append('skip', skip);
         params.append('limit', PAGE_LIMIT);
+        // The total is counted with page 1 and reused for the other pages
+        if (page > 1 && currentTotalCount) params.append('include_total', 'false');
 
         // Add companies list filter (e.g. from Collections)
         if (currentFilters.companies && currentFilters.companies.length > 0) {
@@ -259,7 +269,8 @@ async function fetchJobs(page = 1) {
 
         if (data && typeof data === 'object' && data.jobs) {
             jobs = data.jobs;
-            currentTotalCount = data.total;
+            if (data.total !== null && data.total !== undefined) currentTotalCount = data.total;
+            pageCursors[page + 1] = data.next_cursor || null;
         } else {
             jobs = Array.isArray(data) ? data : [];
             currentTotalCount = jobs.length;
@@ -316,6 +327,7 @@ function renderJobs() {
                 <div class="job-location">
                     <i class="fas fa-map-marker-alt"></i> ${job.location}
                 </div>
+                ${job.snippet ? `<p class="job-snippet">${highlightText(job.snippet, currentSearchQuery)}</p>` : ''}
                 <div class="job-meta">
                     <span class="tag blue">${job.job_type}</span>
                     <span class="tag purple">${job.remote_type}</span>
@@ -440,8 +452,27 @@ function renderCompanies() {
     }).join('');
 }
 
-function showJobDetails(jobId, jobData = null) {
-    const job = jobData || jobs.find(j => j._id === jobId);
+// Full jobs from /api/jobs/:id (list pages only carry card fields)
+const jobDetailsCache = new Map();
+
+async function fetchJobDetail(jobId) {
+    if (!jobDetailsCache.has(jobId)) {
+        const response = await fetch(`/api/jobs/${encodeURIComponent(jobId)}`);
+        if (!response.ok) return null;
+        jobDetailsCache.set(jobId, await response.json());
+    }
+    return jobDetailsCache.get(jobId);
+}
+
+async function showJobDetails(jobId, jobData = null) {
+    let job = jobData || jobs.find(j => j._id === jobId);
+    if (!job || job.description === undefined) {
+        try {
+            job = (await fetchJobDetail(jobId)) || job;
+        } catch (error) {
+            console.error('Error fetching job details:', error);
+        }
+    }
     if (!job) return;
 
     // Update URL with job ID
@@ -461,7 +492,7 @@ function showJobDetails(jobId, jobData = null) {
             </div>
         </div>
         <div class="jd-content">
-            ${highlightText(job.description || "No description provided.", currentSearchQuery)}
+            ${highlightText(job.description || job.snippet || "No description provided.", currentSearchQuery)}
         </div>
         <div class="skills-section">
             <h4>Extracted Skills</h4>
@@ -493,9 +524,12 @@ async function showCompanyDetailsByName(companyName) {
             return;
         }
 
-        const jobsResp = await fetch(`/api/companies/${encodeURIComponent(companyName)}/jobs`);
-        currentCompanyJobs = await jobsResp.json();
+        const jobsResp = await fetch(`/api/companies/${encodeURIComponent(companyName)}/jobs?limit=${COMPANY_JOBS_LIMIT}`);
+        const jobsData = await jobsResp.json();
+        currentCompanyJobs = jobsData.jobs || [];
+        companyJobsCursor = jobsData.next_cursor || null;
         const companyJobs = currentCompanyJobs;
+        const activeJobs = jobsData.total ?? companyJobs.length;
 
         const sizeClass = (company.metadata?.size || '').toLowerCase().replace(' ', '-');
 
@@ -514,7 +548,7 @@ async function showCompanyDetailsByName(companyName) {
             <div class="company-stats-grid">
                 <div class="mini-stat-card">
                     <i class="fas fa-layer-group"></i>
-                    <strong>${companyJobs.length}</strong>
+                    <strong>${activeJobs}</strong>
                     <span>Active Jobs</span>
                 </div>
                 <div class="mini-stat-card">
@@ -531,15 +565,8 @@ async function showCompanyDetailsByName(companyName) {
 
             <div class="company-jobs-list">
                 <h3>Open Positions at ${company.name}</h3>
-                ${companyJobs.length > 0 ? companyJobs.map(j => `
-                    <div class="job-item-compact" onclick="showJobDetailsFromExternal('${j._id}', '${companyName}')" style="cursor: pointer;">
-                        <div class="job-info">
-                            <h4>${j.title}</h4>
-                            <span><i class="fas fa-map-marker-alt"></i> ${j.location}</span>
-                        </div>
-                        <span class="job-posted">${formatDate(j.posted_date)}</span>
-                    </div>
-                `).join('') : '<p>No active jobs found for this company.</p>'}
+                ${companyJobs.length > 0 ? `<div id="companyJobItems">${renderCompanyJobItems(companyJobs, companyName)}</div>` : '<p>No active jobs found for this company.</p>'}
+                ${companyJobsCursor ? `<button id="companyJobsMore" class="btn-jump" onclick="loadMoreCompanyJobs('${companyName}')">Load more</button>` : ''}
             </div>
         `;
 
@@ -550,6 +577,36 @@ async function showCompanyDetailsByName(companyName) {
     }
 }
 
+function renderCompanyJobItems(companyJobs, companyName) {
+    return companyJobs.map(j => `
+        <div class="job-item-compact" onclick="showJobDetailsFromExternal('${j._id}', '${companyName}')" style="cursor: pointer;">
+            <div class="job-info">
+                <h4>${j.title}</h4>
+                <span><i class="fas fa-map-marker-alt"></i> ${j.location}</span>
+            </div>
+            <span class="job-posted">${formatDate(j.posted_date)}</span>
+        </div>
+    `).join('');
+}
+
+// Next cursor page of the open company's jobs
+async function loadMoreCompanyJobs(companyName) {
+    if (!companyJobsCursor) return;
+    try {
+        const params = new URLSearchParams({ cursor: companyJobsCursor, limit: COMPANY_JOBS_LIMIT });
+        const resp = await fetch(`/api/companies/${encodeURIComponent(companyName)}/jobs?${params.toString()}`);
+        const data = await resp.json();
+        const moreJobs = data.jobs || [];
+        currentCompanyJobs = currentCompanyJobs.concat(moreJobs);
+        companyJobsCursor = data.next_cursor || null;
+
+        document.getElementById('companyJobItems').insertAdjacentHTML('beforeend', renderCompanyJobItems(moreJobs, companyName));
+        if (!companyJobsCursor) document.getElementById('companyJobsMore').remove();
+    } catch (error) {
+        console.error("Error loading more company jobs:", error);
+    }
+}
+
 // Special helper because 'jobs' state might not have all company jobs if they are many
 async function showJobDetailsFromExternal(jobId, companyName) {
     companyModal.style.display = "none";
@@ -578,13 +635,9 @@ async function showJobDetailsById(jobId) {
         return;
     }
 
-    // If not found locally, we need to fetch it from API
-    // Since we don't have a direct /api/jobs/:id endpoint, we'll search for it
+    // If not found locally, fetch it from the API
     try {
-        const response = await fetch(`/api/jobs?limit=1000`);
-        const data = await response.json();
-        const allJobs = data.jobs || data;
-        job = allJobs.find(j => j._id === jobId);
+        job = await fetchJobDetail(jobId);
 
         if (job) {
             showJobDetails(jobId, job);
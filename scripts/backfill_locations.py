@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Backfill structured location facets (country, city, region, is_remote) on jobs.
+
+New jobs get them from BaseScraper.normalize_job_data; run this once for
+existing documents, or with --all after extending the gazetteer in
+src/services/location.py.
+
+Usage:
+    python scripts/backfill_locations.py          # only jobs missing country
+    python scripts/backfill_locations.py --all    # re-parse every job
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.db import get_db
+from src.services.location import normalize_location
+
+BATCH_SIZE = 500
+
+
+def backfill_locations(rebuild_all: bool = False):
+    db = get_db()
+    query = {} if rebuild_all else {'country': {'$exists': False}}
+    total = db.jobs.count_documents(query)
+    print(f"🌍 Normalizing locations for {total} jobs...")
+
+    projection = {'location': 1, 'company_location': 1, 'remote_type': 1}
+    ops = []
+    done = 0
+    unresolved = 0
+    for job in db.jobs.find(query, projection).batch_size(BATCH_SIZE):
+        facets = normalize_location(
+            job.get('location'),
+            job.get('company_location'),
+            job.get('remote_type') == 'Remote'
+        )
+        if not facets['country'] and not facets['region']:
+            unresolved += 1
+        ops.append(UpdateOne({'_id': job['_id']}, {'$set': facets}))
+        if len(ops) >= BATCH_SIZE:
+            db.jobs.bulk_write(ops, ordered=False)
+            done += len(ops)
+            ops = []
+            print(f"   {done}/{total}")
+
+    if ops:
+        db.jobs.bulk_write(ops, ordered=False)
+        done += len(ops)
+
+    print(f"✅ Updated {done} jobs ({unresolved} with no recognised country/region)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill job location facets")
+    parser.add_argument("--all", action="store_true", help="Re-parse every job, not just missing ones")
+    args = parser.parse_args()
+    backfill_locations(args.all)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+API Load Test
+Fires concurrent requests at a running API server and reports throughput and latency,
+overall and per path (with the mean response size).
+
+Usage:
+    python api/index.py                     # start the server (port 8123)
+    python scripts/bench_api_load.py --concurrency 50 --requests 2000
+    python scripts/bench_api_load.py --path "/api/jobs?q=python" --path /api/stats
+    python scripts/bench_api_load.py --path "/api/jobs?limit=100" --concurrency 10 --requests 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import aiohttp
+
+DEFAULT_PATHS = [
+    "/api/jobs?limit=20",
+    "/api/jobs?q=engineer&limit=20",
+    "/api/stats",
+    "/api/companies",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def run_load_test(base_url: str, paths: List[str], concurrency: int, total_requests: int):
+    latencies: List[float] = []
+    path_latencies: Dict[str, List[float]] = defaultdict(list)
+    path_bytes: Dict[str, List[int]] = defaultdict(list)
+    errors = 0
+    counter = iter(range(total_requests))
+
+    async def worker(session: aiohttp.ClientSession):
+        nonlocal errors
+        for i in counter:
+            path = paths[i % len(paths)]
+            start = time.perf_counter()
+            try:
+                async with session.get(base_url + path) as response:
+                    body = await response.read()
+                    path_bytes[path].append(len(body))
+                    if response.status != 200:
+                        errors += 1
+            except Exception:
+                errors += 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            latencies.append(elapsed_ms)
+            path_latencies[path].append(elapsed_ms)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    print(f"\n📊 Load test: {total_requests} requests, concurrency {concurrency}")
+    print(f"   Paths: {', '.join(paths)}")
+    print(f"   Elapsed:    {elapsed:.2f}s")
+    print(f"   Throughput: {total_requests / elapsed:.1f} req/s")
+    print(f"   Errors:     {errors}")
+    print(f"   Latency ms: p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+          f"p99={percentile(latencies, 99):.1f} mean={statistics.mean(latencies):.1f}")
+    print("   Per path:")
+    for path in paths:
+        sizes = path_bytes[path]
+        mean_kb = statistics.mean(sizes) / 1024 if sizes else 0.0
+        print(f"     {path:40} {mean_kb:9.1f} KB  p50={percentile(path_latencies[path], 50):.1f}ms "
+              f"p95={percentile(path_latencies[path], 95):.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the JobDetector API")
+    parser.add_argument("--base-url", default="http://localhost:8123")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint path (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(run_load_test(args.base_url, args.paths or DEFAULT_PATHS, args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+HTML-to-text benchmark
+Compares the streaming cleaner (src/scrapers/html_text.py) against the
+BeautifulSoup path the scrapers used before, on the job description HTML
+the Greenhouse / Lever / Ashby scrapers actually clean, and checks that both
+produce identical text.
+
+Corpus sources (first one given wins):
+    --fixtures PATH...  descriptions from recorded fixtures (scripts/record_fixtures.py)
+    (default)           synthetic boards (src/scrapers/synthetic.py)
+
+Usage:
+    python scripts/bench_html_text.py --fixtures data/fixtures/*.json.gz
+    python scripts/bench_html_text.py --synthetic 5000 --repeat 3
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.html_text import html_to_text, html_to_text_bs4
+from src.scrapers.replay import load_fixture
+from src.scrapers.synthetic import SyntheticBoard
+
+# 每个抓取器调用 html_to_text 时的参数
+OPTIONS = {
+    'greenhouse': {'unescape': True},
+    'lever': {},
+    'ashby': {'normalize_lines': False},
+}
+
+Case = Tuple[str, Dict]
+
+
+def _descriptions(ats: str, payload) -> List[str]:
+    """从 API 响应中取出抓取器会清理的 HTML"""
+    if ats == 'greenhouse' and isinstance(payload, dict):
+        jobs = payload.get('jobs', [payload])
+        return [j.get('content') or j.get('description') or '' for j in jobs if isinstance(j, dict)]
+    if ats == 'lever' and isinstance(payload, list):
+        docs = []
+        for job in payload:
+            lists = ''.join(
+                f"<h3>{item.get('text', '')}</h3>{item.get('content', '')}"
+                for item in job.get('lists', []) if item.get('text') and item.get('content')
+            )
+            docs.append(job.get('description', '') + lists)
+        return docs
+    if ats == 'ashby' and isinstance(payload, dict):
+        return [j.get('descriptionHtml', '') for j in payload.get('jobs', []) if isinstance(j, dict)]
+    return []
+
+
+def load_corpus(args) -> List[Case]:
+    corpus: List[Case] = []
+    if args.fixtures:
+        for path in args.fixtures:
+            fixture = load_fixture(path)
+            ats = fixture['scraper']
+            if ats not in OPTIONS:
+                print(f"⚠️  {path}: '{ats}' descriptions are not HTML-cleaned, skipped")
+                continue
+            for entry in fixture['entries']:
+                try:
+                    payload = json.loads(entry.get('body', ''))
+                except ValueError:
+                    continue
+                corpus.extend((doc, OPTIONS[ats]) for doc in _descriptions(ats, payload) if doc)
+        return corpus
+
+    per_ats = max(1, args.synthetic // len(OPTIONS))
+    for ats, options in OPTIONS.items():
+        board = SyntheticBoard(ats, per_ats, seed=42)
+        for posting in board.postings:
+            doc = posting['description']
+            if options.get('unescape'):
+                doc = doc.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            corpus.append((doc, options))
+    return corpus
+
+
+def bench(name: str, corpus: List[Case], repeat: int, clean) -> Tuple[float, List[str]]:
+    best = float('inf')
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [clean(doc, **options) for doc, options in corpus]
+        best = min(best, time.perf_counter() - start)
+    mb = sum(len(doc) for doc, _ in corpus) / 1e6
+    print(f"   {name:10} {best:8.3f}s  {len(corpus) / best:10.0f} docs/s  {mb / best:8.1f} MB/s")
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the job description HTML cleaner")
+    parser.add_argument("--fixtures", nargs='*', default=[], help="Recorded fixtures to take descriptions from")
+    parser.add_argument("--synthetic", type=int, default=3000, help="Synthetic corpus size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    if not corpus:
+        print("❌ Empty corpus")
+        return
+    print(f"📚 Corpus: {len(corpus)} descriptions")
+
+    bs4_time, bs4_results = bench("bs4", corpus, args.repeat, html_to_text_bs4)
+    fast_time, fast_results = bench("streaming", corpus, args.repeat, html_to_text)
+
+    mismatches = sum(1 for a, b in zip(bs4_results, fast_results) if a != b)
+    print(f"   Speedup: {bs4_time / fast_time:.1f}x")
+    print(f"   {'✅ Identical text' if not mismatches else f'❌ {mismatches} mismatching descriptions'}")
+
+
+if __name__ == "__main__":
+    main()
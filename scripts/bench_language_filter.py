@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+LanguageFilterService micro-benchmark
+Compares the compiled single-pass matcher against the original per-pattern
+re.search loops on a corpus of job descriptions, and checks that both return
+identical (bool, reason) results.
+
+Corpus sources (first one given wins):
+    --from-db N     N most recent jobs (title + description) from MongoDB
+    --file PATH     JSON array or JSON Lines of objects with title/description
+    (default)       synthetic descriptions built from the keyword lists
+
+Usage:
+    python scripts/bench_language_filter.py --from-db 2000
+    python scripts/bench_language_filter.py --synthetic 5000 --repeat 3
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.language_filter import LanguageFilterService
+
+
+# --- Original implementation (per-pattern loops), kept as the baseline ---
+
+def legacy_is_it_role(text: str, is_title: bool = True) -> Tuple[bool, str]:
+    cls = LanguageFilterService
+    if not text:
+        return False, "No text provided"
+    text_lower = text.lower()
+    if is_title:
+        for pattern in cls.NON_IT_ROLE_TITLES:
+            if re.search(pattern, text_lower):
+                has_tech = False
+                for tech_pattern in cls.IT_ROLE_KEYWORDS:
+                    if re.search(tech_pattern, text_lower):
+                        has_tech = True
+                        break
+                if not has_tech:
+                    return False, f"Detected non-IT role keyword in title: {pattern}"
+    for pattern in cls.IT_ROLE_KEYWORDS:
+        if re.search(pattern, text_lower):
+            return True, f"Detected IT role keyword: {pattern}"
+    return False, "No IT keywords found"
+
+
+def legacy_is_english_only(text: str) -> Tuple[bool, str]:
+    cls = LanguageFilterService
+    if not text:
+        return True, "No text provided"
+    text_lower = text.lower()
+    for pattern in cls.ENGLISH_ONLY_KEYWORDS:
+        if re.search(pattern, text_lower):
+            return True, f"Found explicit English-only keyword: {pattern}"
+    for pattern in cls.JAPANESE_REQUIRED_KEYWORDS:
+        if re.search(pattern, text_lower):
+            return False, f"Detected Japanese requirement keyword: {pattern}"
+    return True, "No specific Japanese requirements detected"
+
+
+# --- Corpus ---
+
+FILLER = (
+    "We are looking for a teammate to join our growing team. You will collaborate with "
+    "stakeholders across the company, own projects end to end and help shape our roadmap. "
+    "We offer competitive compensation, flexible hours and a generous benefits package. "
+)
+TITLES = [
+    "Senior Software Engineer", "Account Executive", "Recruiting Coordinator", "Data Scientist",
+    "Marketing Manager", "Site Reliability Engineer", "Office Manager", "Sales Engineer",
+    "Product Designer", "Payroll Specialist", "Staff Backend Engineer, Payments",
+]
+PHRASES = [
+    "Experience with distributed systems and cloud infrastructure.",
+    "Business level Japanese (JLPT N2 or above) is required.",
+    "No Japanese required; our working language is English.",
+    "Strong communication skills and attention to detail.",
+    "Familiarity with machine learning frameworks is a plus.",
+    "日本語ネイティブレベル",
+]
+
+
+def load_corpus(args) -> List[Dict]:
+    if args.from_db:
+        from api.db import get_db
+        db = get_db()
+        cursor = db.jobs.find({}, {'title': 1, 'description': 1}).sort('scraped_at', -1).limit(args.from_db)
+        return [{'title': j.get('title', ''), 'description': j.get('description', '')} for j in cursor]
+
+    if args.file:
+        text = Path(args.file).read_text(encoding='utf-8').strip()
+        if text.startswith('['):
+            return json.loads(text)
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    rng = random.Random(42)
+    corpus = []
+    for _ in range(args.synthetic):
+        paragraphs = [FILLER * rng.randint(3, 12)] + rng.sample(PHRASES, rng.randint(0, 3))
+        rng.shuffle(paragraphs)
+        corpus.append({'title': rng.choice(TITLES), 'description': '\n'.join(paragraphs)})
+    return corpus
+
+
+def run_checks(corpus: List[Dict], is_it_role, is_english_only) -> List[Tuple]:
+    """The same checks JobIngestionService.check_job runs per job"""
+    results = []
+    for job in corpus:
+        job_text = job.get('description', '') + ' ' + job.get('title', '')
+        results.append((
+            is_it_role(job.get('title', ''), is_title=True),
+            is_it_role(job_text, is_title=False),
+            is_english_only(job_text),
+        ))
+    return results
+
+
+def bench(name: str, corpus: List[Dict], repeat: int, is_it_role, is_english_only):
+    best = float('inf')
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = run_checks(corpus, is_it_role, is_english_only)
+        best = min(best, time.perf_counter() - start)
+    mb = sum(len(j.get('description', '')) for j in corpus) / 1e6
+    print(f"   {name:10} {best:8.3f}s  {len(corpus) / best:10.0f} jobs/s  {mb / best:8.1f} MB/s")
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LanguageFilterService")
+    parser.add_argument("--from-db", type=int, default=0, help="Use N jobs from MongoDB")
+    parser.add_argument("--file", help="JSON / JSONL file of jobs")
+    parser.add_argument("--synthetic", type=int, default=2000, help="Synthetic corpus size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    if not corpus:
+        print("❌ Empty corpus")
+        return
+    print(f"📚 Corpus: {len(corpus)} jobs")
+
+    legacy_time, legacy_results = bench("legacy", corpus, args.repeat, legacy_is_it_role, legacy_is_english_only)
+    compiled_time, compiled_results = bench(
+        "compiled", corpus, args.repeat,
+        LanguageFilterService.is_it_role, LanguageFilterService.is_english_only
+    )
+
+    mismatches = sum(1 for a, b in zip(legacy_results, compiled_results) if a != b)
+    print(f"   Speedup: {legacy_time / compiled_time:.1f}x")
+    print(f"   {'✅ Identical results' if not mismatches else f'❌ {mismatches} mismatching jobs'}")
+
+
+if __name__ == "__main__":
+    main()
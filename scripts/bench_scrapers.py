@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Offline scraper benchmark
+Runs the ATS scrapers against synthetic boards (or recorded fixtures from
+scripts/record_fixtures.py) through ReplayHttpClient - no network - and
+reports throughput, parse time per job and peak memory.
+
+Each case runs once untraced for timing (best of --repeat) and once under
+tracemalloc for the peak allocation.
+
+Usage:
+    python scripts/bench_scrapers.py
+    python scripts/bench_scrapers.py --scrapers greenhouse,lever --sizes 10,1000,10000
+    python scripts/bench_scrapers.py --fixtures data/fixtures/*.json.gz
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.greenhouse import GreenhouseScraper
+from src.scrapers.lever import LeverScraper
+from src.scrapers.ashby import AshbyScraper
+from src.scrapers.workable import WorkableScraper
+from src.scrapers.workday import WorkdayScraper
+from src.scrapers.replay import FixtureResponder, ReplayHttpClient, load_fixture
+from src.scrapers.synthetic import ATS_TYPES, SyntheticBoard
+
+SCRAPERS = {
+    'greenhouse': GreenhouseScraper,
+    'lever': LeverScraper,
+    'ashby': AshbyScraper,
+    'workable': WorkableScraper,
+    'workday': WorkdayScraper,
+}
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+
+async def run_case(ats: str, make_responder: Callable, company: Dict) -> Tuple[int, float, int]:
+    """一次抓取，返回 (职位数, 秒, 请求数)"""
+    client = ReplayHttpClient(make_responder())
+    scraper = SCRAPERS[ats](client)
+    start = time.perf_counter()
+    jobs = await scraper.scrape(company)
+    elapsed = time.perf_counter() - start
+    if client.missing:
+        print(f"   ⚠️  {len(client.missing)} requests missing from fixture, e.g. {client.missing[0]}")
+    return len(jobs), elapsed, client.stats['requests']
+
+
+def bench(label: str, ats: str, make_responder: Callable, company: Dict, repeat: int):
+    best = float('inf')
+    count = requests = 0
+    for _ in range(repeat):
+        count, elapsed, requests = asyncio.run(run_case(ats, make_responder, company))
+        best = min(best, elapsed)
+
+    tracemalloc.start()
+    asyncio.run(run_case(ats, make_responder, company))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    jobs_per_s = count / best if best else 0.0
+    ms_per_job = best / count * 1000 if count else 0.0
+    print(
+        f"{label:32} {count:>7} {requests:>6} {best:>9.3f} {jobs_per_s:>10.0f} "
+        f"{ms_per_job:>9.3f} {peak / 1e6:>9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ATS scraper benchmark")
+    parser.add_argument("--scrapers", default=','.join(ATS_TYPES), help="Comma-separated ATS types")
+    parser.add_argument("--sizes", default=','.join(map(str, DEFAULT_SIZES)), help="Synthetic board sizes")
+    parser.add_argument("--fixtures", nargs='*', default=[], help="Recorded fixtures to replay instead")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # 抓取器的逐条日志会淹没结果
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"{'case':32} {'jobs':>7} {'reqs':>6} {'seconds':>9} {'jobs/s':>10} {'ms/job':>9} {'peak MB':>9}")
+
+    if args.fixtures:
+        for path in args.fixtures:
+            fixture = load_fixture(path)
+            ats = fixture['scraper']
+            if ats not in SCRAPERS:
+                print(f"⚠️  {path}: unsupported scraper '{ats}'")
+                continue
+            bench(Path(path).name, ats, lambda: FixtureResponder(fixture['entries']), fixture['company'], args.repeat)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    for ats in [s.strip() for s in args.scrapers.split(',') if s.strip()]:
+        if ats not in SCRAPERS:
+            print(f"⚠️  Unknown scraper: {ats}")
+            continue
+        for size in sizes:
+            board = SyntheticBoard(ats, size)
+            bench(f"{ats} x{size}", ats, lambda: board, board.company, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Wellfound browser benchmark
+Serves a local Wellfound-like job page (cards plus slow images and fonts)
+and scrapes it for N companies two ways:
+
+    legacy  the previous flow: launch Chromium per company, wait for
+            networkidle, one Playwright round trip per card field
+    pool    WellfoundScraper on a shared BrowserPool (one browser, reused
+            contexts, images/media/fonts/analytics blocked)
+
+Reports wall time, pages/min and the pool's per-page timing and memory.
+Needs the Chromium build: python -m playwright install chromium
+
+Usage:
+    python scripts/bench_wellfound.py --companies 10 --cards 40
+    python scripts/bench_wellfound.py --companies 20 --contexts 4 --asset-latency-ms 500 --skip-legacy
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.browser_pool import BrowserPool
+from src.scrapers.wellfound import WellfoundScraper
+
+
+def build_page(cards: int) -> str:
+    items = ''.join(
+        f'<div data-test="JobResult"><img src="/img/{i}.png" width="48" height="48">'
+        f'<h2>Software Engineer {i}</h2><span class="styles_companyName__">Acme {i}</span>'
+        f'<span class="styles_location__">Tokyo</span>'
+        f'<a data-test="JobTitleLink" href="/jobs/{i}-software-engineer">View</a>'
+        f'<p class="styles_description__">Build things with Python and AWS. $120k - $160k</p></div>'
+        for i in range(cards)
+    )
+    return (
+        "<!DOCTYPE html><html><head>"
+        "<style>@font-face{font-family:Brand;src:url(/font.woff2)} body{font-family:Brand}</style>"
+        "</head><body>"
+        f"{items}<video src=\"/hero.mp4\" autoplay muted></video></body></html>"
+    )
+
+
+def build_app(args) -> web.Application:
+    page = build_page(args.cards)
+
+    async def jobs(request):
+        return web.Response(text=page, content_type='text/html')
+
+    async def asset(request):
+        # 模拟 CDN 上的大图片 / 字体 / 视频：legacy 流程的 networkidle 要等它们全部加载完
+        await asyncio.sleep(args.asset_latency_ms / 1000)
+        return web.Response(body=b'\0' * 50_000, content_type='application/octet-stream')
+
+    app = web.Application()
+    app.router.add_get('/jobs', jobs)
+    app.router.add_get('/{tail:.+}', asset)
+    return app
+
+
+async def legacy_scrape(url: str) -> int:
+    """旧流程（每个公司启动一次浏览器），保留作为基线"""
+    from playwright.async_api import async_playwright
+    count = 0
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(viewport={'width': 1280, 'height': 800})
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until="networkidle", timeout=60000)
+            await page.wait_for_selector('div[data-test="JobResult"]', timeout=30000)
+            for _ in range(3):
+                await page.mouse.wheel(0, 1000)
+                await asyncio.sleep(1.5)
+            for element in await page.query_selector_all('div[data-test="JobResult"]'):
+                for selector in ('h2', '.styles_companyName__', '.styles_location__',
+                                 'a[data-test="JobTitleLink"]', '.styles_description__'):
+                    elem = await element.query_selector(selector)
+                    if elem:
+                        await elem.inner_text()
+                count += 1
+        finally:
+            await browser.close()
+    return count
+
+
+async def run(args):
+    runner = web.AppRunner(build_app(args))
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', args.port).start()
+    url = f"http://127.0.0.1:{args.port}/jobs"
+    companies = [{'name': f"Bench {i}", 'domain': f"bench{i}.com", 'ats_url': url} for i in range(args.companies)]
+
+    try:
+        if not args.skip_legacy:
+            # 旧流程在 prod_scraper 中受公司并发控制，这里用同样的并发数
+            semaphore = asyncio.Semaphore(args.contexts)
+
+            async def bounded(company):
+                async with semaphore:
+                    return await legacy_scrape(company['ats_url'])
+
+            start = time.perf_counter()
+            counts = await asyncio.gather(*(bounded(c) for c in companies))
+            elapsed = time.perf_counter() - start
+            print(f"legacy  {elapsed:7.1f}s  {len(companies) / elapsed * 60:7.1f} pages/min  {sum(counts)} jobs")
+            legacy_elapsed = elapsed
+
+        pool = BrowserPool(max_contexts=args.contexts)
+        scraper = WellfoundScraper(browser_pool=pool)
+        start = time.perf_counter()
+        try:
+            results = await asyncio.gather(*(scraper.scrape(c) for c in companies))
+            elapsed = time.perf_counter() - start
+        finally:
+            await pool.close()
+        print(f"pool    {elapsed:7.1f}s  {len(companies) / elapsed * 60:7.1f} pages/min  "
+              f"{sum(len(r) for r in results)} jobs")
+        print(f"        {pool.summary()}")
+        if not args.skip_legacy:
+            print(f"Speedup: {legacy_elapsed / elapsed:.1f}x")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Wellfound browser pool")
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--cards", type=int, default=40, help="Job cards per page")
+    parser.add_argument("--contexts", type=int, default=2, help="Concurrent pages / browser contexts")
+    parser.add_argument("--asset-latency-ms", type=float, default=300, help="Latency of each image/font/video")
+    parser.add_argument("--port", type=int, default=8910)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Build / backfill the keyword search fields (search_terms, search_fields) on jobs.
+
+New and changed jobs get them at ingestion time; run this once after deploying
+search, or with --all after changing the tokenizer/stemmer.
+
+Usage:
+    python scripts/build_search_index.py          # only jobs missing search_terms
+    python scripts/build_search_index.py --all    # rebuild every job
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.db import get_db
+from src.services.search import build_search_fields
+
+BATCH_SIZE = 500
+
+
+def build_search_index(rebuild_all: bool = False):
+    db = get_db()
+    query = {} if rebuild_all else {'search_terms': {'$exists': False}}
+    total = db.jobs.count_documents(query)
+    print(f"🔎 Building search fields for {total} jobs...")
+
+    projection = {'title': 1, 'company': 1, 'skills': 1, 'description': 1}
+    ops = []
+    done = 0
+    for job in db.jobs.find(query, projection).batch_size(BATCH_SIZE):
+        ops.append(UpdateOne({'_id': job['_id']}, {'$set': build_search_fields(job)}))
+        if len(ops) >= BATCH_SIZE:
+            db.jobs.bulk_write(ops, ordered=False)
+            done += len(ops)
+            ops = []
+            print(f"   {done}/{total}")
+
+    if ops:
+        db.jobs.bulk_write(ops, ordered=False)
+        done += len(ops)
+
+    print(f"✅ Search fields built for {done} jobs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill job search fields")
+    parser.add_argument("--all", action="store_true", help="Rebuild every job, not just missing ones")
+    args = parser.parse_args()
+    build_search_index(args.all)
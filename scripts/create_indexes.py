@@ -20,19 +20,44 @@ def create_indexes():
     
     print("Creating indexes for 'jobs' collection...")
     # Jobs indexes
+    db.jobs.create_index([("job_id", ASCENDING)], unique=True)
     db.jobs.create_index([("is_active", ASCENDING)])
     db.jobs.create_index([("posted_date", DESCENDING)])
     db.jobs.create_index([("company", ASCENDING)])
     db.jobs.create_index([("location", ASCENDING)])
-    db.jobs.create_index([("category", ASCENDING)]) # If you use category field
+    # Location facets (src/services/location.py), multikey
+    db.jobs.create_index([("country", ASCENDING)])
+    db.jobs.create_index([("city", ASCENDING)])
+    db.jobs.create_index([("region", ASCENDING)])
+    db.jobs.create_index([("is_remote", ASCENDING)])
+    db.jobs.create_index([("remote_type", ASCENDING)])
+    db.jobs.create_index([("category", ASCENDING)])  # Multikey, set by src/services/job_classifier.py
     
-    # Text search support (optional but helpful for regex performance)
-    # However, MongoDB text search is different from regex. 
-    # For regex performance on Large collections, we might need specific field indexes.
+    # Keyword search: multikey index over the stemmed terms (src/services/search.py)
+    db.jobs.create_index([("search_terms", ASCENDING)])
     
     # Compound indexes for common queries
     db.jobs.create_index([("is_active", ASCENDING), ("posted_date", DESCENDING)])
     db.jobs.create_index([("is_active", ASCENDING), ("company", ASCENDING)])
+    # Keyset pagination (api/pagination.py): the sort ends with _id so each cursor seek is one index range
+    db.jobs.create_index([("is_active", ASCENDING), ("posted_date", DESCENDING), ("_id", DESCENDING)])
+    db.jobs.create_index([
+        ("company", ASCENDING), ("is_active", ASCENDING), ("posted_date", DESCENDING), ("_id", DESCENDING)
+    ])
+    
+    print("Creating indexes for 'companies' collection...")
+    # company_stats -> companies.stats $lookup (src/services/company_stats.py)
+    db.companies.create_index([("name", ASCENDING)])
+    # Due-queue of src/services/scheduler.py (equality, sort, range)
+    db.companies.create_index([
+        ("is_active", ASCENDING), ("schedule.priority", DESCENDING), ("schedule.next_scrape_at", ASCENDING)
+    ])
+    
+    print("Creating indexes for 'rejected_jobs' collection...")
+    # Ingestion prefetches known rejections by content_hash in one $in query
+    db.rejected_jobs.create_index([("content_hash", ASCENDING)])
+    # List fingerprints of rejected jobs are prefetched per company before scraping
+    db.rejected_jobs.create_index([("company", ASCENDING)])
     
     print("Creating indexes for 'visitor_logs' collection...")
     db.visitor_logs.create_index([("timestamp", DESCENDING)])
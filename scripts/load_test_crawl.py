@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+End-to-end crawl load test
+Seeds a throwaway database with thousands of synthetic companies, serves
+their boards from scripts/mock_ats_server.py and runs the real
+prod_scraper crawl (scraping, filtering, bulk writes, sweep) against them,
+with no network access.
+
+Reports wall time and companies/s, jobs/s and requests/s per run; run it
+with --runs 2 to also measure the incremental crawl (304 / fingerprints).
+
+Usage:
+    python scripts/load_test_crawl.py --companies 2000
+    python scripts/load_test_crawl.py --companies 5000 --latency-ms 150 --error-rate 0.02 --rate-limit 200 --runs 2
+    python scripts/load_test_crawl.py --unthrottled --concurrency 100
+    python scripts/load_test_crawl.py --companies 2000 --parse-workers 0   # baseline: parse on the event loop
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.rate_limit import DEFAULT_POLICIES
+from src.scrapers.synthetic import ATS_TYPES
+
+DEFAULT_SIZES = "10:0.4,50:0.35,200:0.2,1000:0.05"
+
+
+def parse_sizes(spec: str):
+    """"10:0.4,50:0.6" -> ([10, 50], [0.4, 0.6])"""
+    sizes, weights = [], []
+    for part in spec.split(','):
+        size, _, weight = part.partition(':')
+        sizes.append(int(size))
+        weights.append(float(weight or 1))
+    return sizes, weights
+
+
+def synthetic_companies(count: int, ats_types, sizes, weights, seed: int):
+    rng = random.Random(seed)
+    companies = []
+    for i in range(count):
+        ats = ats_types[i % len(ats_types)]
+        slug = f"lt{i:05d}-s{rng.choices(sizes, weights)[0]}"
+        urls = {
+            'greenhouse': f"https://boards.greenhouse.io/{slug}",
+            'lever': f"https://jobs.lever.co/{slug}",
+            'ashby': f"https://jobs.ashbyhq.com/{slug}",
+            'workable': f"https://apply.workable.com/{slug}/",
+            'workday': f"https://{slug}.wd5.myworkdayjobs.com/External",
+        }
+        company = {
+            'name': f"LoadTest {slug}",
+            'domain': f"{slug}.com",
+            'ats_url': urls[ats],
+            'ats_system': {'type': ats},
+            'is_active': True,
+            'schedule': {'priority': 1, 'frequency_hours': 12},
+        }
+        if ats == 'workday':
+            company['ats_system']['api_endpoint'] = urls[ats]
+        companies.append(company)
+    return companies
+
+
+def mock_stats(base_url: str) -> dict:
+    with urllib.request.urlopen(f"{base_url}/_stats", timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def wait_for_server(base_url: str, timeout: float = 15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return mock_stats(base_url)
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Mock ATS server at {base_url} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end crawl load test")
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--ats", default=','.join(ATS_TYPES), help="ATS types to rotate through")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Board size distribution, size:weight,...")
+    parser.add_argument("--database", default="jobdetector_loadtest", help="Throwaway database (dropped first)")
+    parser.add_argument("--runs", type=int, default=1, help="Crawl runs; later runs measure incremental crawls")
+    parser.add_argument("--concurrency", type=int, help="SCRAPE_CONCURRENCY for the crawl")
+    parser.add_argument("--parse-workers", type=int, help="Parse worker processes (0 = parse on the event loop)")
+    parser.add_argument("--unthrottled", action="store_true", help="Lift the per-ATS-host rate limits")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--no-server", action="store_true", help="Use an already running mock server")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv(project_root / ".env")
+    if args.database == os.getenv('MONGODB_DATABASE'):
+        parser.error(f"--database {args.database} is the configured production database")
+
+    # 必须在导入 prod_scraper（连接数据库）之前设置
+    base_url = f"http://127.0.0.1:{args.port}"
+    os.environ['MONGODB_DATABASE'] = args.database
+    os.environ['ATS_MOCK_BASE_URL'] = base_url
+    if args.concurrency:
+        os.environ['SCRAPE_CONCURRENCY'] = str(args.concurrency)
+    if args.unthrottled:
+        os.environ['ATS_RATE_LIMITS'] = json.dumps({
+            suffix: {'rate': 100000, 'burst': 100000, 'initial_concurrency': 64, 'max_concurrency': 256}
+            for suffix in DEFAULT_POLICIES
+        })
+
+    server = None
+    if not args.no_server:
+        server = subprocess.Popen([
+            sys.executable, str(project_root / 'scripts' / 'mock_ats_server.py'),
+            '--port', str(args.port), '--latency-ms', str(args.latency_ms),
+            '--error-rate', str(args.error_rate), '--rate-limit', str(args.rate_limit),
+            '--seed', str(args.seed),
+        ])
+    try:
+        wait_for_server(base_url)
+
+        from scripts.create_indexes import create_indexes
+        from scripts.prod_scraper import run_production_scrape
+        from src.database.connection import get_db
+
+        # 每个公司的逐条日志会淹没结果
+        logging.getLogger('scraper').setLevel(logging.WARNING)
+
+        db = get_db()
+        for name in ('companies', 'jobs', 'rejected_jobs'):
+            db.drop_collection(name)
+        create_indexes()
+
+        sizes, weights = parse_sizes(args.sizes)
+        ats_types = [a.strip() for a in args.ats.split(',') if a.strip()]
+        companies = synthetic_companies(args.companies, ats_types, sizes, weights, args.seed)
+        db.companies.insert_many(companies)
+        print(f"🌱 Seeded {len(companies)} companies into '{args.database}'")
+
+        for run in range(1, args.runs + 1):
+            before = mock_stats(base_url)
+            start = time.perf_counter()
+            asyncio.run(run_production_scrape(all_companies=True, parse_workers=args.parse_workers))
+            elapsed = time.perf_counter() - start
+            after = mock_stats(base_url)
+
+            db = get_db()
+            jobs = db.jobs.count_documents({'is_active': True})
+            rejected = db.rejected_jobs.estimated_document_count()
+            requests = after['requests'] - before['requests']
+            statuses = {k: after.get(k, 0) - before.get(k, 0) for k in ('200', '304', '429', '503', '404')}
+            print(
+                f"🏁 Run {run}: {elapsed:.1f}s | {len(companies) / elapsed:.1f} companies/s | "
+                f"{(jobs + rejected) / elapsed:.0f} jobs/s ({jobs} active, {rejected} rejected) | "
+                f"{requests / elapsed:.0f} req/s {statuses}"
+            )
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Mock ATS server
+A local aiohttp server emulating the ATS APIs the scrapers use, backed by
+synthetic boards (src/scrapers/synthetic.py):
+
+    Greenhouse  GET  /v1/boards/{slug}/jobs[?content=true], /v1/boards/{slug}/jobs/{id}
+    Lever       GET  /v0/postings/{slug}?mode=json
+    Ashby       GET  /{slug} (page), /posting-api/job-board/{slug}
+    Workable    POST /api/v3/accounts/{slug}/jobs
+    Workday     POST /wday/cxs/{tenant}/{board}/jobs (offset/limit paging), GET .../job/{path}
+
+Point the scrapers at it with ATS_MOCK_BASE_URL; HttpClient then sends every
+request here with the original host in X-ATS-Host. The board size is taken
+from a "-s<N>" suffix on the slug (e.g. "lt00042-s250"), else --default-size.
+
+Usage:
+    python scripts/mock_ats_server.py --port 8900 --latency-ms 80 --error-rate 0.01 --rate-limit 50
+    ATS_MOCK_BASE_URL=http://127.0.0.1:8900 python scripts/prod_scraper.py --all
+"""
+import argparse
+import asyncio
+import random
+import re
+import sys
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from aiohttp import web
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.http_client import HttpClient
+from src.scrapers.synthetic import SyntheticBoard
+
+# 原始 host 后缀 -> ATS
+HOST_SUFFIXES = [
+    ('greenhouse.io', 'greenhouse'),
+    ('lever.co', 'lever'),
+    ('ashbyhq.com', 'ashby'),
+    ('workable.com', 'workable'),
+    ('myworkdayjobs.com', 'workday'),
+]
+
+# path -> (ATS, slug 所在分组)
+PATH_ROUTES = [
+    (re.compile(r'/v1/boards/([^/]+)/jobs'), 'greenhouse'),
+    (re.compile(r'/v0/postings/([^/]+)'), 'lever'),
+    (re.compile(r'/posting-api/job-board/([^/]+)'), 'ashby'),
+    (re.compile(r'/api/v3/accounts/([^/]+)/jobs'), 'workable'),
+    (re.compile(r'/wday/cxs/([^/]+)/'), 'workday'),
+]
+
+SIZE_SUFFIX = re.compile(r'-s(\d+)$')
+
+
+class MockATS:
+    """合成 board 的路由、延迟、错误注入和 429 限流"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.boards: 'OrderedDict[Tuple[str, str], SyntheticBoard]' = OrderedDict()
+        self.stats = Counter()
+        self.started = time.monotonic()
+        # 每个 ATS 一个令牌桶：(tokens, last_refill)
+        self.buckets: Dict[str, list] = {}
+
+    def resolve(self, request: web.Request) -> Optional[Tuple[str, str]]:
+        """(ATS, slug)"""
+        host = request.headers.get(HttpClient.ORIGINAL_HOST_HEADER, '')
+        host_ats = next((ats for suffix, ats in HOST_SUFFIXES if host.endswith(suffix)), None)
+
+        for pattern, ats in PATH_ROUTES:
+            m = pattern.match(request.path)
+            if m:
+                if ats == 'workday' and host_ats == 'workday':
+                    # Workday 的租户在子域名上：acme.wd5.myworkdayjobs.com
+                    return ats, host.split('.')[0]
+                return ats, m.group(1)
+
+        # 剩下的是页面请求：Ashby 的 board 页，Workday 的首页探测
+        if host_ats in ('ashby', 'workday'):
+            slug = request.path.strip('/').split('/')[0] if host_ats == 'ashby' else host.split('.')[0]
+            return host_ats, slug
+        return None
+
+    def board(self, ats: str, slug: str) -> SyntheticBoard:
+        key = (ats, slug)
+        board = self.boards.get(key)
+        if board is None:
+            m = SIZE_SUFFIX.search(slug)
+            size = int(m.group(1)) if m else self.args.default_size
+            board = SyntheticBoard(ats, size, seed=self.args.seed, slug=slug)
+            self.boards[key] = board
+            # 只保留最近使用的 board，控制内存
+            while len(self.boards) > self.args.board_cache:
+                self.boards.popitem(last=False)
+        else:
+            self.boards.move_to_end(key)
+        return board
+
+    def throttled(self, ats: str) -> bool:
+        rate = self.args.rate_limit
+        if not rate:
+            return False
+        now = time.monotonic()
+        tokens, last = self.buckets.get(ats, [rate, now])
+        tokens = min(rate, tokens + (now - last) * rate)
+        if tokens < 1:
+            self.buckets[ats] = [tokens, now]
+            return True
+        self.buckets[ats] = [tokens - 1, now]
+        return False
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.stats['requests'] += 1
+        if self.args.latency_ms:
+            latency = self.rng.gauss(self.args.latency_ms, self.args.latency_ms * self.args.jitter)
+            await asyncio.sleep(max(0.0, latency) / 1000)
+
+        resolved = self.resolve(request)
+        if resolved is None:
+            self.stats['404'] += 1
+            return web.json_response({'error': 'unknown route'}, status=404)
+        ats, slug = resolved
+
+        if self.throttled(ats):
+            self.stats['429'] += 1
+            return web.json_response(
+                {'error': 'rate limited'}, status=429, headers={'Retry-After': str(self.args.retry_after)}
+            )
+        if self.args.error_rate and self.rng.random() < self.args.error_rate:
+            self.stats['503'] += 1
+            return web.json_response({'error': 'injected failure'}, status=503)
+
+        json_body = await request.json() if request.method == 'POST' and request.can_read_body else None
+        query = {k: request.query.getall(k) for k in request.query.keys()}
+        routed = self.board(ats, slug).route(request.method, request.path, query, json_body)
+        if routed is None:
+            self.stats['404'] += 1
+            return web.json_response({'error': 'not found'}, status=404)
+
+        status, headers, body = routed
+        if headers.get('ETag') and request.headers.get('If-None-Match') == headers['ETag']:
+            self.stats['304'] += 1
+            return web.Response(status=304, headers={'ETag': headers['ETag']})
+        self.stats[str(status)] += 1
+        self.stats['bytes'] += len(body)
+        return web.Response(status=status, body=body, headers=headers)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        elapsed = time.monotonic() - self.started
+        return web.json_response({
+            **self.stats,
+            'boards_cached': len(self.boards),
+            'uptime_s': round(elapsed, 1),
+            'requests_per_s': round(self.stats['requests'] / elapsed, 1) if elapsed else 0,
+        })
+
+
+def build_app(args) -> web.Application:
+    mock = MockATS(args)
+    app = web.Application(client_max_size=10 * 1024 * 1024)
+    app.router.add_get('/_stats', mock.handle_stats)
+    app.router.add_route('*', '/{tail:.*}', mock.handle)
+    app['mock'] = mock
+    return app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock ATS server for offline crawl load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mean response latency")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Latency std-dev as a fraction of the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Requests/s per ATS before 429 (0 = off)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429")
+    parser.add_argument("--default-size", type=int, default=50, help="Postings per board without -s<N> slug")
+    parser.add_argument("--board-cache", type=int, default=500, help="Synthetic boards kept in memory")
+    parser.add_argument("--seed", type=int, default=0, help="Change to make every posting look updated")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"🧪 Mock ATS server on http://{args.host}:{args.port} (stats: /_stats)")
+    web.run_app(build_app(args), host=args.host, port=args.port, print=None)
@@ -6,9 +6,9 @@ Iterates through all companies in the database and runs the appropriate scraper.
 import os
 import sys
 import asyncio
+import argparse
 import logging
 from pathlib import Path
-from datetime import datetime
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -21,7 +21,15 @@ from src.scrapers.workday import WorkdayScraper
 from src.scrapers.ashby import AshbyScraper
 from src.scrapers.workable import WorkableScraper
 from src.scrapers.wellfound import WellfoundScraper
-from src.services.language_filter import LanguageFilterService
+from src.scrapers.http_client import HttpClient
+from src.scrapers.parse_pool import ParsePool
+from src.scrapers.browser_pool import BrowserPool
+from src.scrapers.base import BoardNotModified, ScrapeError
+from src.scrapers.resilience import CircuitBreaker, scrape_with_retry
+from src.services.job_ingestion import JobIngestionService, IngestionResult
+from src.services.scheduler import CrawlScheduler
+from src.services.data_version import bump_data_version
+from src.services.company_stats import sync_company_stats
 
 # Ensure logs directory exists BEFORE logging configuration
 Path("logs").mkdir(exist_ok=True)
@@ -37,8 +45,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ProdScraper")
 
-async def scrape_company(company, scrapers, db, semaphore):
-    """抓取单个公司的职位"""
+# _scrape_company 没有真正抓取该公司时的原因
+SKIP_UNSUPPORTED = 'unsupported'      # 没有 ATS 类型 / 尚未实现对应的抓取器
+SKIP_BREAKER_OPEN = 'breaker_open'    # 连续失败，熔断中
+
+async def scrape_company(company, scrapers, db, semaphore, totals: IngestionResult = None, crawl_generation: str = None,
+                         scheduler: CrawlScheduler = None):
+    """
+    抓取单个公司的职位
+    
+    Args:
+        totals: 可选，累加整次运行的入库统计
+        crawl_generation: 本次抓取代次；未提供时为该公司单独生成一个
+        scheduler: 可选，抓取后写回该公司的下次抓取时间
+    """
+    saved, changed, skipped = await _scrape_company(company, scrapers, db, semaphore, totals, crawl_generation)
+    if scheduler is not None:
+        if skipped is None:
+            await asyncio.to_thread(scheduler.record_crawl, company, changed)
+        elif skipped == SKIP_UNSUPPORTED:
+            # 没有抓取：不写 last_scraped_at，只推迟下次检查，避免每轮都选中它
+            await asyncio.to_thread(scheduler.record_skip, company)
+        # 熔断中：CircuitBreaker.record_failure 已把 next_scrape_at 推迟到熔断结束
+    return saved
+
+
+async def _scrape_company(company, scrapers, db, semaphore, totals, crawl_generation):
+    """
+    Returns:
+        (入库数, board 是否有变化, 未抓取原因)
+        抓取失败时变化为 None；没有真正抓取时原因为 SKIP_*，否则为 None
+    """
     async with semaphore:
         # Determine ATS type
         ats_type = None
@@ -67,122 +104,195 @@ async def scrape_company(company, scrapers, db, semaphore):
         
         if not ats_type:
             logger.warning(f"跳过 {company['name']}: 未定义 ATS 类型且无法从 URL 识别")
-            return 0
+            return 0, None, SKIP_UNSUPPORTED
             
         scraper = scrapers.get(ats_type.lower())
         if not scraper:
             logger.warning(f"跳过 {company['name']}: 尚未实现 '{ats_type}' 的抓取器")
-            return 0
+            return 0, None, SKIP_UNSUPPORTED
+            
+        # 连续失败的公司在熔断期内不再抓取
+        breaker = CircuitBreaker(db)
+        open_until = breaker.open_until(company)
+        if open_until:
+            if totals is not None:
+                totals.add(IngestionResult(boards_open=1))
+            logger.info(f"🔌 跳过 {company['name']}: 连续失败，熔断至 {open_until:%Y-%m-%d %H:%M}")
+            return 0, None, SKIP_BREAKER_OPEN
+            
+        ingestion = JobIngestionService(db)
+        generation = crawl_generation or JobIngestionService.new_crawl_generation()
             
         try:
             logger.info(f"正在抓取 {company['name']} (使用 {ats_type})...")
-            jobs = await scraper.scrape(company)
+            # 预取列表指纹，抓取器对未变化的职位只输出轻量的 "seen" 记录
+            known_jobs, known_rejected = await asyncio.to_thread(ingestion.known_fingerprints, company['name'])
+            scraper.set_known_fingerprints(company['name'], known_jobs, known_rejected)
+            try:
+                jobs = await scrape_with_retry(scraper, company)
+            except ScrapeError as e:
+                if totals is not None:
+                    totals.add(IngestionResult(boards_failed=1))
+                reopen = await asyncio.to_thread(breaker.record_failure, company, e)
+                logger.error(f"❌ 抓取 {company['name']} 失败: {e}" + (f"，熔断至 {reopen:%Y-%m-%d %H:%M}" if reopen else ""))
+                return 0, None, None
+            except BoardNotModified:
+                await asyncio.to_thread(breaker.record_success, company)
+                # Board 自上次成功抓取后没有变化：跳过解析/过滤/写入，只刷新 last_seen_at
+                result = IngestionResult(boards_unchanged=1)
+                result.touched = await asyncio.to_thread(ingestion.touch_unchanged_board, company['name'], generation)
+                if totals is not None:
+                    totals.add(result)
+                logger.info(f"⏭️ {company['name']}: board 未变化，跳过 (刷新 {result.touched} 个职位)")
+                return 0, False, None
+            finally:
+                scraper.clear_known_fingerprints(company['name'])
+                # 有职位解析或详情获取失败：这些职位不在 jobs 中，不能据此下线
+                incomplete = scraper.pop_incomplete(company['name'])
+            
+            await asyncio.to_thread(breaker.record_success, company)
+            board_cache = scraper.pop_board_cache(company['name'])
             
             if jobs:
-                # Save/Update jobs in DB
-                saved_count = 0
-                for job in jobs:
-                    # 0. Content analysis (English-Only & IT-Only check)
-                    job_text = job.get('description', '') + ' ' + job.get('title', '')
-                    
-                    # A. Category Check (IT Only)
-                    is_it, it_reason = LanguageFilterService.is_it_role(job['title'], is_title=True) # Prioritize title for category
-                    if not is_it:
-                        # Fallback to description if title is ambiguous
-                        is_it_desc, it_reason_desc = LanguageFilterService.is_it_role(job_text, is_title=False)
-                        if not is_it_desc:
-                            logger.info(f"🚫 {company['name']}: 职位 '{job['title']}' 非 IT 职位被过滤: {it_reason_desc}")
-                            db.rejected_jobs.update_one(
-                                {'content_hash': job['content_hash']},
-                                {'$set': {'title': job['title'], 'company': job['company'], 'rejected_at': datetime.utcnow(), 'reason': f"Non-IT: {it_reason_desc}"}},
-                                upsert=True
-                            )
-                            continue
-
-                    # B. Language Check (English Only)
-                    is_eng, eng_reason = LanguageFilterService.is_english_only(job_text)
-                    if not is_eng:
-                        logger.info(f"🚫 {company['name']}: 职位 '{job['title']}' 因要求日语被过滤: {eng_reason}")
-                        db.rejected_jobs.update_one(
-                            {'content_hash': job['content_hash']},
-                            {'$set': {'title': job['title'], 'company': job['company'], 'rejected_at': datetime.utcnow(), 'reason': f"Language: {eng_reason}"}},
-                            upsert=True
-                        )
-                        continue
-
-                    # 0.5 Check if already rejected
-                    if db.rejected_jobs.find_one({'content_hash': job['content_hash']}):
-                        logger.debug(f"⏭️ {company['name']}: 跳过已知不符合要求的职位 '{job['title']}'")
-                        continue
-
-                    # 1. 查找现有职位
-                    existing_job = db.jobs.find_one({'job_id': job['job_id']})
-                    
-                    if existing_job:
-                        # 2. 如果存在，检查哈希值是否一致
-                        if existing_job.get('content_hash') == job.get('content_hash'):
-                            # 哈希一致，只更新 last_seen_at
-                            db.jobs.update_one(
-                                {'job_id': job['job_id']},
-                                {'$set': {'last_seen_at': job['last_seen_at'], 'is_active': True}}
-                            )
-                        else:
-                            # 哈希不一致，全量更新
-                            db.jobs.update_one(
-                                {'job_id': job['job_id']},
-                                {'$set': job},
-                                upsert=True
-                            )
-                            saved_count += 1
-                    else:
-                        # 3. 如果不存在，直接插入
-                        db.jobs.insert_one(job)
-                        saved_count += 1
+                # 过滤 + 批量入库（同步 pymongo 放到线程中，避免阻塞其他公司的抓取）
+                result = await asyncio.to_thread(ingestion.ingest, company['name'], jobs, generation)
+                
+                # 标记-清除：本代次未出现的职位已从 board 下架
+                # 注意：只在拿到完整的职位列表且全部写入成功时清除
+                # （空列表或有职位解析/详情获取失败时不清除，避免把没拿到的职位误下线）
+                if incomplete:
+                    logger.warning(f"⚠️ {company['name']}: 列表未完整处理，本次不下线职位")
+                elif not result.write_errors:
+                    result.deactivated = await asyncio.to_thread(ingestion.sweep, company['name'], generation)
+                    # 全部写入成功后才保存校验信息，否则下次仍需完整抓取
+                    if board_cache:
+                        await asyncio.to_thread(ingestion.save_board_cache, company['_id'], board_cache)
                 
-                logger.info(f"✅ {company['name']}: 处理完成。新增/更新: {saved_count}，跳过: {len(jobs) - saved_count}")
-                return saved_count
+                if totals is not None:
+                    totals.add(result)
+                
+                logger.info(
+                    f"✅ {company['name']}: 处理完成。新增: {result.inserted}，更新: {result.updated}，"
+                    f"未变: {result.touched}，过滤: {result.rejected}，已拒绝: {result.skipped}，"
+                    f"下线: {result.deactivated}"
+                )
+                changed = bool(result.inserted or result.updated or result.deactivated)
+                return result.saved, changed, None
             else:
                 logger.info(f"ℹ️ {company['name']}: 未找到职位")
-                return 0
+                return 0, False, None
                 
         except Exception as e:
             logger.error(f"❌ 抓取 {company['name']} 失败: {e}")
-            return 0
+            return 0, None, None
 
-async def run_production_scrape():
+async def run_production_scrape(all_companies: bool = False, limit: int = None, parse_workers: int = None):
+    """
+    Args:
+        all_companies: 忽略调度，抓取全部在线公司
+        limit: 本次最多抓取的公司数（按优先级）
+        parse_workers: 解析进程数；默认读取 PARSE_WORKERS（未设置时为 CPU 核数 - 1），0 表示在事件循环中解析
+    """
     db = get_db()
+    scheduler = CrawlScheduler(db)
+    
+    # 所有抓取器共享一个连接池（keep-alive、DNS缓存、SSL context 只建一次）
+    http_client = HttpClient()
+    # 需要浏览器的抓取器共享一个浏览器（第一次使用时才启动）
+    browser_pool = BrowserPool()
     
     # Initialize scrapers
     scrapers = {
-        'greenhouse': GreenhouseScraper(),
-        'lever': LeverScraper(),
-        'workday': WorkdayScraper(),
-        'ashby': AshbyScraper(),
-        'workable': WorkableScraper(),
-        'wellfound': WellfoundScraper(),
+        'greenhouse': GreenhouseScraper(http_client),
+        'lever': LeverScraper(http_client),
+        'workday': WorkdayScraper(http_client),
+        'ashby': AshbyScraper(http_client),
+        'workable': WorkableScraper(http_client),
+        'wellfound': WellfoundScraper(http_client, browser_pool=browser_pool),
     }
     
-    # 1. Fetch only active companies from DB
-    companies = list(db.companies.find({'is_active': True}))
-    if not companies:
+    # 1. Fetch active companies that are due (or all of them with --all)
+    active_count = db.companies.count_documents({'is_active': True})
+    if not active_count:
         logger.warning("数据库中没有公司信息。请先运行 scripts/import_companies.py")
+        await http_client.close()
+        await browser_pool.close()
+        return
+    
+    if all_companies:
+        cursor = db.companies.find({'is_active': True}).sort('schedule.priority', -1)
+        companies = list(cursor.limit(limit) if limit else cursor)
+    else:
+        companies = scheduler.due_companies(limit=limit)
+    
+    if not companies:
+        logger.info(f"😴 {active_count} 家公司均未到抓取时间")
+        await http_client.close()
+        await browser_pool.close()
         return
 
-    logger.info(f"🚀 开始为 {len(companies)} 家公司进行生产抓取...")
+    logger.info(f"🚀 开始为 {len(companies)}/{active_count} 家到期公司进行生产抓取...")
+    
+    # HTML 清理、技能提取、过滤和派生字段在工作进程中完成，事件循环只做 I/O
+    parse_pool = ParsePool(parse_workers)
+    for scraper in scrapers.values():
+        scraper.parse_pool = parse_pool
     
-    # 使用信号量限制并发数，避免被封禁
-    semaphore = asyncio.Semaphore(5)
+    # 公司级并发；对各 ATS host 的请求速率和并发由 HttpClient 的按 host 限流器控制
+    semaphore = asyncio.Semaphore(int(os.getenv('SCRAPE_CONCURRENCY', 20)))
     
     # 创建所有抓取任务
-    tasks = [scrape_company(company, scrapers, db, semaphore) for company in companies]
+    totals = IngestionResult()
+    crawl_generation = JobIngestionService.new_crawl_generation()
+    logger.info(f"抓取代次: {crawl_generation}")
+    tasks = [
+        scrape_company(company, scrapers, db, semaphore, totals, crawl_generation, scheduler)
+        for company in companies
+    ]
     
     # 并行运行
-    results = await asyncio.gather(*tasks)
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        await http_client.close()
+        await browser_pool.close()
+        parse_pool.shutdown()
     
     total_new_jobs = sum(results)
 
     logger.info(f"🏁 生产抓取完成。总计更新/新增: {total_new_jobs} 个职位")
+    logger.info(
+        f"📦 入库统计: 新增 {totals.inserted}，更新 {totals.updated}，未变 {totals.touched}，"
+        f"过滤 {totals.rejected}，已拒绝 {totals.skipped}，下线 {totals.deactivated}"
+    )
+    logger.info(f"⏭️ 未变化而跳过的 board: {totals.boards_unchanged}/{len(companies)}")
+    logger.info(f"🔌 抓取失败: {totals.boards_failed}，熔断跳过: {totals.boards_open}")
+    logger.info(f"🧮 解析进程池: {parse_pool.summary()}")
+    logger.info(f"🧭 浏览器池: {browser_pool.summary()}")
+    logger.info(f"🌐 HTTP 连接池统计: {http_client.summary()}")
+    for line in http_client.host_summary():
+        logger.info(f"🚦 {line}")
+
+    # 公司统计（在线 / 本周新增 / 远程职位数）一次聚合重算，供 /api/stats 和 /api/companies 读取
+    try:
+        summary = sync_company_stats(db)
+        logger.info(
+            f"📊 公司统计: {summary['companies']} 家公司有在线职位，在线 {summary['active_jobs']}，"
+            f"本周新增 {summary['new_jobs_this_week']}，远程 {summary['remote_jobs']}"
+        )
+    except Exception as e:
+        logger.error(f"公司统计更新失败: {e}")
+
+    # 职位有变化时提升数据版本，API 的响应缓存随之失效
+    if totals.inserted or totals.updated or totals.deactivated:
+        version = bump_data_version(db, reason=f"crawl {crawl_generation}")
+        logger.info(f"🔖 数据版本: {version}")
     close_db()
 
 if __name__ == "__main__":
-    asyncio.run(run_production_scrape())
+    parser = argparse.ArgumentParser(description="Production scraper")
+    parser.add_argument("--all", action="store_true", help="Ignore schedules and crawl every active company")
+    parser.add_argument("--limit", type=int, help="Crawl at most N companies this run (highest priority first)")
+    parser.add_argument("--workers", type=int, help="Parse worker processes (default: PARSE_WORKERS or CPU count - 1; 0 = parse on the event loop)")
+    args = parser.parse_args()
+    asyncio.run(run_production_scrape(all_companies=args.all, limit=args.limit, parse_workers=args.workers))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Re-classify jobs after changing the rules in src/services/job_classifier.py.
+
+By default only jobs classified with an older CATEGORY_VERSION (or never
+classified) are processed; bump CATEGORY_VERSION when editing the rules.
+Only documents whose categories actually change are rewritten.
+
+Usage:
+    python scripts/reclassify_jobs.py            # outdated jobs only
+    python scripts/reclassify_jobs.py --all      # every job
+    python scripts/reclassify_jobs.py --dry-run  # report changes without writing
+"""
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.db import get_db
+from src.services.job_classifier import CATEGORY_VERSION, classify_job
+
+BATCH_SIZE = 500
+
+
+def reclassify_jobs(rebuild_all: bool = False, dry_run: bool = False):
+    db = get_db()
+    query = {} if rebuild_all else {'category_version': {'$ne': CATEGORY_VERSION}}
+    total = db.jobs.count_documents(query)
+    print(f"🏷️  Re-classifying {total} jobs (rules v{CATEGORY_VERSION})...")
+
+    ops = []
+    changed = 0
+    category_counts = Counter()
+    for job in db.jobs.find(query, {'title': 1, 'skills': 1, 'category': 1, 'category_version': 1}).batch_size(BATCH_SIZE):
+        fields = classify_job(job)
+        category_counts.update(fields['category'])
+        if job.get('category') == fields['category'] and job.get('category_version') == CATEGORY_VERSION:
+            continue
+        changed += 1
+        ops.append(UpdateOne({'_id': job['_id']}, {'$set': fields}))
+        if len(ops) >= BATCH_SIZE and not dry_run:
+            db.jobs.bulk_write(ops, ordered=False)
+            ops = []
+
+    if ops and not dry_run:
+        db.jobs.bulk_write(ops, ordered=False)
+
+    print(f"{'🔍 Would update' if dry_run else '✅ Updated'} {changed}/{total} jobs")
+    for category, count in category_counts.most_common():
+        print(f"   {category}: {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-apply job category rules")
+    parser.add_argument("--all", action="store_true", help="Re-classify every job, not just outdated ones")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    args = parser.parse_args()
+    reclassify_jobs(args.all, args.dry_run)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Record ATS responses into replay fixtures
+Runs a scraper against the live board with RecordingHttpClient and writes
+every response to a gzip fixture, for offline benchmarks
+(scripts/bench_scrapers.py --fixtures ...).
+
+Usage:
+    python scripts/record_fixtures.py --company Stripe --company Notion
+    python scripts/record_fixtures.py --ats-url https://jobs.lever.co/plaid --name Plaid
+"""
+import argparse
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scrapers.greenhouse import GreenhouseScraper
+from src.scrapers.lever import LeverScraper
+from src.scrapers.ashby import AshbyScraper
+from src.scrapers.workable import WorkableScraper
+from src.scrapers.workday import WorkdayScraper
+from src.scrapers.replay import RecordingHttpClient
+
+SCRAPERS = {
+    'greenhouse': GreenhouseScraper,
+    'lever': LeverScraper,
+    'ashby': AshbyScraper,
+    'workable': WorkableScraper,
+    'workday': WorkdayScraper,
+}
+
+URL_PATTERNS = [
+    ('greenhouse.io', 'greenhouse'),
+    ('lever.co', 'lever'),
+    ('myworkdayjobs.com', 'workday'),
+    ('workday.com', 'workday'),
+    ('ashbyhq.com', 'ashby'),
+    ('workable.com', 'workable'),
+]
+
+DEFAULT_OUT = project_root / 'data' / 'fixtures'
+
+
+def detect_ats_type(company: dict):
+    ats_url = company.get('ats_url') or ''
+    for pattern, ats_type in URL_PATTERNS:
+        if pattern in ats_url:
+            return ats_type
+    ats_info = company.get('ats_system') or {}
+    return ats_info.get('type') if isinstance(ats_info, dict) else None
+
+
+async def record(company: dict, out_dir: Path) -> None:
+    ats_type = detect_ats_type(company)
+    if ats_type not in SCRAPERS:
+        print(f"⚠️  {company['name']}: unsupported ATS '{ats_type}'")
+        return
+
+    client = RecordingHttpClient()
+    try:
+        jobs = await SCRAPERS[ats_type](client).scrape(company)
+    finally:
+        await client.close()
+
+    slug = re.sub(r'[^a-z0-9]+', '-', company['name'].lower()).strip('-')
+    path = out_dir / f"{ats_type}_{slug}.json.gz"
+    client.save(path, ats_type, company)
+    size_kb = path.stat().st_size / 1024
+    print(f"✅ {company['name']}: {len(jobs)} jobs, {len(client.entries)} responses -> {path} ({size_kb:.0f} KB)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Record ATS responses into replay fixtures")
+    parser.add_argument("--company", action="append", default=[], help="Company name in MongoDB (repeatable)")
+    parser.add_argument("--ats-url", help="Record a board by URL instead of a DB company")
+    parser.add_argument("--name", help="Company name for --ats-url")
+    parser.add_argument("--out", default=str(DEFAULT_OUT), help="Output directory")
+    args = parser.parse_args()
+
+    companies = []
+    if args.ats_url:
+        name = args.name or args.ats_url.rstrip('/').rsplit('/', 1)[-1]
+        companies.append({'name': name, 'domain': f"{name.lower()}.com", 'ats_url': args.ats_url})
+    if args.company:
+        from api.db import get_db
+        db = get_db()
+        for name in args.company:
+            company = db.companies.find_one({'name': name})
+            if company:
+                companies.append(company)
+            else:
+                print(f"⚠️  Company not found: {name}")
+
+    if not companies:
+        parser.error("nothing to record: pass --company or --ats-url")
+
+    out_dir = Path(args.out)
+    for company in companies:
+        await record(company, out_dir)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,6 +16,7 @@ from src.scrapers.greenhouse import GreenhouseScraper
 from src.scrapers.lever import LeverScraper
 from src.scrapers.ashby import AshbyScraper
 from src.scrapers.workable import WorkableScraper
+from src.scrapers.http_client import HttpClient
 # Remind: Workday scraper might handle some too but mostly we saw GH/Lever/Ashby/Workable
 
 # Configure logging
@@ -34,12 +35,13 @@ async def scrape_benlang_companies():
     company_names = collection['data']['companies']
     logger.info(f"Targets: {len(company_names)} companies from Ben Lang collection")
     
-    # Initialize scrapers
+    # Initialize scrapers (shared connection pool)
+    http_client = HttpClient()
     scrapers = {
-        'greenhouse': GreenhouseScraper(),
-        'lever': LeverScraper(),
-        'ashby': AshbyScraper(),
-        'workable': WorkableScraper()
+        'greenhouse': GreenhouseScraper(http_client),
+        'lever': LeverScraper(http_client),
+        'ashby': AshbyScraper(http_client),
+        'workable': WorkableScraper(http_client)
     }
     
     semaphore = asyncio.Semaphore(5)  # Concurrency limit
@@ -148,7 +150,10 @@ async def scrape_benlang_companies():
                 logger.error(f"Error scraping {name}: {e}")
 
     tasks = [process_company(name) for name in company_names]
-    await asyncio.gather(*tasks)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await http_client.close()
 
 if __name__ == '__main__':
     asyncio.run(scrape_benlang_companies())
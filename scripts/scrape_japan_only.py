@@ -14,6 +14,7 @@ from src.scrapers.lever import LeverScraper
 from src.scrapers.workday import WorkdayScraper
 from src.scrapers.ashby import AshbyScraper
 from src.scrapers.workable import WorkableScraper
+from src.scrapers.http_client import HttpClient
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("JapanScraper")
@@ -21,13 +22,14 @@ logger = logging.getLogger("JapanScraper")
 async def main():
     db = get_db()
     
-    # Initialize scrapers
+    # Initialize scrapers (shared connection pool)
+    http_client = HttpClient()
     scrapers = {
-        'greenhouse': GreenhouseScraper(),
-        'lever': LeverScraper(),
-        'workday': WorkdayScraper(),
-        'ashby': AshbyScraper(),
-        'workable': WorkableScraper()
+        'greenhouse': GreenhouseScraper(http_client),
+        'lever': LeverScraper(http_client),
+        'workday': WorkdayScraper(http_client),
+        'ashby': AshbyScraper(http_client),
+        'workable': WorkableScraper(http_client)
     }
     
     # Get all Japanese companies with an ATS URL
@@ -41,7 +43,10 @@ async def main():
     semaphore = asyncio.Semaphore(5)
     tasks = [scrape_company(c, scrapers, db, semaphore) for c in companies]
     
-    results = await asyncio.gather(*tasks)
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        await http_client.close()
     total_jobs = sum(results)
     
     logger.info(f"Successfully scraped {total_jobs} jobs from {len(companies)} Japanese companies")
@@ -16,6 +16,7 @@ from src.database.connection import get_db, close_db
 from src.scrapers.greenhouse import GreenhouseScraper
 from src.scrapers.lever import LeverScraper
 from src.scrapers.workday import WorkdayScraper
+from src.scrapers.http_client import HttpClient
 from scripts.prod_scraper import scrape_company
 
 # Configure logging
@@ -28,11 +29,12 @@ logger = logging.getLogger("NewCompanyScraper")
 async def run_targeted_scrape():
     db = get_db()
     
-    # Initialize scrapers
+    # Initialize scrapers (shared connection pool)
+    http_client = HttpClient()
     scrapers = {
-        'greenhouse': GreenhouseScraper(),
-        'lever': LeverScraper(),
-        'workday': WorkdayScraper()
+        'greenhouse': GreenhouseScraper(http_client),
+        'lever': LeverScraper(http_client),
+        'workday': WorkdayScraper(http_client)
     }
     
     # Find companies added by import_script (newly added)
@@ -42,6 +44,7 @@ async def run_targeted_scrape():
     
     if not companies:
         logger.warning("No new companies found (added_by='import_script').")
+        await http_client.close()
         return
 
     logger.info(f"🚀 Starting scrape for {len(companies)} newly imported companies...")
@@ -51,7 +54,10 @@ async def run_targeted_scrape():
     
     tasks = [scrape_company(company, scrapers, db, semaphore) for company in companies]
     
-    results = await asyncio.gather(*tasks)
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        await http_client.close()
     
     total_new_jobs = sum(results)
     logger.info(f"🏁 Scrape completed. Imported {total_new_jobs} new jobs from {len(companies)} companies.")
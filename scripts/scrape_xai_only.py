@@ -22,6 +22,7 @@ async def scrape_xai():
     semaphore = asyncio.Semaphore(1)
     
     count = await scrape_company(company, scrapers, db, semaphore)
+    await scrapers['greenhouse'].http.close()
     print(f"Imported {count} jobs for xAI")
     close_db()
 
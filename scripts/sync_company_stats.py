@@ -1,46 +1,33 @@
 #!/usr/bin/env python3
 """
 Sync company job counts from jobs collection to companies collection.
-Updates the stats.active_jobs field for each company.
+Rebuilds company_stats and the stats.active_jobs / total_jobs_found /
+new_jobs_this_week / remote_jobs fields of every company with one
+aggregation (src/services/company_stats.py). prod_scraper runs the same sync
+after every crawl; use this script after editing jobs by hand.
 """
-from api.db import get_db
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.connection import get_db, close_db
+from src.services.company_stats import sync_company_stats
+from src.services.data_version import bump_data_version
+
 
 def sync_company_job_counts():
     db = get_db()
     
     print("🔄 Starting company job count sync...")
+    summary = sync_company_stats(db)
+    version = bump_data_version(db, reason="sync_company_stats")
     
-    # Get all companies
-    companies = list(db.companies.find())
-    total = len(companies)
-    updated = 0
-    
-    for idx, company in enumerate(companies, 1):
-        company_name = company['name']
-        
-        # Count active jobs for this company
-        job_count = db.jobs.count_documents({
-            'company': company_name,
-            'is_active': True
-        })
-        
-        # Update the company's stats
-        result = db.companies.update_one(
-            {'_id': company['_id']},
-            {'$set': {'stats.active_jobs': job_count}}
-        )
-        
-        if result.modified_count > 0:
-            updated += 1
-            if job_count > 0:
-                print(f"✅ [{idx}/{total}] {company_name}: {job_count} jobs")
-        else:
-            if job_count > 0:
-                print(f"ℹ️  [{idx}/{total}] {company_name}: {job_count} jobs (already up-to-date)")
-    
-    print(f"\n✅ Sync completed!")
-    print(f"   Total companies: {total}")
-    print(f"   Updated: {updated}")
+    print(f"\n✅ Sync completed! (data version {version})")
+    print(f"   Active jobs: {summary['active_jobs']}")
+    print(f"   New this week: {summary['new_jobs_this_week']}")
+    print(f"   Remote: {summary['remote_jobs']}")
     
     # Show summary
     with_jobs = db.companies.count_documents({'stats.active_jobs': {'$gt': 0}})
@@ -49,6 +36,8 @@ def sync_company_job_counts():
     print(f"\n📊 Summary:")
     print(f"   Companies with jobs: {with_jobs}")
     print(f"   Companies without jobs (silent): {without_jobs}")
+    print(f"   Job posters not in companies collection: {summary['companies'] - with_jobs}")
+    close_db()
 
 if __name__ == '__main__':
     sync_company_job_counts()
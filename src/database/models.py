@@ -32,10 +32,11 @@ class ScraperConfig:
 @dataclass
 class Schedule:
     """调度配置"""
-    frequency_hours: int = 12
+    frequency_hours: float = 12  # 由 CrawlScheduler 根据 board 变化频率自动调整
     last_scraped_at: Optional[datetime] = None
     next_scrape_at: Optional[datetime] = None
-    priority: int = 1  # 1-5
+    priority: int = 1  # 1-5，越大越优先
+    last_changed_at: Optional[datetime] = None  # 最近一次发现职位变化的时间
     
     def to_dict(self) -> dict:
         data = asdict(self)
@@ -50,6 +51,10 @@ class CompanyStats:
     avg_new_jobs_per_week: float = 0.0
     scrape_success_rate: float = 1.0
     last_error: Optional[str] = None
+    # 由 src/services/company_stats.py 在每次抓取后重算
+    new_jobs_this_week: int = 0
+    remote_jobs: int = 0
+    updated_at: Optional[datetime] = None
     
     def to_dict(self) -> dict:
         return asdict(self)
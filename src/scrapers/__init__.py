@@ -1,5 +1,5 @@
 """Scrapers package"""
-from .base import BaseScraper
+from .base import BaseScraper, BoardNotModified, ScrapeError
 from .greenhouse import GreenhouseScraper
 
-__all__ = ['BaseScraper', 'GreenhouseScraper']
+__all__ = ['BaseScraper', 'BoardNotModified', 'ScrapeError', 'GreenhouseScraper']
@@ -1,6 +1,4 @@
-import aiohttp
 import asyncio
-import ssl
 import json
 import logging
 import re
@@ -8,15 +6,17 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
 
-from .base import BaseScraper
+from .base import BaseScraper, BoardNotModified, ScrapeError
+from .html_text import html_to_text
+from .http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 
 class AshbyScraper(BaseScraper):
     """Ashby ATS Scraper (jobs.ashbyhq.com)"""
     
-    def __init__(self):
-        super().__init__("ashby")
+    def __init__(self, http_client: Optional[HttpClient] = None):
+        super().__init__("ashby", http_client)
         
     async def scrape(self, company: Dict) -> List[Dict]:
         """
@@ -42,8 +42,7 @@ class AshbyScraper(BaseScraper):
                      break
         
         if not url:
-             self.logger.warning(f"Could not determine Ashby URL for {company['name']}")
-             return []
+             raise ScrapeError(f"Could not determine Ashby URL for {company['name']}")
              
         # Normalize URL to ensure it ends with slash or no slash consistently?
         # Actually we want the API Endpoint.
@@ -56,9 +55,8 @@ class AshbyScraper(BaseScraper):
 
     async def _validate_url(self, url):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.head(url, timeout=5) as resp:
-                    return resp.status == 200
+            async with self.http.head(url, timeout=5) as resp:
+                return resp.status == 200
         except:
             return False
 
@@ -67,17 +65,10 @@ class AshbyScraper(BaseScraper):
         Ashby renders mostly server-side or hydrates via JSON.
         We will try to fetch the HTML and parse the script tags or the DOM.
         """
-        # SSL Context
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, ssl=ssl_context) as response:
-                if response.status != 200:
-                    self.logger.error(f"Failed to fetch {url}: {response.status}")
-                    return []
-                html_content = await response.text()
+        async with self.http.get(url) as response:
+            if response.status != 200:
+                raise ScrapeError.from_status(response.status, url)
+            html_content = await response.text()
                 
         # Method 1: Look for __NEXT_DATA__
         soup = BeautifulSoup(html_content, 'html.parser')
@@ -92,7 +83,11 @@ class AshbyScraper(BaseScraper):
                 raw_jobs = job_board.get('jobs', [])
                 
                 if raw_jobs:
-                    return [self._parse_job(j, company, url) for j in raw_jobs]
+                    # 页面本身每次构建都会变化，只对职位数据做摘要比较
+                    self.remember_board(company, url, json.dumps(raw_jobs, sort_keys=True).encode('utf-8'))
+                    return await self._parse_jobs(raw_jobs, company, url)
+            except BoardNotModified:
+                raise
             except Exception as e:
                 self.logger.warning(f"Failed to parse __NEXT_DATA__: {e}")
 
@@ -104,7 +99,7 @@ class AshbyScraper(BaseScraper):
             slug = slug_match.group(1)
             return await self._scrape_via_api(slug, company)
             
-        return []
+        raise ScrapeError(f"No jobs data in {url} and no Ashby slug to fall back to the API")
 
     async def _scrape_via_api(self, slug: str, company: Dict) -> List[Dict]:
         """
@@ -113,22 +108,35 @@ class AshbyScraper(BaseScraper):
         """
         api_url = f"https://api.ashbyhq.com/posting-api/job-board/{slug}"
         
-        # SSL Context
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, ssl=ssl_context) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        raw_jobs = data.get('jobs', [])
-                        return [self._parse_job(j, company, f"https://jobs.ashbyhq.com/{slug}") for j in raw_jobs]
+            # 条件请求：board 未变化时抛出 BoardNotModified
+            status, body = await self.fetch_board(company, 'GET', api_url)
+            if status != 200:
+                raise ScrapeError.from_status(status, api_url)
+            data = json.loads(body)
+            raw_jobs = data.get('jobs', [])
+            return await self._parse_jobs(raw_jobs, company, f"https://jobs.ashbyhq.com/{slug}")
+        except (BoardNotModified, ScrapeError):
+            raise
         except Exception as e:
-            self.logger.error(f"Ashby API scrape failed for {slug}: {e}")
-            
-        return []
+            raise ScrapeError.from_exception(e) from e
+
+    async def _parse_jobs(self, raw_jobs: List[Dict], company: Dict, base_url: str) -> List[Dict]:
+        """
+        Parse a board's jobs, emitting lightweight "seen" records for jobs whose
+        list fingerprint is unchanged (no HTML cleaning / extraction for those).
+        """
+        jobs = []
+        changed = []
+        for raw_job in raw_jobs:
+            fingerprint = self.list_fingerprint(raw_job)
+            seen = self.seen_record(company, f"ashby_{raw_job.get('id')}", fingerprint)
+            if seen:
+                jobs.append(seen)
+            else:
+                changed.append((raw_job, fingerprint))
+        jobs.extend(await self.parse_jobs(company, changed, base_url))
+        return jobs
 
     def _parse_job(self, raw_job: Dict, company: Dict, base_url: str) -> Dict:
         """
@@ -197,7 +205,8 @@ class AshbyScraper(BaseScraper):
             'description': description,
             'posted_date': posted_date,
             'job_type': job_type,
-            'remote_type': remote_type
+            'remote_type': remote_type,
+            'is_remote': is_remote
         }
         
         job = self.normalize_job_data(
@@ -226,8 +235,7 @@ class AshbyScraper(BaseScraper):
         return job
 
     def _clean_html(self, html_text):
-        soup = BeautifulSoup(html_text, 'html.parser')
-        return soup.get_text(separator='\n', strip=True)
+        return html_to_text(html_text, normalize_lines=False)
 
 # Test
 async def main():
@@ -238,6 +246,7 @@ async def main():
         "ats_url": "https://jobs.ashbyhq.com/anthropic"
     }
     jobs = await scraper.scrape(company)
+    await scraper.http.close()
     print(f"Found {len(jobs)} jobs")
     if jobs:
         print(jobs[0])
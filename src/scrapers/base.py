@@ -2,19 +2,74 @@
 Base Scraper Abstract Class
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
+import asyncio
+import hashlib
+import json
 import logging
 
+import aiohttp
+
+from .http_client import HttpClient
+from ..services.location import normalize_location
+
 logger = logging.getLogger(__name__)
 
 
+class BoardNotModified(Exception):
+    """Board 自上次成功抓取后没有变化（HTTP 304 或内容摘要一致），可跳过整个解析/入库流程"""
+
+
+class ScrapeError(Exception):
+    """
+    抓取失败（与 "board 上确实没有职位" 区分开）
+
+    transient: 超时、连接错误、408/425/429/5xx 等可重试的错误；
+               404、无法识别 board、响应格式变化等重试无意义
+    """
+
+    TRANSIENT_STATUSES = {408, 425, 429}
+
+    def __init__(self, message: str, transient: bool = False, status: Optional[int] = None):
+        super().__init__(message)
+        self.transient = transient
+        self.status = status
+
+    @classmethod
+    def from_status(cls, status: int, url: str) -> 'ScrapeError':
+        transient = status in cls.TRANSIENT_STATUSES or status >= 500
+        return cls(f"HTTP {status}: {url}", transient=transient, status=status)
+
+    @classmethod
+    def from_exception(cls, exc: Exception) -> 'ScrapeError':
+        if isinstance(exc, ScrapeError):
+            return exc
+        transient = isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError))
+        return cls(f"{type(exc).__name__}: {exc}", transient=transient)
+
+
 class BaseScraper(ABC):
     """抓取器基类"""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, http_client: Optional[HttpClient] = None):
+        """
+        Args:
+            name: 抓取器名称
+            http_client: 共享HTTP客户端（一次抓取运行共用一个连接池）；
+                         未提供时抓取器自建一个
+        """
         self.name = name
         self.logger = logging.getLogger(f"scraper.{name}")
+        self.http = http_client or HttpClient()
+        # 本次抓取到的 board 校验信息（公司名 -> board_cache），入库成功后由调用方取走并保存
+        self._pending_board_cache: Dict[str, Dict] = {}
+        # 已知的列表指纹（公司名 -> (job_id -> 指纹, 已拒绝职位的指纹集合)），由调用方在抓取前设置
+        self._known_fingerprints: Dict[str, Tuple[Dict[str, str], Set[str]]] = {}
+        # 可选的解析进程池（ParsePool），由调用方设置；未设置时在事件循环中解析
+        self.parse_pool = None
+        # 本次未能完整处理列表的公司（有职位解析或详情获取失败），调用方据此跳过 sweep
+        self._incomplete: Set[str] = set()
     
     @abstractmethod
     async def scrape(self, company: Dict) -> List[Dict]:
@@ -25,10 +80,59 @@ class BaseScraper(ABC):
             company: 公司信息字典
             
         Returns:
-            职位列表
+            职位列表（board 上没有职位时为空列表）
+            
+        Raises:
+            BoardNotModified: board 自上次抓取后没有变化
+            ScrapeError: 抓取失败
         """
         pass
     
+    def _parse_job(self, raw_item: Dict, company: Dict, *args) -> Optional[Dict]:
+        """把一个原始列表项解析为标准化职位；无法解析时返回 None（由支持 parse_jobs 的子类实现）"""
+        raise NotImplementedError
+
+    async def parse_jobs(self, company: Dict, items: List[Tuple[Dict, str]], *args) -> List[Dict]:
+        """
+        解析一批有变化的职位
+
+        设置了 parse_pool 时交给工作进程（同时完成过滤和检索/分类字段），
+        否则在当前进程中解析。
+
+        Args:
+            items: (原始列表项, 列表指纹)
+            args: 透传给 _parse_job 的额外参数（board token、base URL 等）
+        """
+        if self.parse_pool is not None:
+            parsed = await self.parse_pool.parse(self, company, items, args)
+        else:
+            parsed = self.parse_batch(company, items, args)
+
+        jobs = [job for job in parsed if not job.get('parse_failed')]
+        if len(jobs) < len(parsed):
+            self.mark_incomplete(company, f"{len(parsed) - len(jobs)} 个职位解析失败")
+        return jobs
+
+    def parse_batch(self, company: Dict, items: List[Tuple[Dict, str]], args: Tuple = ()) -> List[Dict]:
+        """
+        同步解析一批职位
+
+        单个职位解析失败时只跳过该职位，并输出 {'parse_failed': True} 占位记录
+        （可能在工作进程中运行，由 parse_jobs 据此标记本次列表未完整处理）
+        """
+        jobs = []
+        for raw_item, fingerprint in items:
+            try:
+                job = self._parse_job(raw_item, company, *args)
+            except Exception as e:
+                self.logger.error(f"解析职位失败: {e}")
+                jobs.append({'parse_failed': True})
+                continue
+            if job:
+                job['list_fingerprint'] = fingerprint
+                jobs.append(job)
+        return jobs
+
     def normalize_job_data(self, raw_data: Dict, company_name: str, source: str, company_location: Optional[str] = None) -> Dict:
         """
         标准化职位数据
@@ -62,6 +166,9 @@ class BaseScraper(ABC):
             raw_data.get('description', ''),
             job_location
         )
+
+        # Structured location facets (country / city / region / is_remote) for indexed filtering
+        location_facets = normalize_location(job_location, company_location, raw_data.get('is_remote', False))
         
         return {
             'job_id': raw_data.get('id', ''),
@@ -69,6 +176,10 @@ class BaseScraper(ABC):
             'company': company_name,
             'location': job_location,
             'company_location': company_location,
+            'country': location_facets['country'],
+            'city': location_facets['city'],
+            'region': location_facets['region'],
+            'is_remote': location_facets['is_remote'],
             'description': raw_data.get('description', ''),
             'source': source,
             'source_url': raw_data.get('url', ''),
@@ -80,11 +191,135 @@ class BaseScraper(ABC):
             'raw_data': raw_data
         }
     
+    async def fetch_board(self, company: Dict, method: str, url: str, **kwargs) -> Tuple[int, Optional[bytes]]:
+        """
+        条件请求 board 级别的职位列表
+
+        使用公司文档中保存的 board_cache（ETag / Last-Modified / 内容摘要）：
+        - 带上 If-None-Match / If-Modified-Since，返回 304 时抛出 BoardNotModified
+        - 没有校验头或服务端不支持时，比较响应内容摘要，一致同样抛出 BoardNotModified
+
+        Returns:
+            (status, body)；非 200 时 body 为 None
+        """
+        cache = self._board_cache_for(company, url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        if cache.get('last_modified'):
+            headers['If-Modified-Since'] = cache['last_modified']
+
+        async with self.http.request(method, url, headers=headers, **kwargs) as response:
+            if response.status == 304:
+                raise BoardNotModified(url)
+            if response.status != 200:
+                return response.status, None
+            body = await response.read()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        self.remember_board(company, url, body, etag, last_modified)
+        return 200, body
+
+    def remember_board(self, company: Dict, url: str, payload: bytes,
+                       etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        记录本次 board 的校验信息；内容摘要与上次一致时抛出 BoardNotModified
+
+        payload 可以是完整响应，也可以是从页面中提取出的职位数据（例如 Ashby 的 __NEXT_DATA__）。
+        """
+        digest = hashlib.sha256(payload).hexdigest()
+        if self._board_cache_for(company, url).get('digest') == digest:
+            raise BoardNotModified(url)
+
+        self._pending_board_cache[company['name']] = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'digest': digest,
+            'updated_at': datetime.utcnow(),
+        }
+
+    def mark_incomplete(self, company: Dict, reason: str):
+        """
+        本次没能处理 board 上的全部职位：调用方不应执行 sweep（否则这些职位会被误下线），
+        也不保存 board 校验信息（否则下次 board 未变化时不会重试）
+        """
+        self.logger.warning(f"{company['name']}: 列表未完整处理（{reason}），本次不下线职位")
+        self._incomplete.add(company['name'])
+        self.pop_board_cache(company['name'])
+
+    def pop_incomplete(self, company_name: str) -> bool:
+        """取走并清除该公司的 "未完整处理" 标记"""
+        if company_name in self._incomplete:
+            self._incomplete.discard(company_name)
+            return True
+        return False
+
+    def pop_board_cache(self, company_name: str) -> Optional[Dict]:
+        """取走本次抓取得到的 board 校验信息（只应在入库成功后保存）"""
+        return self._pending_board_cache.pop(company_name, None)
+
+    @staticmethod
+    def _board_cache_for(company: Dict, url: str) -> Dict:
+        """只有 URL 相同时上次的校验信息才有效"""
+        cache = company.get('board_cache') or {}
+        return cache if cache.get('url') == url else {}
+
+    def set_known_fingerprints(self, company_name: str, jobs: Dict[str, str], rejected: Set[str]):
+        """设置该公司已入库职位 / 已拒绝职位的列表指纹"""
+        self._known_fingerprints[company_name] = (jobs, rejected)
+
+    def clear_known_fingerprints(self, company_name: str):
+        self._known_fingerprints.pop(company_name, None)
+
+    @staticmethod
+    def list_fingerprint(raw_item: Dict, *fields: str) -> str:
+        """
+        列表项指纹：在解析 HTML、提取技能、过滤之前计算
+
+        指定 fields 时只使用这些字段（例如 Greenhouse 的 id + updated_at），
+        否则对整个原始列表项做摘要。
+        """
+        if fields:
+            content = '|'.join(str(raw_item.get(field, '')) for field in fields)
+        else:
+            content = json.dumps(raw_item, sort_keys=True, default=str)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def seen_record(self, company: Dict, job_id: str, fingerprint: str) -> Optional[Dict]:
+        """
+        指纹与已保存的一致时返回轻量的 "seen" 记录，调用方应跳过详情获取和解析
+
+        Returns:
+            {'job_id', 'seen_only': True, 'list_fingerprint'[, 'rejected': True]}；指纹未知时返回 None
+        """
+        known_jobs, known_rejected = self._known_fingerprints.get(company['name'], ({}, set()))
+        if known_jobs.get(job_id) == fingerprint:
+            return {'job_id': job_id, 'seen_only': True, 'list_fingerprint': fingerprint}
+        if fingerprint in known_rejected:
+            return {'job_id': job_id, 'seen_only': True, 'rejected': True, 'list_fingerprint': fingerprint}
+        return None
+
+    def touch_record(self, company: Dict, job_id: str) -> Optional[Dict]:
+        """
+        已入库职位本次无法完整获取（例如详情请求失败）时的 "seen" 记录
+
+        只刷新 last_seen_at 和代次、不写入新指纹：职位不会被 sweep 下线，
+        已保存的描述等字段也不会被不完整的数据覆盖，下次抓取时重新获取。
+
+        Returns:
+            {'job_id', 'seen_only': True}；该职位尚未入库时返回 None
+        """
+        known_jobs, _ = self._known_fingerprints.get(company['name'], ({}, set()))
+        if job_id in known_jobs:
+            return {'job_id': job_id, 'seen_only': True}
+        return None
+
     def generate_content_hash(self, title: str, description: str, location: str) -> str:
         """
         生成职位内容的唯一哈希值
         """
-        import hashlib
         content = f"{title}|{description}|{location}".encode('utf-8')
         return hashlib.md5(content).hexdigest()
     
@@ -0,0 +1,238 @@
+"""
+Browser Pool
+One long-lived headless Chromium shared by a whole crawl, with a bounded set
+of reusable browser contexts. Images, media, fonts and analytics requests are
+aborted at the network layer, and every page's load time and JS heap is
+recorded for the end-of-run summary.
+
+Usage:
+    pool = BrowserPool()
+    async with pool.page() as page:
+        await page.goto(url, wait_until="domcontentloaded")
+    ...
+    await pool.close()
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Page, Route, async_playwright
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+)
+
+# 不影响职位数据、却占用大部分带宽和渲染时间的资源
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# 统计 / 广告 / 会话录制脚本（按 host 后缀匹配）
+BLOCKED_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'facebook.net', 'connect.facebook.com', 'segment.com', 'segment.io', 'amplitude.com',
+    'mixpanel.com', 'hotjar.com', 'fullstory.com', 'intercom.io', 'intercomcdn.com',
+    'sentry.io', 'datadoghq.com', 'newrelic.com', 'nr-data.net', 'clarity.ms', 'linkedin.com',
+)
+
+
+def _is_blocked_host(host: str) -> bool:
+    return any(host == suffix or host.endswith('.' + suffix) for suffix in BLOCKED_HOSTS)
+
+
+def _browser_rss_mb() -> Optional[float]:
+    """当前进程所有子孙进程（Playwright driver + Chromium）的 RSS 之和；非 Linux 返回 None"""
+    try:
+        parents: Dict[int, int] = {}
+        for entry in os.listdir('/proc'):
+            if entry.isdigit():
+                with open(f'/proc/{entry}/stat') as f:
+                    # pid (comm) state ppid ...；comm 中可能有空格，从最后一个 ')' 之后解析
+                    parents[int(entry)] = int(f.read().rsplit(')', 1)[1].split()[1])
+    except OSError:
+        return None
+
+    descendants, frontier = set(), {os.getpid()}
+    while frontier:
+        frontier = {pid for pid, ppid in parents.items() if ppid in frontier} - descendants
+        descendants |= frontier
+
+    total_kb = 0
+    for pid in descendants:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+class BrowserPool:
+    """
+    整次抓取共享的浏览器池
+
+    - 浏览器在第一次使用时启动，整次运行只启动一次
+    - 最多 max_contexts 个上下文同时使用，用完放回复用；每个上下文打开
+      pages_per_context 个页面后重建，避免内存随 cookie / 缓存增长
+    - 拦截图片、媒体、字体和统计脚本请求
+    """
+
+    def __init__(self, max_contexts: Optional[int] = None, pages_per_context: Optional[int] = None,
+                 headless: bool = True, block_resources: bool = True):
+        """
+        Args:
+            max_contexts: 并发上下文数，默认读取 BROWSER_CONTEXTS（2）
+            pages_per_context: 上下文重建前打开的页面数，默认读取 BROWSER_PAGES_PER_CONTEXT（20）
+            block_resources: False 时不拦截任何请求（调试页面渲染时使用）
+        """
+        self.max_contexts = max_contexts or int(os.getenv('BROWSER_CONTEXTS', 2))
+        self.pages_per_context = pages_per_context or int(os.getenv('BROWSER_PAGES_PER_CONTEXT', 20))
+        self.headless = headless
+        self.block_resources = block_resources
+
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._start_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.max_contexts)
+        self._idle: List[BrowserContext] = []
+        self._uses: Dict[BrowserContext, int] = {}
+
+        self.stats = {
+            'launch_s': 0.0,
+            'contexts': 0,
+            'pages': 0,
+            'failed_pages': 0,
+            'blocked': 0,
+            'allowed': 0,
+        }
+        self._page_seconds: List[float] = []
+        self._page_heap_mb: List[float] = []
+        self._peak_rss_mb = 0.0
+
+    async def _ensure_browser(self) -> Browser:
+        async with self._start_lock:
+            if self._browser is not None and not self._browser.is_connected():
+                logger.warning("浏览器已断开，重新启动")
+                self._idle.clear()
+                self._uses.clear()
+                self._browser = None
+                await self._playwright.stop()
+            if self._browser is None:
+                start = time.perf_counter()
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=self.headless,
+                    args=['--disable-dev-shm-usage', '--disable-gpu', '--no-first-run'],
+                )
+                self.stats['launch_s'] = time.perf_counter() - start
+                logger.info(f"🧭 浏览器已启动 ({self.stats['launch_s']:.1f}s)")
+        return self._browser
+
+    async def _new_context(self) -> BrowserContext:
+        browser = await self._ensure_browser()
+        context = await browser.new_context(user_agent=USER_AGENT, viewport={'width': 1280, 'height': 800})
+        if self.block_resources:
+            await context.route('**/*', self._route)
+        self.stats['contexts'] += 1
+        self._uses[context] = 0
+        return context
+
+    async def _route(self, route: Route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ''
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(host):
+            self.stats['blocked'] += 1
+            await route.abort()
+        else:
+            self.stats['allowed'] += 1
+            await route.continue_()
+
+    async def _release_context(self, context: BrowserContext):
+        self._uses[context] += 1
+        if self._uses[context] >= self.pages_per_context:
+            self._uses.pop(context, None)
+            await context.close()
+        else:
+            self._idle.append(context)
+
+    @asynccontextmanager
+    async def page(self):
+        """借用一个页面（所属上下文用完放回池中），并记录页面耗时和 JS 堆内存"""
+        async with self._slots:
+            context = self._idle.pop() if self._idle else await self._new_context()
+            try:
+                page: Page = await context.new_page()
+            except Exception:
+                # 上下文已不可用（例如浏览器崩溃），丢弃而不是放回池中
+                self._uses.pop(context, None)
+                await asyncio.gather(context.close(), return_exceptions=True)
+                raise
+            start = time.perf_counter()
+            try:
+                yield page
+            except Exception:
+                self.stats['failed_pages'] += 1
+                raise
+            finally:
+                self._page_seconds.append(time.perf_counter() - start)
+                self.stats['pages'] += 1
+                await self._record_memory(page)
+                try:
+                    await page.close()
+                except Exception:
+                    # 页面或浏览器已崩溃，上下文不再复用
+                    self._uses.pop(context, None)
+                    await asyncio.gather(context.close(), return_exceptions=True)
+                else:
+                    await self._release_context(context)
+
+    async def _record_memory(self, page: Page):
+        try:
+            heap = await asyncio.wait_for(
+                page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : 0"), timeout=2
+            )
+            self._page_heap_mb.append(heap / 1e6)
+        except Exception:
+            pass
+        rss = _browser_rss_mb()
+        if rss is not None:
+            self._peak_rss_mb = max(self._peak_rss_mb, rss)
+
+    def summary(self) -> str:
+        pages = self._page_seconds
+        if not pages:
+            return "未使用"
+        ordered = sorted(pages)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        heap = self._page_heap_mb
+        line = (
+            f"启动 {self.stats['launch_s']:.1f}s，{self.stats['contexts']} 个上下文，"
+            f"{self.stats['pages']} 个页面（失败 {self.stats['failed_pages']}），"
+            f"页面耗时 avg {sum(pages) / len(pages):.1f}s / p95 {p95:.1f}s / max {ordered[-1]:.1f}s，"
+            f"拦截请求 {self.stats['blocked']}/{self.stats['blocked'] + self.stats['allowed']}"
+        )
+        if heap:
+            line += f"，JS 堆 avg {sum(heap) / len(heap):.0f}MB / max {max(heap):.0f}MB"
+        if self._peak_rss_mb:
+            line += f"，浏览器进程 RSS 峰值 {self._peak_rss_mb:.0f}MB"
+        return line
+
+    async def close(self):
+        for context in self._idle:
+            await context.close()
+        self._idle.clear()
+        self._uses.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
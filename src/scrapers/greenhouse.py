@@ -1,14 +1,13 @@
-import aiohttp
 import asyncio
-import ssl
-import html
+import json
 from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 import re
-from bs4 import BeautifulSoup
 
-from .base import BaseScraper
+from .base import BaseScraper, BoardNotModified, ScrapeError
+from .html_text import html_to_text
+from .http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +17,11 @@ class GreenhouseScraper(BaseScraper):
     
     API_BASE = "https://boards-api.greenhouse.io/v1/boards"
     
-    def __init__(self):
-        super().__init__("greenhouse")
+    # 批量模式下仍缺描述的职位，单独获取详情时的最大并发数
+    DETAIL_CONCURRENCY = 10
+    
+    def __init__(self, http_client: Optional[HttpClient] = None):
+        super().__init__("greenhouse", http_client)
     
     async def scrape(self, company: Dict) -> List[Dict]:
         """
@@ -36,8 +38,7 @@ class GreenhouseScraper(BaseScraper):
         # 获取board token
         board_token = await self._get_board_token(company)
         if not board_token:
-            self.logger.warning(f"无法获取 {company['name']} 的 Greenhouse board token")
-            return []
+            raise ScrapeError(f"无法获取 {company['name']} 的 Greenhouse board token")
         
         # 调用API获取职位
         jobs = await self._fetch_jobs_from_api(board_token, company)
@@ -96,17 +97,11 @@ class GreenhouseScraper(BaseScraper):
         """测试board token是否有效"""
         url = f"{self.API_BASE}/{token}/jobs"
         
-        # SSL context for development
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, ssl=ssl_context, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return 'jobs' in data or isinstance(data, list)
+            async with self.http.get(url, timeout=10) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return 'jobs' in data or isinstance(data, list)
         except:
             pass
         
@@ -123,64 +118,97 @@ class GreenhouseScraper(BaseScraper):
         Returns:
             职位列表
         """
-        url = f"{self.API_BASE}/{board_token}/jobs"
-        
-        # SSL context for development
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
+        # content=true: 列表接口直接返回每个职位的完整描述，一次请求拿到整个board
+        url = f"{self.API_BASE}/{board_token}/jobs?content=true"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, ssl=ssl_context, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status != 200:
-                        self.logger.error(f"API请求失败: {response.status}")
-                        return []
-                    
-                    data = await response.json()
-                    
-                    # Greenhouse API 可能返回 {'jobs': [...]} 或直接返回 [...]
-                    jobs_data = data.get('jobs', data) if isinstance(data, dict) else data
-                    
-                    if not isinstance(jobs_data, list):
-                        self.logger.error(f"意外的API响应格式: {type(jobs_data)}")
-                        return []
-                    
-                    # 解析每个职位
-                    # 注意：列表API不包含完整的job description，需要单独获取
-                    jobs = []
-                    for job_data in jobs_data:
-                        try:
-                            # 获取职位详情（包含完整描述）
-                            job_detail = await self._fetch_job_detail(board_token, job_data.get('id'), session, ssl_context)
-                            if job_detail:
-                                # 合并基础信息和详细信息
-                                full_job_data = {**job_data, **job_detail}
-                                job = await self._parse_job(full_job_data, company, board_token)
-                                if job:
-                                    jobs.append(job)
-                        except Exception as e:
-                            self.logger.error(f"解析职位失败: {e}")
-                            continue
-                    
-                    return jobs
-                    
-        except asyncio.TimeoutError:
-            self.logger.error(f"API请求超时: {url}")
-            return []
+            # 条件请求：board 未变化时抛出 BoardNotModified
+            status, body = await self.fetch_board(company, 'GET', url, timeout=30)
+            if status != 200:
+                raise ScrapeError.from_status(status, url)
+            
+            data = json.loads(body)
+            
+            # Greenhouse API 可能返回 {'jobs': [...]} 或直接返回 [...]
+            jobs_data = data.get('jobs', data) if isinstance(data, dict) else data
+            
+            if not isinstance(jobs_data, list):
+                raise ScrapeError(f"意外的API响应格式: {type(jobs_data)}")
+            
+            # 列表指纹（id + updated_at）未变的职位只输出 "seen" 记录，跳过详情获取和解析
+            jobs = []
+            changed = []
+            for job_data in jobs_data:
+                fingerprint = self.list_fingerprint(job_data, 'id', 'updated_at')
+                seen = self.seen_record(company, f"greenhouse_{job_data.get('id', '')}", fingerprint)
+                if seen:
+                    jobs.append(seen)
+                else:
+                    changed.append((job_data, fingerprint))
+            
+            # 批量模式未带回描述的职位，回退为有界并发获取详情
+            missing = [job_data for job_data, _ in changed if not job_data.get('content')]
+            if missing:
+                self.logger.info(f"{len(missing)} 个职位缺少描述，并发获取详情...")
+                details = await self._fetch_job_details(board_token, missing)
+            else:
+                details = {}
+            
+            # 解析每个职位（设置了解析进程池时在工作进程中完成）
+            ready = []
+            failed = 0
+            for job_data, fingerprint in changed:
+                if not job_data.get('content'):
+                    job_detail = details.get(job_data.get('id'))
+                    if not job_detail:
+                        # 详情获取失败：已入库的职位只刷新代次（不被 sweep 下线），新职位下次再取
+                        failed += 1
+                        touch = self.touch_record(company, f"greenhouse_{job_data.get('id', '')}")
+                        if touch:
+                            jobs.append(touch)
+                        continue
+                    # 合并基础信息和详细信息
+                    job_data = {**job_data, **job_detail}
+                ready.append((job_data, fingerprint))
+            if failed:
+                # 不保存 board 摘要，否则下次 board 未变化时这些职位不会再获取详情
+                self.mark_incomplete(company, f"{failed}/{len(missing)} 个职位详情获取失败")
+            jobs.extend(await self.parse_jobs(company, ready, board_token))
+            
+            return jobs
+            
+        except (BoardNotModified, ScrapeError):
+            raise
         except Exception as e:
-            self.logger.error(f"抓取失败: {e}")
-            return []
+            raise ScrapeError.from_exception(e) from e
+    
+    async def _fetch_job_details(self, board_token: str, jobs_data: List[Dict]) -> Dict[int, Dict]:
+        """
+        有界并发获取多个职位详情
+        
+        Args:
+            board_token: Greenhouse board token
+            jobs_data: 列表接口返回的职位
+            
+        Returns:
+            job_id -> 职位详情（获取失败的职位不包含在内）
+        """
+        semaphore = asyncio.Semaphore(self.DETAIL_CONCURRENCY)
+        
+        async def fetch(job_id):
+            async with semaphore:
+                return job_id, await self._fetch_job_detail(board_token, job_id)
+        
+        results = await asyncio.gather(*(fetch(job_data.get('id')) for job_data in jobs_data))
+        return {job_id: detail for job_id, detail in results if detail}
     
-    async def _fetch_job_detail(self, board_token: str, job_id: int, session: aiohttp.ClientSession, ssl_context) -> Optional[Dict]:
+    async def _fetch_job_detail(self, board_token: str, job_id: int) -> Optional[Dict]:
         """
         获取单个职位的详细信息（包括完整描述）
         
         Args:
             board_token: Greenhouse board token
             job_id: 职位ID
-            session: aiohttp session
-            ssl_context: SSL context
             
         Returns:
             职位详情字典，包含content字段
@@ -188,7 +216,7 @@ class GreenhouseScraper(BaseScraper):
         url = f"{self.API_BASE}/{board_token}/jobs/{job_id}"
         
         try:
-            async with session.get(url, ssl=ssl_context, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            async with self.http.get(url, timeout=10) as response:
                 if response.status == 200:
                     detail = await response.json()
                     return detail
@@ -199,7 +227,7 @@ class GreenhouseScraper(BaseScraper):
             self.logger.warning(f"获取职位详情失败 {job_id}: {e}")
             return None
     
-    async def _parse_job(self, job_data: Dict, company: Dict, board_token: str) -> Optional[Dict]:
+    def _parse_job(self, job_data: Dict, company: Dict, board_token: str) -> Optional[Dict]:
         """
         解析Greenhouse职位数据
         
@@ -214,89 +242,71 @@ class GreenhouseScraper(BaseScraper):
             "content": "<p>Job description HTML</p>"  // 或 "metadata": []
         }
         """
-        try:
-            # 基础字段
-            job_id = f"greenhouse_{job_data.get('id', '')}"
-            title = job_data.get('title', '').strip()
-            
-            if not title:
-                return None
-            
-            # 地点
-            location_data = job_data.get('location', {})
-            location = location_data.get('name', '') if isinstance(location_data, dict) else str(location_data)
-            
-            # URL
-            source_url = job_data.get('absolute_url', '')
-            if not source_url:
-                source_url = f"https://boards.greenhouse.io/{board_token}/jobs/{job_data.get('id')}"
-            
-            # 描述 - 清理HTML
-            description = job_data.get('content', '') or job_data.get('description', '')
-            if description:
-                # 1. Unescape HTML entities (Greenhouse API returns &lt; &gt; etc.)
-                description = html.unescape(description)
-                
-                # 2. BeautifulSoup to strip tags
-                soup = BeautifulSoup(description, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Get text and clean whitespace
-                description = soup.get_text(separator='\n', strip=True)
-                
-                # Clean up excessive newlines
-                description = '\n'.join(line.strip() for line in description.split('\n') if line.strip())
-            
-            # 部门
-            departments = job_data.get('departments', [])
-            department_names = [d.get('name', '') for d in departments if isinstance(d, dict)]
-            
-            # 发布日期
-            posted_date = job_data.get('updated_at') or job_data.get('created_at')
-            if posted_date:
-                try:
-                    posted_date = datetime.fromisoformat(posted_date.replace('Z', '+00:00'))
-                except:
-                    posted_date = None
-            
-            # Prepare for normalization
-            normalized_raw = {
-                'id': job_id,
-                'title': title,
-                'location': location,
-                'url': source_url,
-                'description': description,
-                'posted_date': posted_date
-            }
-            
-            job = self.normalize_job_data(
-                normalized_raw, 
-                company['name'], 
-                'greenhouse', 
-                company.get('location')
-            )
-            
-            # Add Greenhouse-specific fields
-            job.update({
-                'job_type': self._determine_job_type(title, description),
-                'remote_type': self._determine_remote_type(location, description),
-                'skills': self.extract_skills(description),
-                'salary': self.extract_salary(description),
-                'raw_data': {
-                    'id': job_data.get('id'),
-                    'departments': department_names,
-                    'board_token': board_token
-                }
-            })
-            
-            return job
-            
-        except Exception as e:
-            self.logger.error(f"解析职位数据失败: {e}")
+        # 基础字段
+        job_id = f"greenhouse_{job_data.get('id', '')}"
+        title = job_data.get('title', '').strip()
+        
+        if not title:
             return None
+        
+        # 地点
+        location_data = job_data.get('location', {})
+        location = location_data.get('name', '') if isinstance(location_data, dict) else str(location_data)
+        
+        # URL
+        source_url = job_data.get('absolute_url', '')
+        if not source_url:
+            source_url = f"https://boards.greenhouse.io/{board_token}/jobs/{job_data.get('id')}"
+        
+        # 描述 - 清理HTML
+        description = job_data.get('content', '') or job_data.get('description', '')
+        if description:
+            # Greenhouse API 返回的是转义后的 HTML（&lt; &gt; 等），先 unescape 再去标签
+            description = html_to_text(description, unescape=True)
+        
+        # 部门
+        departments = job_data.get('departments', [])
+        department_names = [d.get('name', '') for d in departments if isinstance(d, dict)]
+        
+        # 发布日期
+        posted_date = job_data.get('updated_at') or job_data.get('created_at')
+        if posted_date:
+            try:
+                posted_date = datetime.fromisoformat(posted_date.replace('Z', '+00:00'))
+            except:
+                posted_date = None
+        
+        # Prepare for normalization
+        normalized_raw = {
+            'id': job_id,
+            'title': title,
+            'location': location,
+            'url': source_url,
+            'description': description,
+            'posted_date': posted_date
+        }
+        
+        job = self.normalize_job_data(
+            normalized_raw, 
+            company['name'], 
+            'greenhouse', 
+            company.get('location')
+        )
+        
+        # Add Greenhouse-specific fields
+        job.update({
+            'job_type': self._determine_job_type(title, description),
+            'remote_type': self._determine_remote_type(location, description),
+            'skills': self.extract_skills(description),
+            'salary': self.extract_salary(description),
+            'raw_data': {
+                'id': job_data.get('id'),
+                'departments': department_names,
+                'board_token': board_token
+            }
+        })
+        
+        return job
     
     def _determine_job_type(self, title: str, description: str) -> str:
         """判断职位类型"""
@@ -337,6 +347,7 @@ async def test_greenhouse_scraper():
     }
     
     jobs = await scraper.scrape(test_company)
+    await scraper.http.close()
     
     print(f"\n找到 {len(jobs)} 个职位:")
     for job in jobs[:3]:  # Show first 3
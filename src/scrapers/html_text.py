@@ -0,0 +1,171 @@
+"""
+HTML to Text
+Shared job-description cleaner for the ATS scrapers.
+
+The fast path streams html.parser events and never builds a DOM. It mirrors
+what BeautifulSoup's html.parser tree builder + get_text(separator, strip=True)
+produce - same tokenizer, same entity handling, same string boundaries, and
+script/style/template/rt/rp text left out - so the output is identical to
+the BeautifulSoup path (html_to_text_bs4), which remains the fallback.
+"""
+import html
+import logging
+from html.parser import HTMLParser
+from typing import List
+
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup 不计入 get_text 的字符串所在的标签（Script / Stylesheet / TemplateString / Ruby*）
+_CONTAINER_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+_VOID_TAGS = frozenset(HTMLTreeBuilder.empty_element_tags)
+_ENTITIES = EntitySubstitution.HTML_ENTITY_TO_CHARACTER
+
+
+class _TextExtractor(HTMLParser):
+    """
+    只收集 get_text 会输出的字符串
+
+    标签栈、空元素和实体的处理与 bs4 的 BeautifulSoupHTMLParser / BeautifulSoup
+    保持一致，因为它们决定了字符串在哪里被切分、哪些字符串被排除。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.strings: List[str] = []
+        self._data: List[str] = []
+        self._stack: List[str] = []
+        self._open = {}
+        self._containers = 0
+        self._already_closed_empty: List[str] = []
+
+    def _end_data(self, include: bool = None):
+        if self._data:
+            text = ''.join(self._data).strip()
+            self._data = []
+            if include is None:
+                include = not self._containers
+            if text and include:
+                self.strings.append(text)
+
+    def _pop_to(self, name: str):
+        if not self._open.get(name):
+            return
+        while self._stack:
+            popped = self._stack.pop()
+            self._open[popped] -= 1
+            if popped in _CONTAINER_TAGS:
+                self._containers -= 1
+            if popped == name:
+                return
+
+    def handle_starttag(self, name, attrs, handle_empty_element=True):
+        self._end_data()
+        self._stack.append(name)
+        self._open[name] = self._open.get(name, 0) + 1
+        if name in _CONTAINER_TAGS:
+            self._containers += 1
+        if handle_empty_element and name in _VOID_TAGS:
+            self.handle_endtag(name, check_already_closed=False)
+            self._already_closed_empty.append(name)
+
+    def handle_startendtag(self, name, attrs):
+        self.handle_starttag(name, attrs, handle_empty_element=False)
+        self.handle_endtag(name)
+
+    def handle_endtag(self, name, check_already_closed=True):
+        if check_already_closed and name in self._already_closed_empty:
+            self._already_closed_empty.remove(name)
+        else:
+            self._end_data()
+            self._pop_to(name)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        if name.startswith(('x', 'X')):
+            code = int(name.lstrip('xX'), 16)
+        else:
+            code = int(name)
+        data = None
+        if code < 256:
+            # 与 bs4 一致：0-255 按 windows-1252 解释
+            try:
+                data = bytearray([code]).decode('windows-1252')
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code)
+            except (ValueError, OverflowError):
+                pass
+        self._data.append(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name):
+        character = _ENTITIES.get(name)
+        self._data.append(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data):
+        self._end_data()
+
+    def handle_decl(self, data):
+        self._end_data()
+
+    def handle_pi(self, data):
+        self._end_data()
+
+    def unknown_decl(self, data):
+        self._end_data()
+        if data.upper().startswith('CDATA['):
+            # CData 总是计入 get_text，即使在 script 等标签内
+            self._data.append(data[len('CDATA['):])
+            self._end_data(include=True)
+
+    def close(self):
+        super().close()
+        self._end_data()
+
+
+def _normalize_lines(text: str) -> str:
+    """逐行 strip 并去掉空行"""
+    return '\n'.join(line.strip() for line in text.split('\n') if line.strip())
+
+
+def html_to_text_bs4(markup: str, unescape: bool = False, normalize_lines: bool = True) -> str:
+    """BeautifulSoup 实现（原各抓取器中的写法），作为参照和回退"""
+    if unescape:
+        markup = html.unescape(markup)
+    soup = BeautifulSoup(markup, 'html.parser')
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    text = soup.get_text(separator='\n', strip=True)
+    return _normalize_lines(text) if normalize_lines else text
+
+
+def html_to_text(markup: str, unescape: bool = False, normalize_lines: bool = True) -> str:
+    """
+    HTML 描述转纯文本
+
+    Args:
+        markup: HTML 字符串
+        unescape: 先对整段做一次 html.unescape（Greenhouse 返回的是转义后的 HTML）
+        normalize_lines: 逐行 strip 并去掉空行（Greenhouse / Lever）；
+                         False 时与 get_text(separator='\\n', strip=True) 的结果一致（Ashby）
+    """
+    if not markup:
+        return ''
+    if unescape:
+        markup = html.unescape(markup)
+    try:
+        parser = _TextExtractor()
+        parser.feed(markup)
+        parser.close()
+        text = '\n'.join(parser.strings)
+    except Exception as e:
+        logger.debug(f"快速路径解析失败，回退到 BeautifulSoup: {e}")
+        return html_to_text_bs4(markup, normalize_lines=normalize_lines)
+    return _normalize_lines(text) if normalize_lines else text
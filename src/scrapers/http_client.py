@@ -0,0 +1,220 @@
+"""
+Shared HTTP Client
+One pooled aiohttp session per crawl run, shared by all ATS scrapers.
+"""
+import os
+import ssl
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .rate_limit import HostRateLimiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+def build_ssl_context(verify: bool = False) -> ssl.SSLContext:
+    """
+    构建SSL context（每个客户端只构建一次）
+
+    Args:
+        verify: 是否校验证书（开发环境下各抓取器历来关闭校验）
+    """
+    ssl_context = ssl.create_default_context()
+    if not verify:
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+class HttpClient:
+    """
+    抓取器共享的HTTP客户端
+
+    - 整个抓取过程只有一个连接池（keep-alive 复用连接）
+    - 按 host 限制并发连接数
+    - DNS 缓存
+    - SSL context 只构建一次
+    - 按 ATS host 限流（令牌桶 + AIMD 自适应并发，见 rate_limit.py）
+    - 统计连接池命中/未命中与TLS握手次数
+    - 可把所有请求改发到本地 mock ATS 服务（压测用，见 scripts/mock_ats_server.py）
+    """
+
+    DEFAULT_TIMEOUT = 30
+    # 改写请求时携带原始 host（Workday 的租户只体现在 host 上）
+    ORIGINAL_HOST_HEADER = 'X-ATS-Host'
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 16,
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 30,
+        verify_ssl: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        rate_limit: bool = True,
+        base_url: Optional[str] = None,
+    ):
+        """
+        Args:
+            limit_per_host: 每个 host 的连接数硬上限（应不小于限流策略的 max_concurrency）
+            rate_limiter: 自定义限流器；默认按 rate_limit.DEFAULT_POLICIES 创建
+            rate_limit: False 时不限流（本地测试/基准）
+            base_url: 把所有请求改发到该地址（保留 path 和 query），默认读取 ATS_MOCK_BASE_URL
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.headers = headers or {}
+        self.ssl_context = build_ssl_context(verify_ssl)
+        self.rate_limiter = (rate_limiter or HostRateLimiter()) if rate_limit else None
+        self.base_url = (base_url or os.getenv('ATS_MOCK_BASE_URL') or '').rstrip('/') or None
+        if self.base_url:
+            logger.warning(f"所有抓取请求将改发到 {self.base_url}")
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = {
+            'requests': 0,
+            'pool_hits': 0,
+            'pool_misses': 0,
+            'tls_handshakes': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0,
+        }
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """注册连接池/DNS事件回调用于统计"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.stats['requests'] += 1
+            ctx.scheme = params.url.scheme
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats['pool_hits'] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.stats['pool_misses'] += 1
+            if getattr(ctx, 'scheme', None) == 'https':
+                self.stats['tls_handshakes'] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.stats['dns_cache_hits'] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.stats['dns_cache_misses'] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """懒加载共享 session（必须在事件循环中创建）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                # 改发到 mock 服务时所有请求同一个 host，并发只由按原始 host 的限流器控制
+                limit_per_host=0 if self.base_url else self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+                ssl=self.ssl_context,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.DEFAULT_TIMEOUT),
+                trace_configs=[self._build_trace_config()],
+            )
+        return self._session
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        """
+        发送请求，返回 aiohttp 响应
+
+        用法:
+            async with client.request('GET', url) as response:
+                data = await response.json()
+        """
+        timeout = kwargs.pop('timeout', None)
+        if isinstance(timeout, (int, float)):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+
+        session = await self.get_session()
+        # 限流按原始 ATS host 计算，改写 URL 后仍沿用生产环境的策略
+        limiter = self.rate_limiter.for_url(url) if self.rate_limiter else None
+        if self.base_url:
+            url, kwargs = self._rewrite(url, kwargs)
+        if limiter is None:
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+            return
+
+        await limiter.acquire()
+        start = time.monotonic()
+        released = False
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                # 延迟按收到响应头计算；并发槽位到响应体读完才释放
+                latency = time.monotonic() - start
+                retry_after = None
+                if response.status in (429, 503):
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                try:
+                    yield response
+                finally:
+                    released = True
+                    await limiter.release(response.status, latency, retry_after)
+        finally:
+            if not released:
+                await limiter.release(None, time.monotonic() - start)
+
+    def _rewrite(self, url: str, kwargs: Dict):
+        """https://boards-api.greenhouse.io/v1/... -> {base_url}/v1/...，原 host 放在请求头中"""
+        parts = urlsplit(str(url))
+        target = self.base_url + parts.path + (f"?{parts.query}" if parts.query else '')
+        headers = dict(kwargs.get('headers') or {})
+        headers[self.ORIGINAL_HOST_HEADER] = parts.netloc
+        return target, {**kwargs, 'headers': headers}
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def summary(self) -> str:
+        """连接复用统计摘要"""
+        s = self.stats
+        connections = s['pool_hits'] + s['pool_misses']
+        hit_rate = (s['pool_hits'] / connections * 100) if connections else 0.0
+        return (
+            f"requests={s['requests']} pool_hits={s['pool_hits']} "
+            f"pool_misses={s['pool_misses']} ({hit_rate:.1f}% reuse) "
+            f"tls_handshakes={s['tls_handshakes']} "
+            f"dns_cache_hits={s['dns_cache_hits']} dns_cache_misses={s['dns_cache_misses']}"
+        )
+
+    def host_summary(self) -> list:
+        """每个 host 的限流/吞吐统计"""
+        return self.rate_limiter.summary_lines() if self.rate_limiter else []
+
+    async def close(self):
+        """关闭连接池"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
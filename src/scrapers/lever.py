@@ -2,16 +2,16 @@
 Lever ATS Scraper
 Lever provides a public JSON API for job postings
 """
-import aiohttp
 import asyncio
-import ssl
+import json
 from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 import re
-from bs4 import BeautifulSoup
 
-from .base import BaseScraper
+from .base import BaseScraper, BoardNotModified, ScrapeError
+from .html_text import html_to_text
+from .http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +20,8 @@ class LeverScraper(BaseScraper):
     
     API_BASE = "https://api.lever.co/v0/postings"
     
-    def __init__(self):
-        super().__init__("lever")
+    def __init__(self, http_client: Optional[HttpClient] = None):
+        super().__init__("lever", http_client)
         
     async def scrape(self, company: Dict) -> List[Dict]:
         """抓取Lever职位"""
@@ -29,44 +29,40 @@ class LeverScraper(BaseScraper):
         
         board_token = await self._get_board_token(company)
         if not board_token:
-            self.logger.warning(f"无法获取 {company['name']} 的 Lever board token")
-            return []
+            raise ScrapeError(f"无法获取 {company['name']} 的 Lever board token")
             
         url = f"{self.API_BASE}/{board_token}?mode=json"
         
-        # SSL context for development
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, ssl=ssl_context, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Lever API 请求失败: {response.status}")
-                        return []
-                        
-                    jobs_data = await response.json()
-                    if not isinstance(jobs_data, list):
-                        self.logger.error(f"意外的 Lever API 响应格式: {type(jobs_data)}")
-                        return []
-                        
-                    jobs = []
-                    for job_data in jobs_data:
-                        try:
-                            job = await self._parse_job(job_data, company, board_token)
-                            if job:
-                                jobs.append(job)
-                        except Exception as e:
-                            self.logger.error(f"解析 Lever 职位失败: {e}")
-                            continue
-                            
-                    self.logger.info(f"从 {company['name']} 抓取到 {len(jobs)} 个职位")
-                    return jobs
+            # 条件请求：board 未变化时抛出 BoardNotModified
+            status, body = await self.fetch_board(company, 'GET', url, timeout=30)
+            if status != 200:
+                raise ScrapeError.from_status(status, url)
+                
+            jobs_data = json.loads(body)
+                
+            if not isinstance(jobs_data, list):
+                raise ScrapeError(f"意外的 Lever API 响应格式: {type(jobs_data)}")
+                
+            jobs = []
+            changed = []
+            for job_data in jobs_data:
+                # 列表项包含完整描述，对整个列表项做指纹（createdAt 在编辑后不会变化）
+                fingerprint = self.list_fingerprint(job_data)
+                seen = self.seen_record(company, f"lever_{job_data.get('id', '')}", fingerprint)
+                if seen:
+                    jobs.append(seen)
+                else:
+                    changed.append((job_data, fingerprint))
+            jobs.extend(await self.parse_jobs(company, changed, board_token))
+                    
+            self.logger.info(f"从 {company['name']} 抓取到 {len(jobs)} 个职位")
+            return jobs
                     
+        except (BoardNotModified, ScrapeError):
+            raise
         except Exception as e:
-            self.logger.error(f"抓取 Lever 职位失败 ({company['name']}): {e}")
-            return []
+            raise ScrapeError.from_exception(e) from e
 
     async def _get_board_token(self, company: Dict) -> Optional[str]:
         """获取 Lever board token"""
@@ -84,104 +80,94 @@ class LeverScraper(BaseScraper):
             
         return company['name'].lower().replace(' ', '')
 
-    async def _parse_job(self, job_data: Dict, company: Dict, board_token: str) -> Optional[Dict]:
+    def _parse_job(self, job_data: Dict, company: Dict, board_token: str) -> Optional[Dict]:
         """解析 Lever 职位数据"""
-        try:
-            job_id = f"lever_{job_data.get('id', '')}"
-            title = job_data.get('text', '').strip()
-            
-            if not title:
-                return None
-                
-            categories = job_data.get('categories', {})
-            location = categories.get('location', '')
-            commitment = categories.get('commitment', '') # e.g. "Full-time"
-            
-            # URL
-            source_url = job_data.get('hostedUrl', '')
-            if not source_url:
-                source_url = f"https://jobs.lever.co/{board_token}/{job_data.get('id')}"
-            
-            # 描述解析
-            # Lever contains description and lists (reqs, etc.)
-            description_html = job_data.get('description', '')
-            
-            # Append lists to description
-            lists_content = ""
-            for item in job_data.get('lists', []):
-                list_title = item.get('text', '')
-                list_html = item.get('content', '')
-                if list_title and list_html:
-                    lists_content += f"<h3>{list_title}</h3>{list_html}"
-            
-            full_html = description_html + lists_content
+        job_id = f"lever_{job_data.get('id', '')}"
+        title = job_data.get('text', '').strip()
+        
+        if not title:
+            return None
             
-            description = ""
-            if full_html:
-                soup = BeautifulSoup(full_html, 'html.parser')
-                # Remove scripts
-                for s in soup(["script", "style"]):
-                    s.decompose()
-                description = soup.get_text(separator='\n', strip=True)
-                description = '\n'.join(line.strip() for line in description.split('\n') if line.strip())
+        categories = job_data.get('categories', {})
+        location = categories.get('location', '')
+        commitment = categories.get('commitment', '') # e.g. "Full-time"
+        
+        # URL
+        source_url = job_data.get('hostedUrl', '')
+        if not source_url:
+            source_url = f"https://jobs.lever.co/{board_token}/{job_data.get('id')}"
+        
+        # 描述解析
+        # Lever contains description and lists (reqs, etc.)
+        description_html = job_data.get('description', '')
+        
+        # Append lists to description
+        lists_content = ""
+        for item in job_data.get('lists', []):
+            list_title = item.get('text', '')
+            list_html = item.get('content', '')
+            if list_title and list_html:
+                lists_content += f"<h3>{list_title}</h3>{list_html}"
+        
+        full_html = description_html + lists_content
+        
+        description = ""
+        if full_html:
+            description = html_to_text(full_html)
 
-            # 如果 BeautifulSoup 解析失败，回退到 descriptionPlain
-            if not description:
-                description = job_data.get('descriptionPlain', '')
-            
-            # 发布日期
-            created_at = job_data.get('createdAt')
-            posted_date = None
-            if created_at:
-                try:
-                    # Lever timestamp is in milliseconds
-                    posted_date = datetime.fromtimestamp(created_at / 1000.0)
-                except:
-                    posted_date = None
+        # 如果 HTML 中没有文本，回退到 descriptionPlain
+        if not description:
+            description = job_data.get('descriptionPlain', '')
+        
+        # 发布日期
+        created_at = job_data.get('createdAt')
+        posted_date = None
+        if created_at:
+            try:
+                # Lever timestamp is in milliseconds
+                posted_date = datetime.fromtimestamp(created_at / 1000.0)
+            except:
+                posted_date = None
 
-            # 提取技能和哈希
-            skills = self.extract_skills(description)
-            salary = self.extract_salary(description)
-            content_hash = self.generate_content_hash(title, description, location)
-            
-            # 职位类型判断
-            job_type = self._determine_job_type(title, commitment, description)
-            remote_type = self._determine_remote_type(location, description)
-            
-            # Prepare for normalization
-            normalized_raw = {
-                'id': job_id,
-                'title': title,
-                'location': location,
-                'url': source_url,
-                'description': description,
-                'posted_date': posted_date
+        # 提取技能和哈希
+        skills = self.extract_skills(description)
+        salary = self.extract_salary(description)
+        content_hash = self.generate_content_hash(title, description, location)
+        
+        # 职位类型判断
+        job_type = self._determine_job_type(title, commitment, description)
+        remote_type = self._determine_remote_type(location, description)
+        
+        # Prepare for normalization
+        normalized_raw = {
+            'id': job_id,
+            'title': title,
+            'location': location,
+            'url': source_url,
+            'description': description,
+            'posted_date': posted_date
+        }
+        
+        job = self.normalize_job_data(
+            normalized_raw, 
+            company['name'], 
+            'lever', 
+            company.get('location')
+        )
+        
+        # Add Lever-specific fields
+        job.update({
+            'job_type': self._determine_job_type(title, commitment, description),
+            'remote_type': self._determine_remote_type(location, description),
+            'skills': skills,
+            'salary': salary,
+            'raw_data': {
+                'categories': categories,
+                'additional': job_data.get('additional', '')
             }
-            
-            job = self.normalize_job_data(
-                normalized_raw, 
-                company['name'], 
-                'lever', 
-                company.get('location')
-            )
-            
-            # Add Lever-specific fields
-            job.update({
-                'job_type': self._determine_job_type(title, commitment, description),
-                'remote_type': self._determine_remote_type(location, description),
-                'skills': skills,
-                'salary': salary,
-                'raw_data': {
-                    'categories': categories,
-                    'additional': job_data.get('additional', '')
-                }
-            })
-            
-            return job
-            
-        except Exception as e:
-            self.logger.error(f"解析 Lever 职位失败: {e}")
-            return None
+        })
+        
+        return job
 
     def _determine_job_type(self, title: str, commitment: str, description: str) -> str:
         """判断职位类型"""
@@ -0,0 +1,122 @@
+"""
+Parse Pool
+Runs the CPU-bound half of a crawl in worker processes: HTML cleaning, skill
+and salary extraction (the scrapers' _parse_job), the IT / language filter
+and search / category enrichment (JobIngestionService.prepare).
+
+The event loop only fetches boards and writes results, so one large board no
+longer stalls the network I/O of every other company in flight. Workers are
+spawned (not forked) so they never inherit the crawl's MongoClient or aiohttp
+session; each worker keeps one parse-only scraper instance per ATS.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from ..services.job_ingestion import JobIngestionService
+
+logger = logging.getLogger(__name__)
+
+# 每个任务最多解析的职位数：大 board 拆成多块，分给多个工作进程
+CHUNK_SIZE = int(os.getenv('PARSE_CHUNK_SIZE', 200))
+
+# 工作进程内的抓取器实例（抓取器类 -> 实例），只用于解析，不发请求
+_worker_scrapers: Dict[type, object] = {}
+
+
+def default_workers() -> int:
+    """PARSE_WORKERS，默认 CPU 核数 - 1（留一个核给事件循环，单核时不使用进程池）；0 表示不使用进程池"""
+    value = os.getenv('PARSE_WORKERS')
+    if value is not None:
+        return max(0, int(value))
+    return max(0, (os.cpu_count() or 1) - 1)
+
+
+def _parse_in_worker(scraper_cls: type, company: Dict, items: List[Tuple[Dict, str]], args: Tuple) -> List[Dict]:
+    """工作进程入口：解析 + 过滤 + 派生字段（解析失败的占位记录原样返回）"""
+    scraper = _worker_scrapers.get(scraper_cls)
+    if scraper is None:
+        scraper = _worker_scrapers[scraper_cls] = scraper_cls()
+    jobs = scraper.parse_batch(company, items, args)
+    for job in jobs:
+        JobIngestionService.prepare(job)
+    return jobs
+
+
+class ParsePool:
+    """
+    解析阶段的进程池
+
+    用法：
+        pool = ParsePool()
+        scraper.parse_pool = pool   # 抓取器的 parse_jobs 会把解析交给进程池
+        ...
+        pool.shutdown()
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE):
+        """
+        Args:
+            workers: 工作进程数；默认 default_workers()，0 时在事件循环中解析
+            chunk_size: 每个任务的职位数
+        """
+        self.workers = default_workers() if workers is None else workers
+        self.chunk_size = max(1, chunk_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        self.stats = Counter()
+
+    async def parse(self, scraper, company: Dict, items: List[Tuple[Dict, str]], args: Tuple = ()) -> List[Dict]:
+        """
+        解析一批 (原始列表项, 列表指纹)
+
+        进程池不可用（未启用或工作进程崩溃）时回退到当前进程中解析，
+        此时过滤和派生字段仍由 ingest 完成。
+        """
+        if not items:
+            return []
+        if self._executor is None:
+            self.stats['inline_jobs'] += len(items)
+            return scraper.parse_batch(company, items, args)
+
+        loop = asyncio.get_running_loop()
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        start = time.perf_counter()
+        try:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(self._executor, _parse_in_worker, type(scraper), company, chunk, args)
+                for chunk in chunks
+            ))
+        except BrokenProcessPool as e:
+            logger.error(f"解析进程池已崩溃，改为在事件循环中解析: {e}")
+            self.shutdown()
+            return await self.parse(scraper, company, items, args)
+
+        self.stats['tasks'] += len(chunks)
+        self.stats['jobs'] += len(items)
+        self.stats['wait_ms'] += int((time.perf_counter() - start) * 1000)
+        return [job for jobs in results for job in jobs]
+
+    def summary(self) -> str:
+        stats = self.stats
+        if not self.workers:
+            return f"未启用，事件循环中解析 {stats['inline_jobs']} 个职位"
+        avg_wait = stats['wait_ms'] / stats['tasks'] if stats['tasks'] else 0.0
+        line = f"{self.workers} 个进程，{stats['tasks']} 个任务，{stats['jobs']} 个职位，平均等待 {avg_wait:.0f}ms"
+        if stats['inline_jobs']:
+            line += f"，回退到事件循环 {stats['inline_jobs']} 个"
+        return line
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,257 @@
+"""
+Per-Host Rate Limiting
+Token bucket + AIMD adaptive concurrency, one limiter per ATS host.
+
+The bucket caps the request rate a host sees; the concurrency window grows
+by one slot per window's worth of fast, successful responses and is cut in
+half on 429 / 5xx / connection errors or when latency exceeds the target.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """单个 host 的限流配置"""
+    rate: float                   # 每秒令牌数
+    burst: int                    # 桶容量
+    initial_concurrency: int = 2
+    min_concurrency: int = 1
+    max_concurrency: int = 8
+    target_latency: float = 2.0   # 秒；超过视为拥塞
+
+
+# host 后缀 -> 策略（按最长后缀匹配）
+DEFAULT_POLICIES: Dict[str, HostPolicy] = {
+    'boards-api.greenhouse.io': HostPolicy(rate=10, burst=20, initial_concurrency=4, max_concurrency=16),
+    'api.lever.co': HostPolicy(rate=5, burst=10, initial_concurrency=2, max_concurrency=8),
+    'ashbyhq.com': HostPolicy(rate=5, burst=10, initial_concurrency=2, max_concurrency=8),
+    'apply.workable.com': HostPolicy(rate=2, burst=4, initial_concurrency=1, max_concurrency=4),
+    # Workday 按租户 host 分别限流（nvidia.wd5.myworkdayjobs.com 等）
+    'myworkdayjobs.com': HostPolicy(rate=4, burst=8, initial_concurrency=2, max_concurrency=8, target_latency=3.0),
+}
+DEFAULT_POLICY = HostPolicy(rate=4, burst=8)
+
+
+def load_policies(env_var: str = 'ATS_RATE_LIMITS') -> Dict[str, HostPolicy]:
+    """
+    默认策略 + 环境变量覆盖
+
+    例: ATS_RATE_LIMITS='{"apply.workable.com": {"rate": 1, "max_concurrency": 2}}'
+    """
+    policies = dict(DEFAULT_POLICIES)
+    raw = os.getenv(env_var)
+    if not raw:
+        return policies
+    try:
+        overrides = json.loads(raw)
+        for suffix, fields in overrides.items():
+            policies[suffix] = replace(policies.get(suffix, DEFAULT_POLICY), **fields)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"忽略无效的 {env_var}: {e}")
+    return policies
+
+
+class TokenBucket:
+    """异步令牌桶"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """取一个令牌，返回等待秒数"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float):
+        """服务端要求退避（Retry-After）时暂停发放令牌"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 并发窗口
+
+    - 成功且延迟低于目标：每完成约一个窗口的请求，窗口 +1
+    - 429 / 5xx / 连接错误 / 延迟超标：窗口减半（每个窗口周期最多减一次）
+    """
+
+    DECREASE_FACTOR = 0.5
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.limit = float(policy.initial_concurrency)
+        self.in_flight = 0
+        self.min_seen = self.limit
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, congested: bool, latency: float):
+        async with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if congested:
+                # 同一批在途请求的失败只算一次拥塞
+                if now - self._last_decrease > max(latency, self.policy.target_latency):
+                    self.limit = max(self.policy.min_concurrency, self.limit * self.DECREASE_FACTOR)
+                    self.min_seen = min(self.min_seen, self.limit)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.policy.max_concurrency, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class HostLimiter:
+    """单个 host 的令牌桶 + 并发窗口 + 吞吐统计"""
+
+    def __init__(self, host: str, policy: HostPolicy):
+        self.host = host
+        self.policy = policy
+        self.bucket = TokenBucket(policy.rate, policy.burst)
+        self.window = AdaptiveConcurrency(policy)
+        self.stats = {
+            'requests': 0,
+            'throttled': 0,      # 429
+            'server_errors': 0,  # 5xx
+            'errors': 0,         # 连接错误 / 超时
+            'latency': 0.0,
+            'wait': 0.0,
+        }
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+
+    async def acquire(self):
+        start = time.monotonic()
+        await self.window.acquire()
+        await self.bucket.acquire()
+        if self._first is None:
+            self._first = time.monotonic()
+        self.stats['wait'] += time.monotonic() - start
+
+    async def release(self, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        """
+        Args:
+            status: HTTP 状态码；请求异常时为 None
+            latency: 到收到响应头为止的秒数
+            retry_after: 429/503 响应的 Retry-After 秒数
+        """
+        self.stats['requests'] += 1
+        self.stats['latency'] += latency
+        self._last = time.monotonic()
+        if status is None:
+            self.stats['errors'] += 1
+        elif status == 429:
+            self.stats['throttled'] += 1
+        elif status >= 500:
+            self.stats['server_errors'] += 1
+        if retry_after:
+            self.bucket.pause(retry_after)
+
+        congested = status is None or status == 429 or status >= 500 or latency > self.policy.target_latency
+        await self.window.release(congested, latency)
+
+    def summary(self) -> str:
+        s = self.stats
+        n = s['requests']
+        elapsed = (self._last - self._first) if n and self._last > self._first else 0
+        throughput = n / elapsed if elapsed else float(n)
+        avg_latency = s['latency'] / n * 1000 if n else 0.0
+        avg_wait = s['wait'] / n * 1000 if n else 0.0
+        return (
+            f"{self.host}: requests={n} ({throughput:.1f} req/s) avg_latency={avg_latency:.0f}ms "
+            f"avg_wait={avg_wait:.0f}ms 429={s['throttled']} 5xx={s['server_errors']} errors={s['errors']} "
+            f"concurrency={self.window.limit:.1f} (min {self.window.min_seen:.1f})"
+        )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 只处理秒数格式，HTTP 日期格式忽略"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class HostRateLimiter:
+    """
+    按 host 分配 HostLimiter
+
+    用法:
+        limiter = rate_limiter.for_url(url)
+        await limiter.acquire()
+        ... 发请求 ...
+        await limiter.release(status, latency)
+    """
+
+    def __init__(self, policies: Optional[Dict[str, HostPolicy]] = None,
+                 default_policy: Optional[HostPolicy] = DEFAULT_POLICY):
+        """
+        Args:
+            policies: host 后缀 -> 策略，默认为 load_policies()
+            default_policy: 未匹配 host 的策略；None 表示不限流
+        """
+        self.policies = policies if policies is not None else load_policies()
+        self.default_policy = default_policy
+        # 最长后缀优先
+        self._suffixes = sorted(self.policies, key=len, reverse=True)
+        self._limiters: Dict[str, HostLimiter] = {}
+
+    def policy_for(self, host: str) -> Optional[HostPolicy]:
+        for suffix in self._suffixes:
+            if host == suffix or host.endswith('.' + suffix):
+                return self.policies[suffix]
+        return self.default_policy
+
+    def for_url(self, url: str) -> Optional[HostLimiter]:
+        host = (urlparse(str(url)).hostname or '').lower()
+        if not host:
+            return None
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            policy = self.policy_for(host)
+            if policy is None:
+                return None
+            limiter = self._limiters[host] = HostLimiter(host, policy)
+        return limiter
+
+    def summary_lines(self) -> List[str]:
+        """按请求数降序的每个 host 的统计"""
+        limiters = sorted(self._limiters.values(), key=lambda l: l.stats['requests'], reverse=True)
+        return [limiter.summary() for limiter in limiters]
@@ -0,0 +1,212 @@
+"""
+HTTP Record / Replay
+Drop-in HttpClient variants for running scrapers offline.
+
+- RecordingHttpClient: performs real requests and keeps every response,
+  save() writes them to a gzip-compressed JSON fixture
+- ReplayHttpClient: answers requests from a responder (a recorded fixture
+  or a synthetic board, see synthetic.py) without touching the network
+
+Fixture format (gzip JSON):
+    {
+        "version": 1,
+        "scraper": "greenhouse",
+        "company": {"name": ..., "ats_url": ..., ...},
+        "recorded_at": "2024-01-01T00:00:00",
+        "entries": [
+            {"key": "GET https://...", "status": 200, "headers": {...},
+             "body": "..." | "body_b64": "..."}
+        ]
+    }
+"""
+import base64
+import gzip
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from .http_client import HttpClient
+
+FIXTURE_VERSION = 1
+
+# 回放时不需要的响应头
+_DROPPED_HEADERS = {'set-cookie', 'content-encoding', 'content-length', 'transfer-encoding'}
+
+# company 文档中写入 fixture 的字段
+COMPANY_FIELDS = ('name', 'domain', 'ats_url', 'ats_system', 'location')
+
+
+def request_key(method: str, url: str, json_body=None, data=None) -> str:
+    """请求的回放键：方法 + URL（+ 规范化后的请求体）"""
+    key = f"{method.upper()} {url}"
+    if json_body is not None:
+        key += ' ' + json.dumps(json_body, sort_keys=True, separators=(',', ':'))
+    elif data is not None:
+        key += ' ' + (data.decode('utf-8', 'replace') if isinstance(data, bytes) else str(data))
+    return key
+
+
+class ReplayResponse:
+    """与抓取器用到的 aiohttp.ClientResponse 接口兼容的响应"""
+
+    def __init__(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.url = URL(url)
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self._body = body
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('Content-Type', 'application/octet-stream').split(';')[0].strip()
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = 'strict') -> str:
+        return self._body.decode(encoding or 'utf-8', errors)
+
+    async def json(self, *, encoding: Optional[str] = None, loads=json.loads, content_type=None):
+        return loads(self._body.decode(encoding or 'utf-8'))
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status, message=f"HTTP {self.status}", headers=self.headers
+            )
+
+    def release(self):
+        pass
+
+
+# responder(method, url, kwargs) -> ReplayResponse；无法应答时返回 None
+Responder = Callable[[str, str, Dict], Optional[ReplayResponse]]
+
+
+class FixtureMissing(aiohttp.ClientConnectionError):
+    """回放时请求不在 fixture 中（按网络错误处理，抓取器的错误路径也能被覆盖）"""
+
+
+def _encode_entry(key: str, status: int, headers: Dict[str, str], body: bytes) -> Dict:
+    entry = {'key': key, 'status': status, 'headers': headers}
+    try:
+        entry['body'] = body.decode('utf-8')
+    except UnicodeDecodeError:
+        entry['body_b64'] = base64.b64encode(body).decode('ascii')
+    return entry
+
+
+def _decode_body(entry: Dict) -> bytes:
+    if 'body_b64' in entry:
+        return base64.b64decode(entry['body_b64'])
+    return entry.get('body', '').encode('utf-8')
+
+
+def save_fixture(path, entries: List[Dict], scraper: str, company: Dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fixture = {
+        'version': FIXTURE_VERSION,
+        'scraper': scraper,
+        'company': {k: company[k] for k in COMPANY_FIELDS if company.get(k) is not None},
+        'recorded_at': datetime.utcnow().isoformat(),
+        'entries': entries,
+    }
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(fixture, f, ensure_ascii=False, default=str)
+
+
+def load_fixture(path) -> Dict:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        fixture = json.load(f)
+    if fixture.get('version') != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version in {path}: {fixture.get('version')}")
+    return fixture
+
+
+class FixtureResponder:
+    """
+    按请求键应答录制的响应
+
+    同一个键录制了多次时按顺序回放，用完后重复最后一次。
+    """
+
+    def __init__(self, entries: List[Dict]):
+        self._entries: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            self._entries.setdefault(entry['key'], []).append(entry)
+        self._cursor: Dict[str, int] = {}
+
+    def __call__(self, method: str, url: str, kwargs: Dict) -> Optional[ReplayResponse]:
+        key = request_key(method, url, kwargs.get('json'), kwargs.get('data'))
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = index + 1
+        entry = entries[min(index, len(entries) - 1)]
+        return ReplayResponse(method, url, entry['status'], entry['headers'], _decode_body(entry))
+
+
+class RecordingHttpClient(HttpClient):
+    """真实请求，同时记录所有响应"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.entries: List[Dict] = []
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        key = request_key(method, url, kwargs.get('json'), kwargs.get('data'))
+        async with super().request(method, url, **kwargs) as response:
+            body = await response.read()
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+            status = response.status
+            final_url = str(response.url)
+        self.entries.append(_encode_entry(key, status, headers, body))
+        yield ReplayResponse(method, final_url, status, headers, body)
+
+    def save(self, path, scraper: str, company: Dict):
+        save_fixture(path, self.entries, scraper, company)
+
+
+class ReplayHttpClient(HttpClient):
+    """
+    离线回放客户端（不建立任何连接，不限流）
+
+    用法:
+        client, fixture = ReplayHttpClient.from_fixture('data/fixtures/greenhouse_stripe.json.gz')
+        jobs = await GreenhouseScraper(client).scrape(fixture['company'])
+    """
+
+    def __init__(self, responder: Responder):
+        super().__init__(rate_limit=False)
+        self.responder = responder
+        self.missing: List[str] = []
+
+    @classmethod
+    def from_fixture(cls, path) -> Tuple['ReplayHttpClient', Dict]:
+        fixture = load_fixture(path)
+        return cls(FixtureResponder(fixture['entries'])), fixture
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        self.stats['requests'] += 1
+        response = self.responder(method, str(url), kwargs)
+        if response is None:
+            key = request_key(method, str(url), kwargs.get('json'), kwargs.get('data'))
+            self.missing.append(key)
+            raise FixtureMissing(f"No recorded response for {key}")
+        yield response
+
+    async def get_session(self):
+        raise RuntimeError("ReplayHttpClient does not open network sessions")
+
+    async def close(self):
+        pass
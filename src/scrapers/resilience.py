@@ -0,0 +1,132 @@
+"""
+Scrape Resilience
+Bounded retries for transient scrape errors, and a per-company circuit
+breaker persisted on the company document.
+
+A company whose board keeps failing is backed off for a growing interval
+(its schedule.next_scrape_at is pushed out), so dead boards stop costing
+requests on every run. stats.scrape_success_rate / stats.last_error are
+kept current on every crawl.
+"""
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from pymongo.database import Database
+
+from .base import BaseScraper, BoardNotModified, ScrapeError
+
+logger = logging.getLogger(__name__)
+
+
+async def scrape_with_retry(
+    scraper: BaseScraper,
+    company: Dict,
+    attempts: int = int(os.getenv('SCRAPE_RETRY_ATTEMPTS', 3)),
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> List[Dict]:
+    """
+    调用 scraper.scrape，瞬时错误按指数退避重试
+
+    Args:
+        attempts: 最多尝试次数（含第一次）
+        base_delay: 第一次重试前的等待秒数，之后每次翻倍（带随机抖动）
+        max_delay: 单次等待上限
+
+    Raises:
+        BoardNotModified: 原样抛出
+        ScrapeError: 非瞬时错误，或重试次数用尽
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await scraper.scrape(company)
+        except BoardNotModified:
+            raise
+        except Exception as e:
+            error = ScrapeError.from_exception(e)
+            if not error.transient or attempt == attempts:
+                if error is not e:
+                    raise error from e
+                raise
+        # 429 的 Retry-After 已由 HttpClient 的限流器处理，这里只做退避
+        delay = min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+        logger.warning(
+            f"{company['name']}: 第 {attempt}/{attempts} 次抓取失败 ({error})，{delay:.1f}s 后重试"
+        )
+        await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    按公司的熔断器（状态保存在 companies.circuit_breaker）
+
+    - 连续失败 FAILURE_THRESHOLD 次后熔断，OPEN_HOURS 后才允许再次抓取
+    - 之后每多失败一次，熔断时长翻倍，最长 MAX_OPEN_HOURS
+    - 成功一次即复位
+    - stats.scrape_success_rate 为指数移动平均（权重 SUCCESS_RATE_ALPHA）
+    """
+
+    FAILURE_THRESHOLD = 3
+    OPEN_HOURS = 12
+    MAX_OPEN_HOURS = 24 * 7
+    SUCCESS_RATE_ALPHA = 0.2
+    MAX_ERROR_LENGTH = 500
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def open_until(company: Dict, now: Optional[datetime] = None) -> Optional[datetime]:
+        """熔断中则返回恢复时间，否则返回 None"""
+        now = now or datetime.utcnow()
+        until = (company.get('circuit_breaker') or {}).get('open_until')
+        return until if until and until > now else None
+
+    @classmethod
+    def _success_rate(cls, company: Dict, success: bool) -> float:
+        rate = (company.get('stats') or {}).get('scrape_success_rate', 1.0)
+        return round(rate * (1 - cls.SUCCESS_RATE_ALPHA) + cls.SUCCESS_RATE_ALPHA * float(success), 4)
+
+    @classmethod
+    def open_interval(cls, failures: int) -> Optional[timedelta]:
+        """连续失败 failures 次后的熔断时长；未达阈值为 None"""
+        if failures < cls.FAILURE_THRESHOLD:
+            return None
+        hours = cls.OPEN_HOURS * 2 ** (failures - cls.FAILURE_THRESHOLD)
+        return timedelta(hours=min(cls.MAX_OPEN_HOURS, hours))
+
+    def record_success(self, company: Dict, now: Optional[datetime] = None):
+        """抓取成功（包括 board 未变化、board 为空）"""
+        now = now or datetime.utcnow()
+        self.db.companies.update_one({'_id': company['_id']}, {'$set': {
+            'circuit_breaker': {'failures': 0, 'open_until': None, 'last_failure_at': None},
+            'stats.scrape_success_rate': self._success_rate(company, True),
+            'stats.last_error': None,
+        }})
+
+    def record_failure(self, company: Dict, error: Exception, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        抓取失败
+
+        Returns:
+            熔断恢复时间；未熔断时为 None
+        """
+        now = now or datetime.utcnow()
+        failures = (company.get('circuit_breaker') or {}).get('failures', 0) + 1
+        interval = self.open_interval(failures)
+        open_until = now + interval if interval else None
+
+        update = {'$set': {
+            'circuit_breaker': {'failures': failures, 'open_until': open_until, 'last_failure_at': now},
+            'stats.scrape_success_rate': self._success_rate(company, False),
+            'stats.last_error': str(error)[:self.MAX_ERROR_LENGTH],
+        }}
+        if open_until:
+            # 熔断期间调度器不会选中该公司
+            update['$max'] = {'schedule.next_scrape_at': open_until}
+        self.db.companies.update_one({'_id': company['_id']}, update)
+        return open_until
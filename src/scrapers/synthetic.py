@@ -0,0 +1,292 @@
+"""
+Synthetic ATS Boards
+Deterministic fake job boards that speak each ATS's API, for offline
+benchmarks and load tests.
+
+A SyntheticBoard is a replay responder (see replay.py): it answers the same
+paths the scrapers request (Greenhouse, Lever, Ashby, Workable, Workday),
+on any host, with realistic payload shapes and HTML descriptions.
+"""
+import hashlib
+import json
+import random
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .replay import ReplayResponse
+
+ATS_TYPES = ('greenhouse', 'lever', 'ashby', 'workable', 'workday')
+
+# Workday 的 jobs 接口每页最多返回 20 条
+WORKDAY_PAGE_LIMIT = 20
+
+_LEVELS = ['', 'Senior ', 'Staff ', 'Principal ', 'Junior ', 'Lead ']
+_ROLES = [
+    'Software Engineer', 'Backend Engineer', 'Frontend Engineer', 'Data Scientist',
+    'Machine Learning Engineer', 'Site Reliability Engineer', 'Product Manager',
+    'Product Designer', 'Account Executive', 'Recruiter', 'Security Engineer',
+]
+_TEAMS = ['Platform', 'Payments', 'Infrastructure', 'Growth', 'Search', 'Mobile', 'Data']
+_LOCATIONS = [
+    'San Francisco, CA', 'New York, NY', 'Remote - US', 'London, United Kingdom',
+    'Tokyo, Japan', 'Berlin, Germany', 'Toronto, Canada', 'Singapore',
+]
+_SKILLS = ['Python', 'Go', 'Java', 'TypeScript', 'React', 'Kubernetes', 'AWS', 'PostgreSQL', 'Kafka', 'Rust']
+_SENTENCES = [
+    "You will design, build and operate services that handle millions of requests per day.",
+    "We value ownership, clear written communication and a bias for shipping.",
+    "Our stack includes {skill} and {skill2}, deployed on {skill3} across multiple regions.",
+    "You'll partner with product & design to turn ambiguous problems into simple solutions.",
+    "Experience mentoring engineers and leading cross-team projects is a plus.",
+    "We offer competitive salary &amp; equity, comprehensive health coverage and flexible PTO.",
+    "The salary range for this role is $150,000 - $210,000 USD per year.",
+]
+
+
+class SyntheticBoard:
+    """
+    一个 ATS 的合成 board
+
+    用法:
+        board = SyntheticBoard('greenhouse', 1000)
+        client = ReplayHttpClient(board)
+        jobs = await GreenhouseScraper(client).scrape(board.company)
+    """
+
+    def __init__(self, ats: str, size: int, seed: int = 0, slug: str = 'acme'):
+        if ats not in ATS_TYPES:
+            raise ValueError(f"Unknown ATS type: {ats}")
+        self.ats = ats
+        self.size = size
+        self.slug = slug
+        self.rng = random.Random(f"{ats}-{size}-{seed}")
+        # 职位 ID 随 slug 变化：同一 ATS 的不同 board 不能共用 job_id（入库按 job_id 唯一）
+        self.id_base = int(hashlib.sha1(slug.encode('utf-8')).hexdigest()[:8], 16) * 100000
+        self.postings = [self._posting(i) for i in range(size)]
+        self._by_id = {str(p['id']): p for p in self.postings}
+        self._payload_cache: Dict[str, bytes] = {}
+
+    # --- Postings ---
+
+    def _posting(self, index: int) -> Dict:
+        rng = self.rng
+        skills = rng.sample(_SKILLS, 3)
+        paragraphs = []
+        for _ in range(rng.randint(3, 7)):
+            sentences = rng.sample(_SENTENCES, rng.randint(2, 4))
+            paragraphs.append(' '.join(sentences).format(skill=skills[0], skill2=skills[1], skill3=skills[2]))
+        bullets = ''.join(f"<li>{rng.randint(2, 8)}+ years with {skill}</li>" for skill in skills)
+        description = (
+            f"<h2>About the role</h2><p>{paragraphs[0]}</p>"
+            + ''.join(f"<p>{p}</p>" for p in paragraphs[1:])
+            + f"<h3>What you'll bring</h3><ul>{bullets}</ul>"
+        )
+        return {
+            'id': self.id_base + index,
+            'title': f"{rng.choice(_LEVELS)}{rng.choice(_ROLES)}, {rng.choice(_TEAMS)}".strip(),
+            'location': rng.choice(_LOCATIONS),
+            'team': rng.choice(_TEAMS),
+            'description': description,
+            'updated_at': datetime(2024, 1, 1) + timedelta(minutes=index * 37),
+        }
+
+    def mutate(self, fraction: float, seed: int = 1):
+        """修改一部分职位（模拟 board 的变化），之后的响应会带上新内容"""
+        rng = random.Random(seed)
+        count = int(len(self.postings) * fraction)
+        for posting in rng.sample(self.postings, count):
+            posting['title'] = posting['title'] + ' (Updated)'
+            posting['updated_at'] = posting['updated_at'] + timedelta(days=1)
+        self._payload_cache.clear()
+
+    # --- Company document ---
+
+    @property
+    def company(self) -> Dict:
+        """抓取器需要的公司信息"""
+        name = f"{self.slug.title()} ({self.ats})"
+        urls = {
+            'greenhouse': f"https://boards.greenhouse.io/{self.slug}",
+            'lever': f"https://jobs.lever.co/{self.slug}",
+            'ashby': f"https://jobs.ashbyhq.com/{self.slug}",
+            'workable': f"https://apply.workable.com/{self.slug}/",
+            'workday': f"https://{self.slug}.wd5.myworkdayjobs.com/External",
+        }
+        company = {'name': name, 'domain': f"{self.slug}.com", 'ats_url': urls[self.ats],
+                   'ats_system': {'type': self.ats}}
+        if self.ats == 'workday':
+            company['ats_system']['api_endpoint'] = urls['workday']
+        return company
+
+    # --- Payloads per ATS ---
+
+    def _greenhouse_job(self, p: Dict, content: bool) -> Dict:
+        job = {
+            'id': p['id'],
+            'title': p['title'],
+            'updated_at': p['updated_at'].isoformat() + 'Z',
+            'location': {'name': p['location']},
+            'absolute_url': f"https://boards.greenhouse.io/{self.slug}/jobs/{p['id']}",
+            'departments': [{'name': p['team']}],
+            'metadata': None,
+        }
+        if content:
+            # Greenhouse 返回转义后的 HTML
+            job['content'] = p['description'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        return job
+
+    def _lever_job(self, p: Dict) -> Dict:
+        return {
+            'id': f"{p['id']:08x}-0000-4000-8000-{p['id']:012x}",
+            'text': p['title'],
+            'categories': {'location': p['location'], 'commitment': 'Full-time', 'team': p['team']},
+            'hostedUrl': f"https://jobs.lever.co/{self.slug}/{p['id']}",
+            'description': p['description'],
+            'descriptionPlain': re.sub(r'<[^>]+>', ' ', p['description']),
+            'lists': [{'text': 'Benefits', 'content': '<li>Health</li><li>401k</li>'}],
+            'additional': '',
+            'createdAt': int(p['updated_at'].timestamp() * 1000),
+        }
+
+    def _ashby_job(self, p: Dict) -> Dict:
+        return {
+            'id': f"ashby-{p['id']}",
+            'title': p['title'],
+            'location': p['location'],
+            'isRemote': 'Remote' in p['location'],
+            'employmentType': 'FullTime',
+            'descriptionHtml': p['description'],
+            'publishedAt': p['updated_at'].isoformat() + 'Z',
+            'jobUrl': f"https://jobs.ashbyhq.com/{self.slug}/ashby-{p['id']}",
+        }
+
+    def _workable_job(self, p: Dict) -> Dict:
+        city, _, country = p['location'].partition(', ')
+        return {
+            'shortcode': f"W{p['id']:X}",
+            'title': p['title'],
+            'location': {'city': city, 'country': country},
+            'type': 'full',
+            'workplace': 'remote' if 'Remote' in p['location'] else 'on_site',
+            'published': p['updated_at'].isoformat() + 'Z',
+        }
+
+    def _workday_path(self, p: Dict) -> str:
+        title_slug = re.sub(r'[^A-Za-z0-9]+', '-', p['title']).strip('-')
+        location_slug = re.sub(r'[^A-Za-z0-9]+', '-', p['location']).strip('-')
+        return f"/job/{location_slug}/{title_slug}_R{p['id']}"
+
+    def _workday_job(self, p: Dict) -> Dict:
+        return {
+            'title': p['title'],
+            'externalPath': self._workday_path(p),
+            'locationsText': p['location'],
+            'postedOn': 'Posted 3 Days Ago',
+            'bulletFields': [f"R{p['id']}"],
+        }
+
+    def _workday_detail(self, p: Dict) -> Dict:
+        return {'jobPostingInfo': {
+            'id': str(p['id']),
+            'title': p['title'],
+            'jobDescription': p['description'],
+            'location': p['location'],
+            'startDate': p['updated_at'].strftime('%Y-%m-%d'),
+            'timeType': 'Full time',
+            'jobReqId': f"R{p['id']}",
+            'externalUrl': f"https://{self.slug}.wd5.myworkdayjobs.com/External{self._workday_path(p)}",
+        }}
+
+    # --- Routing ---
+
+    def _json(self, cache_key: Optional[str], build) -> Tuple[int, Dict, bytes]:
+        body = self._payload_cache.get(cache_key) if cache_key else None
+        if body is None:
+            body = json.dumps(build()).encode('utf-8')
+            if cache_key:
+                self._payload_cache[cache_key] = body
+        headers = {'Content-Type': 'application/json; charset=utf-8',
+                   'ETag': '"' + hashlib.sha1(body).hexdigest() + '"'}
+        return 200, headers, body
+
+    def route(self, method: str, path: str, query: Dict[str, List[str]],
+              json_body: Optional[Dict]) -> Optional[Tuple[int, Dict, bytes]]:
+        """
+        按 ATS 的 API 路径应答（与 host 无关）
+
+        Returns:
+            (status, headers, body)；路径不属于该 board 时为 None
+        """
+        method = method.upper()
+        postings = self.postings
+        by_id = self._by_id
+
+        if self.ats == 'greenhouse':
+            m = re.fullmatch(r'/v1/boards/[^/]+/jobs(?:/(\d+))?', path)
+            if m and method == 'GET':
+                if m.group(1):
+                    p = by_id.get(m.group(1))
+                    if not p:
+                        return 404, {}, b'{"status":404,"error":"Job not found"}'
+                    return self._json(None, lambda: self._greenhouse_job(p, True))
+                content = query.get('content', ['false'])[0] == 'true'
+                return self._json(f"gh-{content}", lambda: {
+                    'jobs': [self._greenhouse_job(p, content) for p in postings],
+                    'meta': {'total': len(postings)},
+                })
+
+        elif self.ats == 'lever':
+            if re.fullmatch(r'/v0/postings/[^/]+', path) and method == 'GET':
+                return self._json('lever', lambda: [self._lever_job(p) for p in postings])
+
+        elif self.ats == 'ashby':
+            if re.fullmatch(r'/posting-api/job-board/[^/]+', path) and method == 'GET':
+                return self._json('ashby', lambda: {'jobs': [self._ashby_job(p) for p in postings]})
+            if re.fullmatch(r'/[^/]+/?', path) and method in ('GET', 'HEAD'):
+                # 页面不内嵌 __NEXT_DATA__，抓取器回退到 posting API
+                html = f"<html><head><title>{self.slug} Jobs</title></head><body><div id='root'></div></body></html>"
+                return 200, {'Content-Type': 'text/html; charset=utf-8'}, html.encode('utf-8')
+
+        elif self.ats == 'workable':
+            if re.fullmatch(r'/api/v3/accounts/[^/]+/jobs', path) and method == 'POST':
+                return self._json('workable', lambda: {
+                    'total': len(postings),
+                    'results': [self._workable_job(p) for p in postings],
+                })
+
+        elif self.ats == 'workday':
+            if re.fullmatch(r'/wday/cxs/[^/]+/[^/]+/jobs', path) and method == 'POST':
+                body = json_body or {}
+                offset = int(body.get('offset', 0))
+                limit = min(int(body.get('limit', WORKDAY_PAGE_LIMIT)), WORKDAY_PAGE_LIMIT)
+                page = postings[offset:offset + limit]
+                return self._json(None, lambda: {
+                    'total': len(postings),
+                    'jobPostings': [self._workday_job(p) for p in page],
+                })
+            m = re.fullmatch(r'/wday/cxs/[^/]+/[^/]+(/job/.+)', path)
+            if m and method == 'GET':
+                req_id = m.group(1).rsplit('_R', 1)[-1]
+                p = by_id.get(req_id)
+                if not p:
+                    return 404, {}, b'{"errorCode":"NOT_FOUND"}'
+                return self._json(None, lambda: self._workday_detail(p))
+            if path in ('', '/') or re.fullmatch(r'/[^/]+/?', path):
+                return 200, {'Content-Type': 'text/html; charset=utf-8'}, b"<html><body>Careers</body></html>"
+
+        return None
+
+    def __call__(self, method: str, url: str, kwargs: Dict) -> Optional[ReplayResponse]:
+        """ReplayHttpClient 的 responder 接口"""
+        parts = urlsplit(url)
+        routed = self.route(method, parts.path, parse_qs(parts.query), kwargs.get('json'))
+        if routed is None:
+            return None
+        status, headers, body = routed
+        etag = headers.get('ETag')
+        if_none_match = (kwargs.get('headers') or {}).get('If-None-Match')
+        if etag and if_none_match == etag:
+            return ReplayResponse(method, url, 304, {'ETag': etag}, b'')
+        return ReplayResponse(method, url, status, headers, body)
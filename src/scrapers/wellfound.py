@@ -3,23 +3,52 @@ Wellfound (formerly AngelList) Scraper
 Uses Playwright to scrape job listings from Wellfound.
 """
 import asyncio
+import hashlib
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime
 import random
 
-from playwright.async_api import async_playwright
 from .base import BaseScraper
+from .browser_pool import BrowserPool
+from .http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 
+# 在页面内一次性提取所有职位卡片（避免每个字段一次 Playwright 往返）
+EXTRACT_CARDS_JS = """
+cards => cards.map(card => {
+    const text = selector => {
+        const el = card.querySelector(selector);
+        return el ? el.innerText : null;
+    };
+    const link = card.querySelector('a[data-test="JobTitleLink"]');
+    return {
+        title: text('h2') || text('.styles_title__'),
+        company: text('.styles_companyName__'),
+        location: text('.styles_location__'),
+        url: link ? link.getAttribute('href') : null,
+        description: text('.styles_description__'),
+    };
+})
+"""
+
 class WellfoundScraper(BaseScraper):
     """Wellfound 职位采集器"""
     
     BASE_URL = "https://wellfound.com/jobs"
+    CARD_SELECTOR = 'div[data-test="JobResult"]'
+    # 滚动加载更多：最多滚动次数；每次滚动后等待新卡片出现的时间
+    MAX_SCROLLS = 3
+    SCROLL_WAIT_MS = 2000
     
-    def __init__(self):
-        super().__init__("wellfound")
+    def __init__(self, http_client: Optional[HttpClient] = None, browser_pool: Optional[BrowserPool] = None):
+        """
+        Args:
+            browser_pool: 整次抓取共享的浏览器池；未提供时每次 scrape 临时创建一个
+        """
+        super().__init__("wellfound", http_client)
+        self.browser_pool = browser_pool
         
     async def scrape(self, company: Dict) -> List[Dict]:
         """
@@ -30,98 +59,111 @@ class WellfoundScraper(BaseScraper):
         
         target_url = company.get('ats_url') or self.BASE_URL
         
+        pool = self.browser_pool or BrowserPool(max_contexts=1)
+        try:
+            cards = await self._load_cards(pool, target_url)
+        finally:
+            if pool is not self.browser_pool:
+                await pool.close()
+        
         jobs = []
-        async with async_playwright() as p:
-            # 启动浏览器，使用随机 User-Agent 和一些反爬措施
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-                viewport={'width': 1280, 'height': 800}
-            )
-            
-            page = await context.new_page()
-            
+        failed = 0
+        for card in cards:
+            try:
+                job = self._parse_card(card, company)
+                jobs.append(job)
+            except Exception as e:
+                self.logger.warning(f"解析单个 Wellfound 职位失败: {e}")
+                failed += 1
+        if failed:
+            self.mark_incomplete(company, f"{failed} 个职位解析失败")
+                
+        self.logger.info(f"从 Wellfound 抓取到 {len(jobs)} 个职位")
+        return jobs
+
+    async def _load_cards(self, pool: BrowserPool, target_url: str) -> List[Dict]:
+        """打开页面、滚动加载，返回职位卡片的原始字段"""
+        async with pool.page() as page:
             try:
                 self.logger.info(f"正在访问 {target_url}...")
-                await page.goto(target_url, wait_until="networkidle", timeout=60000)
+                # 图片/字体/统计脚本已被浏览器池拦截；职位列表以卡片出现为准，不等待 networkidle
+                await page.goto(target_url, wait_until="domcontentloaded", timeout=60000)
                 
                 # 等待职位列表加载
                 # Wellfound 的类名经常变化，我们寻找通用的属性或结构
                 # 通常职位卡片包含 "role" 或特定的 data-test-id
-                await page.wait_for_selector('div[data-test="JobResult"]', timeout=30000)
+                await page.wait_for_selector(self.CARD_SELECTOR, timeout=30000)
                 
-                # 模拟滚动以加载更多内容
-                for _ in range(3):
+                # 模拟滚动以加载更多内容；没有新卡片出现时提前结束
+                count = await page.locator(self.CARD_SELECTOR).count()
+                for _ in range(self.MAX_SCROLLS):
                     await page.mouse.wheel(0, 1000)
-                    await asyncio.sleep(random.uniform(1, 2))
-                
-                # 获取所有职位卡片
-                job_elements = await page.query_selector_all('div[data-test="JobResult"]')
-                self.logger.info(f"在页面上找到 {len(job_elements)} 个职位卡片")
-                
-                for element in job_elements:
                     try:
-                        # 提取职位信息
-                        # 注意：Wellfound 页面结构较复杂，需要细致提取
-                        title_elem = await element.query_selector('h2') or await element.query_selector('.styles_title__')
-                        title = await title_elem.inner_text() if title_elem else "Unknown Title"
-                        
-                        # 公司名称 - 在 Wellfound 上，通常职位卡片上方有公司名
-                        # 如果我们是针对特定公司抓取，可以从 company['name'] 获取，
-                        # 但如果是从 /jobs 抓取，则需要从 element 中提取
-                        company_elem = await element.query_selector('.styles_companyName__')
-                        job_company_name = await company_elem.inner_text() if company_elem else company['name']
-                        
-                        location_elem = await element.query_selector('.styles_location__')
-                        location = await location_elem.inner_text() if location_elem else ""
-                        
-                        # 链接
-                        link_elem = await element.query_selector('a[data-test="JobTitleLink"]')
-                        job_url = await link_elem.get_attribute('href') if link_elem else ""
-                        if job_url and not job_url.startswith('http'):
-                            job_url = f"https://wellfound.com{job_url}"
-                            
-                        # 简单的描述（预览）
-                        desc_elem = await element.query_selector('.styles_description__')
-                        description = await desc_elem.inner_text() if desc_elem else ""
-                        
-                        # 标准化数据
-                        raw_job = {
-                            'id': f"wellfound_{hash(job_url)}",
-                            'title': title,
-                            'location': location,
-                            'url': job_url,
-                            'description': description,
-                            'posted_date': datetime.utcnow() # Wellfound 通常显示 "active 2 days ago"
-                        }
-                        
-                        job = self.normalize_job_data(
-                            raw_job,
-                            job_company_name,
-                            'wellfound',
-                            company.get('location')
+                        await page.wait_for_function(
+                            "([selector, count]) => document.querySelectorAll(selector).length > count",
+                            arg=[self.CARD_SELECTOR, count],
+                            timeout=self.SCROLL_WAIT_MS,
                         )
-                        
-                        # 尝试提取薪资
-                        salary = self.extract_salary(description)
-                        if salary:
-                            job['salary'] = salary
-                            
-                        jobs.append(job)
-                        
-                    except Exception as e:
-                        self.logger.warning(f"解析单个 Wellfound 职位失败: {e}")
-                        continue
+                    except Exception:
+                        break
+                    count = await page.locator(self.CARD_SELECTOR).count()
+                    await asyncio.sleep(random.uniform(0.2, 0.5))
+                
+                # 获取所有职位卡片
+                cards = await page.eval_on_selector_all(self.CARD_SELECTOR, EXTRACT_CARDS_JS)
+                self.logger.info(f"在页面上找到 {len(cards)} 个职位卡片")
+                return cards
                 
             except Exception as e:
                 self.logger.error(f"Wellfound 抓取过程出错: {e}")
                 # 截图以供调试
-                await page.screenshot(path="logs/wellfound_error.png")
-            finally:
-                await browser.close()
-                
-        self.logger.info(f"从 Wellfound 抓取到 {len(jobs)} 个职位")
-        return jobs
+                try:
+                    await page.screenshot(path="logs/wellfound_error.png")
+                except Exception:
+                    pass
+                return []
+
+    def _parse_card(self, card: Dict, company: Dict) -> Dict:
+        """标准化一个职位卡片"""
+        title = card.get('title') or "Unknown Title"
+        
+        # 公司名称 - 在 Wellfound 上，通常职位卡片上方有公司名
+        # 如果我们是针对特定公司抓取，可以从 company['name'] 获取，
+        # 但如果是从 /jobs 抓取，则需要从卡片中提取
+        job_company_name = card.get('company') or company['name']
+        location = card.get('location') or ""
+        
+        # 链接
+        job_url = card.get('url') or ""
+        if job_url and not job_url.startswith('http'):
+            job_url = f"https://wellfound.com{job_url}"
+            
+        # 简单的描述（预览）
+        description = card.get('description') or ""
+        
+        # 标准化数据；job_id 用 URL 的摘要（内置 hash() 每个进程都不同）
+        raw_job = {
+            'id': f"wellfound_{hashlib.md5(job_url.encode('utf-8')).hexdigest()[:16]}",
+            'title': title,
+            'location': location,
+            'url': job_url,
+            'description': description,
+            'posted_date': datetime.utcnow() # Wellfound 通常显示 "active 2 days ago"
+        }
+        
+        job = self.normalize_job_data(
+            raw_job,
+            job_company_name,
+            'wellfound',
+            company.get('location')
+        )
+        
+        # 尝试提取薪资
+        salary = self.extract_salary(description)
+        if salary:
+            job['salary'] = salary
+        
+        return job
 
 # 用于独立测试
 async def test_wellfound():
@@ -2,14 +2,14 @@
 Workable ATS Scraper
 Workable provides a public JSON API (v3) for job postings
 """
-import aiohttp
-import ssl
+import json
 from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
 
-from .base import BaseScraper
+from .base import BaseScraper, BoardNotModified, ScrapeError
+from .http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +18,8 @@ class WorkableScraper(BaseScraper):
     
     API_BASE = "https://apply.workable.com/api/v3/accounts"
     
-    def __init__(self):
-        super().__init__("workable")
+    def __init__(self, http_client: Optional[HttpClient] = None):
+        super().__init__("workable", http_client)
         
     async def scrape(self, company: Dict) -> List[Dict]:
         """抓取Workable职位"""
@@ -27,16 +27,10 @@ class WorkableScraper(BaseScraper):
         
         slug = self._extract_slug(company)
         if not slug:
-            self.logger.warning(f"无法获取 {company['name']} 的 Workable slug")
-            return []
+            raise ScrapeError(f"无法获取 {company['name']} 的 Workable slug")
             
         url = f"{self.API_BASE}/{slug}/jobs"
         
-        # SSL context
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
         payload = {
             "query": "",
             "location": [],
@@ -46,31 +40,33 @@ class WorkableScraper(BaseScraper):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, ssl=ssl_context, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Workable API 请求失败: {response.status}")
-                        return []
-                        
-                    data = await response.json()
-                    jobs_data = data.get('results', [])
+            # POST 接口通常不支持条件请求，主要依靠内容摘要判断 board 是否变化
+            status, body = await self.fetch_board(company, 'POST', url, json=payload, timeout=30)
+            if status != 200:
+                raise ScrapeError.from_status(status, url)
+                
+            data = json.loads(body)
+                
+            jobs_data = data.get('results', [])
+            
+            jobs = []
+            changed = []
+            for job_data in jobs_data:
+                fingerprint = self.list_fingerprint(job_data)
+                seen = self.seen_record(company, f"workable_{job_data.get('shortcode')}", fingerprint)
+                if seen:
+                    jobs.append(seen)
+                else:
+                    changed.append((job_data, fingerprint))
+            jobs.extend(await self.parse_jobs(company, changed, slug))
                     
-                    jobs = []
-                    for job_data in jobs_data:
-                        try:
-                            job = self._parse_job(job_data, company, slug)
-                            if job:
-                                jobs.append(job)
-                        except Exception as e:
-                            self.logger.error(f"解析 Workable 职位失败: {e}")
-                            continue
-                            
-                    self.logger.info(f"从 {company['name']} 抓取到 {len(jobs)} 个职位")
-                    return jobs
+            self.logger.info(f"从 {company['name']} 抓取到 {len(jobs)} 个职位")
+            return jobs
                     
+        except (BoardNotModified, ScrapeError):
+            raise
         except Exception as e:
-            self.logger.error(f"抓取 Workable 职位失败 ({company['name']}): {e}")
-            return []
+            raise ScrapeError.from_exception(e) from e
 
     def _extract_slug(self, company: Dict) -> Optional[str]:
         """从 ats_url 或 domain 提取 slug"""
@@ -85,58 +81,53 @@ class WorkableScraper(BaseScraper):
 
     def _parse_job(self, job_data: Dict, company: Dict, slug: str) -> Optional[Dict]:
         """解析 Workable 职位数据"""
-        try:
-            shortcode = job_data.get('shortcode')
-            if not shortcode: return None
-            
-            job_id = f"workable_{shortcode}"
-            title = job_data.get('title', '').strip()
-            
-            # Location
-            loc_data = job_data.get('location', {})
-            location = f"{loc_data.get('city', '')}, {loc_data.get('country', '')}".strip(', ')
-            
-            # URL
-            source_url = f"https://apply.workable.com/{slug}/j/{shortcode}/"
-            
-            # Description
-            description = job_data.get('description', '') or title
-            
-            # Published Date
-            published = job_data.get('published')
-            posted_date = None
-            if published:
-                try:
-                    posted_date = datetime.fromisoformat(published.replace('Z', '+00:00'))
-                except:
-                    posted_date = None
+        shortcode = job_data.get('shortcode')
+        if not shortcode: return None
+        
+        job_id = f"workable_{shortcode}"
+        title = job_data.get('title', '').strip()
+        
+        # Location
+        loc_data = job_data.get('location', {})
+        location = f"{loc_data.get('city', '')}, {loc_data.get('country', '')}".strip(', ')
+        
+        # URL
+        source_url = f"https://apply.workable.com/{slug}/j/{shortcode}/"
+        
+        # Description
+        description = job_data.get('description', '') or title
+        
+        # Published Date
+        published = job_data.get('published')
+        posted_date = None
+        if published:
+            try:
+                posted_date = datetime.fromisoformat(published.replace('Z', '+00:00'))
+            except:
+                posted_date = None
 
-            # Prepare for normalization
-            normalized_raw = {
-                'id': job_id,
-                'title': title,
-                'location': location,
-                'url': source_url,
-                'description': description,
-                'posted_date': posted_date
-            }
-            
-            job = self.normalize_job_data(
-                normalized_raw, 
-                company['name'], 
-                'workable', 
-                company.get('location')
-            )
-            
-            # Add Workable-specific fields
-            job.update({
-                'job_type': job_data.get('type', 'Full-time'),
-                'remote_type': job_data.get('workplace', 'On-site'),
-                'skills': self.extract_skills(description)
-            })
-            
-            return job
-            
-        except Exception as e:
-            self.logger.error(f"解析 Workable 职位失败: {e}")
-            return None
+        # Prepare for normalization
+        normalized_raw = {
+            'id': job_id,
+            'title': title,
+            'location': location,
+            'url': source_url,
+            'description': description,
+            'posted_date': posted_date
+        }
+        
+        job = self.normalize_job_data(
+            normalized_raw, 
+            company['name'], 
+            'workable', 
+            company.get('location')
+        )
+        
+        # Add Workable-specific fields
+        job.update({
+            'job_type': job_data.get('type', 'Full-time'),
+            'remote_type': job_data.get('workplace', 'On-site'),
+            'skills': self.extract_skills(description)
+        })
+        
+        return job
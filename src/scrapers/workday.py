@@ -1,78 +1,180 @@
-import aiohttp
 import asyncio
-import ssl
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
 import re
 
-from .base import BaseScraper
+from .base import BaseScraper, BoardNotModified, ScrapeError
+from .html_text import html_to_text
+from .http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 
 class WorkdayScraper(BaseScraper):
     """Workday ATS 专用采集器"""
     
-    def __init__(self):
-        super().__init__("workday")
+    # Workday 的列表接口每页最多返回 20 个职位（limit 更大时返回 400）
+    PAGE_LIMIT = 20
+    # 同一个 board 的分页 / 详情请求的最大并发数（整体速率仍由 HttpClient 的按 host 限流器控制）
+    PAGE_CONCURRENCY = 4
+    DETAIL_CONCURRENCY = 8
+    # 单个 board 最多抓取的职位数，防止 total 异常时无限翻页
+    MAX_POSTINGS = 10000
+    
+    def __init__(self, http_client: Optional[HttpClient] = None):
+        super().__init__("workday", http_client)
         
     async def scrape(self, company: Dict) -> List[Dict]:
-        """抓取Workday职位"""
+        """
+        抓取Workday职位
+        
+        1. 第一页返回 total，其余分页有界并发获取；任何一页失败则整个抓取失败
+           （不完整的列表会让清除阶段误下线职位）
+        2. 列表摘要与上次一致时抛出 BoardNotModified
+        3. 只为新增 / 列表指纹变化的职位获取详情（描述、发布日期）
+        """
         self.logger.info(f"开始抓取 {company['name']} 的职位 (Workday)...")
         
         # 1. 获取Workday基础URL和Tenant信息
         config = await self._get_workday_config(company)
         if not config:
-            self.logger.warning(f"无法获取 {company['name']} 的 Workday 配置")
-            return []
+            raise ScrapeError(f"无法获取 {company['name']} 的 Workday 配置")
             
         base_url = config['base_url']
         tenant = config['tenant']
         board = config.get('board', tenant)  # 通常board名和tenant名相同，或者叫 "External"
         
-        # 2. 尝试获取职位列表 (POST API)
-        # 现代Workday网站通常使用 /wday/cxs/{tenant}/{board}/jobs 接口
-        api_url = f"{base_url}/wday/cxs/{tenant}/{board}/jobs"
-        
-        # SSL context for development
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
+        try:
+            # 2. 第一页 (POST API)，现代Workday网站通常使用 /wday/cxs/{tenant}/{board}/jobs 接口
+            api_url = f"{base_url}/wday/cxs/{tenant}/{board}/jobs"
+            status, first_page = await self._fetch_page(api_url, 0)
+            if status != 200 and board != "External":
+                # 尝试换一个board名字，比如 "External"
+                board = "External"
+                fallback_url = f"{base_url}/wday/cxs/{tenant}/{board}/jobs"
+                fallback_status, first_page = await self._fetch_page(fallback_url, 0)
+                if fallback_status == 200:
+                    api_url, status = fallback_url, fallback_status
+            if status != 200:
+                raise ScrapeError.from_status(status, api_url)
+            
+            postings = await self._fetch_all_postings(api_url, first_page, company)
+            
+            # 列表摘要未变化：跳过详情获取和解析（postedOn 是相对时间，每天都会变化，不计入）
+            digest_source = [{k: v for k, v in p.items() if k != 'postedOn'} for p in postings]
+            self.remember_board(company, api_url, json.dumps(digest_source, sort_keys=True).encode('utf-8'))
+            
+            jobs = []
+            changed = []
+            for job_data in postings:
+                fingerprint = self.list_fingerprint(job_data, 'externalPath', 'title', 'locationsText', 'bulletFields')
+                seen = self.seen_record(company, self._job_id(job_data), fingerprint)
+                if seen:
+                    jobs.append(seen)
+                else:
+                    changed.append((job_data, fingerprint))
+            
+            # 3. 有界并发获取详情；失败时已入库的职位只刷新代次（不覆盖已保存的描述、技能、薪资），
+            #    新职位只用列表信息入库，且都不保存指纹，下次重新获取
+            if changed:
+                details = await self._fetch_job_details(f"{base_url}/wday/cxs/{tenant}/{board}", [j for j, _ in changed])
+                missing = 0
+                ready = []
+                for job_data, fingerprint in changed:
+                    detail = details.get(job_data.get('externalPath'))
+                    if detail is None:
+                        missing += 1
+                        touch = self.touch_record(company, self._job_id(job_data))
+                        if touch:
+                            jobs.append(touch)
+                        else:
+                            ready.append((job_data, None))
+                    else:
+                        ready.append(({**job_data, 'detail': detail}, fingerprint))
+                if missing:
+                    self.logger.warning(f"{company['name']}: {missing}/{len(changed)} 个职位详情获取失败（已入库的保留原数据，新职位仅使用列表信息）")
+                    # 不保存列表摘要，否则下次 board 未变化时这些职位不会再获取详情
+                    self.mark_incomplete(company, f"{missing}/{len(changed)} 个职位详情获取失败")
+                jobs.extend(await self.parse_jobs(company, ready, base_url, board))
+            
+            self.logger.info(
+                f"从 {company['name']} 抓取到 {len(jobs)} 个职位（{len(postings)} 个列表项，{len(changed)} 个需要详情）"
+            )
+            return jobs
+                    
+        except (BoardNotModified, ScrapeError):
+            raise
+        except Exception as e:
+            raise ScrapeError.from_exception(e) from e
+
+    async def _fetch_page(self, api_url: str, offset: int) -> Tuple[int, Optional[Dict]]:
+        """获取一页职位列表，返回 (status, data)；非 200 时 data 为 None"""
         payload = {
             "appliedFacets": {},
-            "limit": 100,
-            "offset": 0,
+            "limit": self.PAGE_LIMIT,
+            "offset": offset,
             "searchText": ""
         }
+        async with self.http.post(api_url, json=payload, timeout=30) as response:
+            if response.status != 200:
+                return response.status, None
+            return 200, await response.json()
+
+    async def _fetch_all_postings(self, api_url: str, first_page: Dict, company: Dict) -> List[Dict]:
+        """
+        按第一页的 total 并发获取其余分页
+
+        Workday 只在第一页（offset=0）返回准确的 total，之后的分页 total 可能为 0。
+        分页期间职位可能增减导致相邻页重复，按 externalPath 去重。
+        """
+        total = int(first_page.get('total') or 0)
+        if total > self.MAX_POSTINGS:
+            self.logger.warning(f"{company['name']}: total={total} 超过上限，只抓取前 {self.MAX_POSTINGS} 个")
+            total = self.MAX_POSTINGS
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    api_url, 
-                    json=payload, 
-                    ssl=ssl_context, 
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status != 200:
-                        # 尝试换一个board名字，比如 "External"
-                        if board != "External":
-                            api_url = f"{base_url}/wday/cxs/{tenant}/External/jobs"
-                            async with session.post(api_url, json=payload, ssl=ssl_context) as resp2:
-                                if resp2.status == 200:
-                                    data = await resp2.json()
-                                    return await self._parse_workday_response(data, company, base_url, tenant, "External")
-                        
-                        self.logger.error(f"Workday API 请求失败: {response.status} for {api_url}")
-                        return []
-                        
-                    data = await response.json()
-                    return await self._parse_workday_response(data, company, base_url, tenant, board)
-                    
-        except Exception as e:
-            self.logger.error(f"抓取 Workday 职位失败 ({company['name']}): {e}")
-            return []
+        semaphore = asyncio.Semaphore(self.PAGE_CONCURRENCY)
+        
+        async def fetch(offset: int) -> List[Dict]:
+            async with semaphore:
+                status, data = await self._fetch_page(api_url, offset)
+            if status != 200:
+                raise ScrapeError.from_status(status, f"{api_url} (offset={offset})")
+            return data.get('jobPostings', [])
+        
+        pages = [first_page.get('jobPostings', [])]
+        pages += await asyncio.gather(*(fetch(offset) for offset in range(self.PAGE_LIMIT, total, self.PAGE_LIMIT)))
+        
+        postings = {}
+        for page in pages:
+            for job_data in page:
+                postings.setdefault(job_data.get('externalPath'), job_data)
+        return list(postings.values())
+
+    async def _fetch_job_details(self, site_url: str, postings: List[Dict]) -> Dict[str, Dict]:
+        """
+        有界并发获取职位详情
+
+        Returns:
+            externalPath -> jobPostingInfo；获取失败的职位不在结果中
+        """
+        semaphore = asyncio.Semaphore(self.DETAIL_CONCURRENCY)
+        
+        async def fetch(ext_path: str) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    async with self.http.get(f"{site_url}{ext_path}", timeout=30) as response:
+                        if response.status != 200:
+                            return None
+                        data = await response.json()
+                        return data.get('jobPostingInfo')
+                except Exception as e:
+                    self.logger.warning(f"获取职位详情失败 {ext_path}: {e}")
+                    return None
+        
+        paths = [p.get('externalPath') for p in postings if p.get('externalPath')]
+        results = await asyncio.gather(*(fetch(path) for path in paths))
+        return {path: detail for path, detail in zip(paths, results) if detail}
 
     async def _get_workday_config(self, company: Dict) -> Optional[Dict]:
         """从公司信息推断Workday配置"""
@@ -82,12 +184,11 @@ class WorkdayScraper(BaseScraper):
             endpoint = ats_system.get('api_endpoint')
             if endpoint:
                 # https://nvidia.wd5.myworkdayjobs.com/NVIDIAExternalCareerSite
-                match = re.search(r'(https://[^/]+)/([^/]+)', endpoint)
+                # -> tenant 是子域名（nvidia），board 是路径（NVIDIAExternalCareerSite），可能带语言前缀 /en-US/
+                match = re.search(r'(https?://([^./]+)[^/]*)/(?:[a-z]{2}-[A-Z]{2}/)?([^/?#]+)', endpoint)
                 if match:
-                    base_url = match.group(1)
-                    tenant_parts = match.group(2).split('.')
-                    tenant = tenant_parts[0]
-                    return {'base_url': base_url, 'tenant': tenant}
+                    base_url, tenant, board = match.groups()
+                    return {'base_url': base_url, 'tenant': tenant, 'board': board}
 
         # 2. 尝试使用 domain 推断
         # 很多公司使用 {company}.myworkdayjobs.com
@@ -99,70 +200,72 @@ class WorkdayScraper(BaseScraper):
         ]
         
         # Test hosts
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        async with aiohttp.ClientSession() as session:
-            for host in potential_hosts:
-                try:
-                    # 获取主页看是否重定向到真正的tenant路径
-                    async with session.get(host, ssl=ssl_context, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                        if resp.status == 200:
-                            # 提取 tenant 信息
-                            url_path = resp.url.path
-                            # Usually /wday/cxs/{tenant}/...
-                            # Or we can just use the subdomain as tenant
-                            tenant = host.split('//')[1].split('.')[0]
-                            return {'base_url': host, 'tenant': tenant}
-                except:
-                    continue
-                    
+        for host in potential_hosts:
+            try:
+                # 获取主页看是否重定向到真正的tenant路径
+                async with self.http.get(host, timeout=5) as resp:
+                    if resp.status == 200:
+                        # 提取 tenant 信息
+                        url_path = resp.url.path
+                        # Usually /wday/cxs/{tenant}/...
+                        # Or we can just use the subdomain as tenant
+                        tenant = host.split('//')[1].split('.')[0]
+                        return {'base_url': host, 'tenant': tenant}
+            except:
+                continue
+                
         return None
 
-    async def _parse_workday_response(self, data: Dict, company: Dict, base_url: str, tenant: str, board: str) -> List[Dict]:
-        """解析 Workday API 响应"""
-        job_postings = data.get('jobPostings', [])
-        jobs = []
+    @staticmethod
+    def _job_id(job_data: Dict) -> str:
+        ext_path = job_data.get('externalPath', '')
+        job_id_raw = ext_path.split('_')[-1] if '_' in ext_path else ext_path.split('/')[-1]
+        return f"workday_{job_id_raw}"
+
+    def _parse_job(self, job_data: Dict, company: Dict, base_url: str, board: str) -> Optional[Dict]:
+        """解析 Workday 职位数据（列表项 + 'detail' 中的 jobPostingInfo）"""
+        ext_path = job_data.get('externalPath', '')
+        detail = job_data.get('detail') or {}
+        title = (detail.get('title') or job_data.get('title', '')).strip()
+        if not title:
+            return None
+        description = html_to_text(detail.get('jobDescription') or '')
+        location = detail.get('location') or job_data.get('locationsText', '')
         
-        for job_data in job_postings:
+        # 发布日期：详情中的 startDate（YYYY-MM-DD）
+        posted_date = None
+        if detail.get('startDate'):
             try:
-                ext_path = job_data.get('externalPath', '')
-                job_id_raw = ext_path.split('_')[-1] if '_' in ext_path else ext_path.split('/')[-1]
-                
-                title = job_data.get('title', '').strip()
-                description = job_data.get('description', '') or ''
-                location = job_data.get('locationsText', '')
-                
-                # Prepare for normalization
-                normalized_raw = {
-                    'id': f"workday_{job_id_raw}",
-                    'title': title,
-                    'location': location,
-                    'url': f"{base_url}{ext_path}",
-                    'description': description,
-                    'posted_date': None
-                }
-                
-                job = self.normalize_job_data(
-                    normalized_raw, 
-                    company['name'], 
-                    'workday', 
-                    company.get('location')
-                )
-                
-                # Add Workday-specific fields
-                job.update({
-                    'job_type': 'Full-time',
-                    'remote_type': 'On-site',
-                    'skills': [],
-                    'raw_data': job_data
-                })
-                
-                jobs.append(job)
-                
-            except Exception as e:
-                self.logger.error(f"解析 Workday 职位失败: {e}")
-                continue
-                
-        return jobs
+                posted_date = datetime.fromisoformat(detail['startDate'][:10])
+            except ValueError:
+                posted_date = None
+        
+        # Prepare for normalization
+        normalized_raw = {
+            'id': self._job_id(job_data),
+            'title': title,
+            'location': location,
+            'url': detail.get('externalUrl') or f"{base_url}/{board}{ext_path}",
+            'description': description,
+            'posted_date': posted_date
+        }
+        
+        job = self.normalize_job_data(
+            normalized_raw, 
+            company['name'], 
+            'workday', 
+            company.get('location')
+        )
+        
+        remote = 'remote' in f"{location} {detail.get('remoteType', '')}".lower()
+        
+        # Add Workday-specific fields
+        job.update({
+            'job_type': detail.get('timeType') or 'Full-time',
+            'remote_type': 'Remote' if remote else 'On-site',
+            'skills': self.extract_skills(description),
+            'salary': self.extract_salary(description),
+            'raw_data': {k: v for k, v in job_data.items() if k != 'detail'}
+        })
+        
+        return job
@@ -0,0 +1,112 @@
+"""
+Company Stats
+Per-company job counts computed by one aggregation over the jobs collection.
+
+The counts are written server-side with $merge into the company_stats
+collection (_id = the jobs' company name, so companies that aren't in the
+companies collection - e.g. Wellfound posters - are counted too) and from
+there into companies.stats. No per-company round trips: the whole sync is
+a constant number of commands however many companies there are.
+
+Run after every crawl (scripts/prod_scraper.py) or on demand with
+scripts/sync_company_stats.py. /api/stats and /api/companies read the
+results instead of grouping the jobs collection live.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo.database import Database
+
+logger = logging.getLogger(__name__)
+
+# "本周新增"：发布日期（没有发布日期时用首次入库时间，即 _id 的时间戳）在最近 7 天内
+NEW_JOB_WINDOW = timedelta(days=7)
+
+# company_stats / companies.stats 中由本模块维护的计数
+COUNT_FIELDS = ('active_jobs', 'total_jobs_found', 'new_jobs_this_week', 'remote_jobs')
+
+
+def _active_and(condition) -> Dict:
+    """在线职位中满足 condition 的计数"""
+    return {'$sum': {'$cond': [{'$and': [{'$eq': ['$is_active', True]}, condition]}, 1, 0]}}
+
+
+def company_stats_pipeline(now: datetime) -> list:
+    """jobs -> company_stats 的聚合管道"""
+    first_seen_or_posted = {'$ifNull': ['$posted_date', {'$toDate': '$_id'}]}
+    return [
+        {'$match': {'company': {'$nin': [None, '']}}},
+        {'$group': {
+            '_id': '$company',
+            'total_jobs_found': {'$sum': 1},
+            'active_jobs': _active_and(True),
+            'new_jobs_this_week': _active_and({'$gte': [first_seen_or_posted, now - NEW_JOB_WINDOW]}),
+            'remote_jobs': _active_and({'$eq': ['$remote_type', 'Remote']}),
+        }},
+        {'$set': {'updated_at': now}},
+        {'$merge': {'into': 'company_stats', 'on': '_id', 'whenMatched': 'replace', 'whenNotMatched': 'insert'}},
+    ]
+
+
+def companies_merge_pipeline(now: datetime) -> list:
+    """company_stats -> companies.stats：按名称找到公司 _id，只覆盖计数字段（保留 scrape_success_rate 等）"""
+    return [
+        {'$match': {'updated_at': now}},
+        # localField + pipeline 形式需要 MongoDB 5.0+；pipeline 只取 _id，避免带出 board_cache 等大字段
+        {'$lookup': {
+            'from': 'companies',
+            'localField': '_id',
+            'foreignField': 'name',
+            'pipeline': [{'$project': {'_id': 1}}],
+            'as': 'company',
+        }},
+        {'$unwind': '$company'},
+        {'$project': {
+            '_id': '$company._id',
+            'stats': {**{f: f'${f}' for f in COUNT_FIELDS}, 'updated_at': '$updated_at'},
+        }},
+        {'$merge': {
+            'into': 'companies',
+            'on': '_id',
+            'whenMatched': [{'$set': {'stats': {'$mergeObjects': ['$stats', '$$new.stats']}}}],
+            'whenNotMatched': 'discard',
+        }},
+    ]
+
+
+def sync_company_stats(db: Database, now: Optional[datetime] = None) -> Dict:
+    """
+    重新计算所有公司的职位统计并写回
+
+    1. jobs 聚合 -> company_stats（$merge）
+    2. 删除本次没有出现的公司（职位已全部删除）
+    3. company_stats -> companies.stats（$lookup + $merge）
+    4. 没有任何职位的公司计数清零
+
+    Returns:
+        汇总：公司数、在线职位数、本周新增、远程职位数
+    """
+    # Mongo 日期精度为毫秒；后续步骤按 updated_at == now 识别本次写入的记录
+    now = now or datetime.utcnow()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+    db.jobs.aggregate(company_stats_pipeline(now), allowDiskUse=True)
+    removed = db.company_stats.delete_many({'updated_at': {'$ne': now}}).deleted_count
+    db.company_stats.aggregate(companies_merge_pipeline(now))
+    # 更新管道（而不是 $set 'stats.x'）：stats 为 null 的旧文档也能写入
+    db.companies.update_many(
+        {'stats.updated_at': {'$ne': now}},
+        [{'$set': {'stats': {'$mergeObjects': ['$stats', {**{f: 0 for f in COUNT_FIELDS}, 'updated_at': now}]}}}]
+    )
+
+    summary = next(db.company_stats.aggregate([
+        {'$group': {
+            '_id': None,
+            'companies': {'$sum': {'$cond': [{'$gt': ['$active_jobs', 0]}, 1, 0]}},
+            **{f: {'$sum': f'${f}'} for f in ('active_jobs', 'new_jobs_this_week', 'remote_jobs')},
+        }},
+        {'$project': {'_id': 0}},
+    ]), {'companies': 0, 'active_jobs': 0, 'new_jobs_this_week': 0, 'remote_jobs': 0})
+    summary['removed'] = removed
+    return summary
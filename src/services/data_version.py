@@ -0,0 +1,25 @@
+"""
+Data Version
+A counter in site_stats that changes whenever the data behind the public API
+changes (a crawl finished, company stats were rebuilt). API response caches
+(api/cache.py) key their entries by it, so bumping it makes every cached
+response stale at once, on every API instance.
+"""
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+# site_stats 中的文档 _id
+DATA_VERSION_ID = "data_version"
+
+
+def bump_data_version(db, reason: Optional[str] = None) -> int:
+    """版本号加一（同步 pymongo，供抓取脚本使用），返回新版本号"""
+    doc = db.site_stats.find_one_and_update(
+        {"_id": DATA_VERSION_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow(), "reason": reason}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["version"]
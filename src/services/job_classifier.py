@@ -0,0 +1,74 @@
+"""
+Job Classifier
+Assigns categories (Engineering, Product, AI, ...) to a job at ingestion time.
+The result is stored as an indexed `category` array, so the API category
+filter is an index lookup instead of a regex over title and skills.
+"""
+import re
+from typing import Dict, List
+
+# 规则有变化时递增，scripts/reclassify_jobs.py 会重新分类旧版本的职位
+CATEGORY_VERSION = 1
+
+# Category -> keywords, matched against the title and each skill
+CATEGORY_RULES: Dict[str, List[str]] = {
+    "Engineering": ["engineer", "developer", "software", "tech", "backend", "frontend", "fullstack", "infrastructure"],
+    "Product": ["product manager", "pm", "product owner"],
+    "Design": ["design", "ux", "ui", "product designer"],
+    "Marketing": ["marketing", "growth", "seo", "brand"],
+    "Sales": ["sales", "account executive", "ae", "business development"],
+    "Finance": ["finance", "accounting", "tax", "treasury"],
+    "Legal": ["legal", "law", "counsel", "compliance"],
+    "People": ["people", "hr", "recruiting", "talent"],
+    "AI": [
+        "ai engineer", "artificial intelligence", "machine learning", "deep learning",
+        "computer vision", "nlp", "natural language", "llm", "generative ai",
+        "gpt", "ai architect", "ml engineer", "ml ops", "mlops",
+        r"\bml\b", r"\bai\b"
+    ],
+}
+
+
+def _compile(keywords: List[str]) -> re.Pattern:
+    """
+    关键词编译为一个正则
+
+    关键词需要从单词边界开始匹配（"engineer" 仍能匹配 "engineering"），
+    3 个字符以内的缩写（ui / ae / pm / hr）要求整词匹配，避免 "build" 命中 "ui"。
+    """
+    parts = []
+    for keyword in keywords:
+        if keyword.startswith(r'\b'):
+            parts.append(keyword)
+        elif len(keyword) <= 3:
+            parts.append(rf'\b{re.escape(keyword)}\b')
+        else:
+            parts.append(rf'\b{re.escape(keyword)}')
+    return re.compile('|'.join(parts), re.I)
+
+
+_COMPILED_RULES = {category: _compile(keywords) for category, keywords in CATEGORY_RULES.items()}
+
+
+def classify(title: str, skills: List[str] = None) -> List[str]:
+    """
+    返回职位命中的所有类别（按 CATEGORY_RULES 顺序）
+    """
+    texts = [title or ''] + list(skills or [])
+    return [
+        category for category, pattern in _COMPILED_RULES.items()
+        if any(pattern.search(text) for text in texts)
+    ]
+
+
+def classify_job(job: Dict) -> Dict:
+    """
+    为职位生成分类字段（入库时调用）
+
+    Returns:
+        {'category': [...], 'category_version': CATEGORY_VERSION}
+    """
+    return {
+        'category': classify(job.get('title', ''), job.get('skills')),
+        'category_version': CATEGORY_VERSION,
+    }
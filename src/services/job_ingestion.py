@@ -0,0 +1,302 @@
+"""
+Job Ingestion Service
+Filters a company's scraped jobs and writes them to MongoDB in one bulk_write.
+"""
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+from .language_filter import LanguageFilterService
+from .search import build_search_fields
+from .job_classifier import classify_job
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestionResult:
+    """单个公司的入库统计"""
+    inserted: int = 0
+    updated: int = 0
+    touched: int = 0   # 内容未变，只刷新 last_seen_at
+    rejected: int = 0  # 本次被过滤（非IT / 要求日语）
+    skipped: int = 0   # 之前已被拒绝的职位
+    deactivated: int = 0  # 本次抓取中已从 board 消失而被下线的职位
+    write_errors: int = 0
+    boards_unchanged: int = 0  # board 未变化（304 / 摘要一致）而跳过的公司
+    boards_failed: int = 0  # 重试后仍抓取失败的公司
+    boards_open: int = 0  # 熔断中而跳过的公司
+
+    @property
+    def saved(self) -> int:
+        return self.inserted + self.updated
+
+    def add(self, other: 'IngestionResult'):
+        """累加另一个公司的统计（用于整次运行的汇总）"""
+        for key, value in asdict(other).items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class JobIngestionService:
+    """
+    职位入库阶段
+
+    每个公司只做固定次数的数据库往返：
+    1. 一次查询预取已拒绝的 content_hash
+    2. 一次查询预取已有的 job_id -> content_hash
+    3. 内存中比对后，一次无序 bulk_write 写入 jobs（另一次写入 rejected_jobs）
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def new_crawl_generation() -> str:
+        """生成抓取代次ID（ObjectId 字符串，按时间递增）"""
+        return str(ObjectId())
+
+    @staticmethod
+    def check_job(job: Dict) -> Optional[str]:
+        """
+        内容检查（仅IT职位 & 不要求日语）
+
+        Returns:
+            拒绝原因；符合要求时返回 None
+        """
+        job_text = job.get('description', '') + ' ' + job.get('title', '')
+
+        # A. Category Check (IT Only) - prioritize title, fall back to description
+        is_it, _ = LanguageFilterService.is_it_role(job['title'], is_title=True)
+        if not is_it:
+            is_it_desc, it_reason_desc = LanguageFilterService.is_it_role(job_text, is_title=False)
+            if not is_it_desc:
+                return f"Non-IT: {it_reason_desc}"
+
+        # B. Language Check (English Only)
+        is_eng, eng_reason = LanguageFilterService.is_english_only(job_text)
+        if not is_eng:
+            return f"Language: {eng_reason}"
+
+        return None
+
+    def ingest(self, company_name: str, jobs: List[Dict], crawl_generation: str) -> IngestionResult:
+        """
+        过滤并批量写入一个公司的职位
+
+        Args:
+            company_name: 公司名称（仅用于日志）
+            jobs: 抓取器返回的标准化职位
+            crawl_generation: 本次抓取代次，写入每个被看到的职位
+
+        Returns:
+            IngestionResult
+        """
+        result = IngestionResult()
+        rejected_ops = []
+        accepted: Dict[str, Dict] = {}
+        seen_ids: List[str] = []
+
+        full_jobs = []
+        for job in jobs:
+            # 列表指纹未变的轻量记录：不过滤、不比对，只刷新 last_seen_at
+            if job.get('seen_only'):
+                if job.get('rejected'):
+                    result.skipped += 1
+                else:
+                    seen_ids.append(job['job_id'])
+            else:
+                full_jobs.append(job)
+
+        # 先一次性查出已知不符合要求的内容哈希，这些职位不再重复过滤
+        if full_jobs:
+            known_rejected = {
+                doc['content_hash'] for doc in self.db.rejected_jobs.find(
+                    {'content_hash': {'$in': list({j['content_hash'] for j in full_jobs})}},
+                    {'content_hash': 1}
+                )
+            }
+        else:
+            known_rejected = set()
+
+        for job in full_jobs:
+            if job['content_hash'] in known_rejected:
+                logger.debug(f"⏭️ {company_name}: 跳过已知不符合要求的职位 '{job['title']}'")
+                result.skipped += 1
+                continue
+
+            # 解析进程池已经完成过滤时直接使用其结果
+            reason = job.pop('rejection_reason') if 'rejection_reason' in job else self.check_job(job)
+            if reason:
+                logger.info(f"🚫 {company_name}: 职位 '{job['title']}' 被过滤: {reason}")
+                rejected_ops.append(UpdateOne(
+                    {'content_hash': job['content_hash']},
+                    {'$set': {
+                        'title': job['title'],
+                        'company': job['company'],
+                        'list_fingerprint': job.get('list_fingerprint'),
+                        'rejected_at': datetime.utcnow(),
+                        'reason': reason
+                    }},
+                    upsert=True
+                ))
+                result.rejected += 1
+                continue
+            # 同一个 board 内重复的 job_id 只保留最后一个
+            accepted[job['job_id']] = job
+
+        if accepted:
+            existing = {
+                doc['job_id']: doc.get('content_hash') for doc in self.db.jobs.find(
+                    {'job_id': {'$in': list(accepted)}},
+                    {'job_id': 1, 'content_hash': 1}
+                )
+            }
+        else:
+            existing = {}
+
+        ops = []
+        now = datetime.utcnow()
+        for job_id in dict.fromkeys(seen_ids):
+            if job_id in accepted:
+                continue
+            ops.append(UpdateOne(
+                {'job_id': job_id},
+                {'$set': {'last_seen_at': now, 'crawl_generation': crawl_generation, 'is_active': True}}
+            ))
+            result.touched += 1
+
+        for job_id, job in accepted.items():
+            job['crawl_generation'] = crawl_generation
+            if job_id not in existing:
+                self._enrich(job)
+                ops.append(InsertOne(job))
+                result.inserted += 1
+            elif existing[job_id] == job['content_hash']:
+                # 哈希一致，只更新 last_seen_at（以及列表指纹，下次即可走快速路径）
+                ops.append(UpdateOne(
+                    {'job_id': job_id},
+                    {'$set': {
+                        'last_seen_at': job['last_seen_at'],
+                        'crawl_generation': crawl_generation,
+                        'is_active': True,
+                        'list_fingerprint': job.get('list_fingerprint')
+                    }}
+                ))
+                result.touched += 1
+            else:
+                # 哈希不一致，全量更新（重建检索词与分类）
+                self._enrich(job)
+                ops.append(UpdateOne({'job_id': job_id}, {'$set': job}, upsert=True))
+                result.updated += 1
+
+        result.write_errors += self._bulk_write(self.db.rejected_jobs, rejected_ops, company_name)
+        result.write_errors += self._bulk_write(self.db.jobs, ops, company_name)
+        return result
+
+    @classmethod
+    def prepare(cls, job: Dict):
+        """
+        在入库前预先完成过滤和派生字段（供解析进程池在工作进程中调用）
+
+        过滤结果写入 job['rejection_reason']，由 ingest 取出；
+        通过过滤的职位同时补充检索词与分类，ingest 不再重复计算。
+        """
+        if job.get('seen_only') or job.get('parse_failed'):
+            return
+        job['rejection_reason'] = cls.check_job(job)
+        if job['rejection_reason'] is None:
+            cls._enrich(job)
+
+    @staticmethod
+    def _enrich(job: Dict):
+        """写入前补充派生字段：检索词、分类（已由 prepare 计算过时跳过）"""
+        if 'search_terms' in job:
+            return
+        job.update(build_search_fields(job))
+        job.update(classify_job(job))
+
+    def sweep(self, company_name: str, crawl_generation: str) -> int:
+        """
+        标记-清除：下线该公司本代次未被看到的职位
+
+        只应在该公司抓取并入库成功后调用，抓取失败的公司保留原有职位。
+
+        Returns:
+            下线的职位数
+        """
+        res = self.db.jobs.update_many(
+            {
+                'company': company_name,
+                'is_active': True,
+                'crawl_generation': {'$ne': crawl_generation}
+            },
+            {'$set': {'is_active': False, 'deactivated_at': datetime.utcnow()}}
+        )
+        return res.modified_count
+
+    def known_fingerprints(self, company_name: str) -> Tuple[Dict[str, str], Set[str]]:
+        """
+        预取该公司的列表指纹（抓取前调用，交给抓取器跳过未变化的职位）
+
+        Returns:
+            (job_id -> list_fingerprint, 已拒绝职位的指纹集合)；
+            没有指纹的在线职位也包含在内（指纹为 None），抓取器据此判断职位是否已入库
+        """
+        jobs = {
+            doc['job_id']: doc.get('list_fingerprint') for doc in self.db.jobs.find(
+                {'company': company_name, '$or': [{'list_fingerprint': {'$ne': None}}, {'is_active': True}]},
+                {'job_id': 1, 'list_fingerprint': 1}
+            )
+        }
+        rejected = {
+            doc['list_fingerprint'] for doc in self.db.rejected_jobs.find(
+                {'company': company_name, 'list_fingerprint': {'$ne': None}},
+                {'list_fingerprint': 1}
+            )
+        }
+        return jobs, rejected
+
+    def touch_unchanged_board(self, company_name: str, crawl_generation: str) -> int:
+        """
+        Board 未变化：不解析、不过滤，一次 update_many 刷新该公司在线职位的 last_seen_at
+
+        不做清除（职位集合没有变化）。
+
+        Returns:
+            刷新的职位数
+        """
+        res = self.db.jobs.update_many(
+            {'company': company_name, 'is_active': True},
+            {'$set': {'last_seen_at': datetime.utcnow(), 'crawl_generation': crawl_generation}}
+        )
+        return res.modified_count
+
+    def save_board_cache(self, company_id, board_cache: Dict):
+        """保存 board 校验信息（ETag / Last-Modified / 摘要），供下次条件请求使用"""
+        self.db.companies.update_one({'_id': company_id}, {'$set': {'board_cache': board_cache}})
+
+    def _bulk_write(self, collection, ops: List, company_name: str) -> int:
+        """
+        无序批量写入；单条失败不影响其余操作
+
+        Returns:
+            失败的操作数
+        """
+        if not ops:
+            return 0
+        try:
+            collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            logger.warning(f"⚠️ {company_name}: {collection.name} 批量写入有 {len(errors)} 条失败: {errors[:1]}")
+            return max(len(errors), 1)
+        return 0
@@ -3,7 +3,84 @@ Language Filter Service
 Detects if a job role requires Japanese proficiency and categorizes IT roles.
 """
 import re
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
+
+
+_WORD_PATTERN = re.compile(r'\\b(\w+)\\b')
+
+
+def _trie_regex(words: List[str]) -> str:
+    """
+    把单词列表构建成前缀树形式的正则（data|database -> data(?:base)?）
+
+    Python 的 re 对普通的多分支 alternation 会在每个位置逐个尝试所有分支，
+    前缀树形式每个字符只走一个分支，效果接近 Aho-Corasick。
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        if list(node) == ['']:
+            return ''
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        regex = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            regex = f'(?:{regex})?'
+        return regex
+
+    return build(trie)
+
+
+class PatternSet:
+    """
+    一组关键词正则的单遍匹配器
+
+    first_match() 的结果和"按列表顺序逐个 re.search，返回第一个命中的模式"完全一致：
+    - 形如 \\bword\\b 的模式合并成一个前缀树正则，扫描一遍文本得到所有命中的单词
+      （整词匹配之间不会重叠），取其中列表下标最小的
+    - 其余模式（多词、无单词边界、非 ASCII）预编译后按顺序检查，
+      只检查下标比当前结果更小的模式
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._word_index: Dict[str, int] = {}
+        self._others: List[Tuple[int, re.Pattern]] = []
+        for index, pattern in enumerate(self.patterns):
+            m = _WORD_PATTERN.fullmatch(pattern)
+            if m:
+                self._word_index.setdefault(m.group(1), index)
+            else:
+                self._others.append((index, re.compile(pattern)))
+        self._words = None
+        if self._word_index:
+            self._words = re.compile(r'\b(?:' + _trie_regex(list(self._word_index)) + r')\b')
+        self._min_word_index = min(self._word_index.values(), default=len(self.patterns))
+
+    def first_match(self, text: str) -> Optional[str]:
+        """返回列表中最靠前的命中模式，没有命中返回 None"""
+        best = len(self.patterns)
+        if self._words is not None:
+            for m in self._words.finditer(text):
+                index = self._word_index[m.group()]
+                if index < best:
+                    best = index
+                    if best == self._min_word_index:
+                        break
+
+        for index, pattern in self._others:
+            if index >= best:
+                break
+            if pattern.search(text):
+                best = index
+                break
+
+        return self.patterns[best] if best < len(self.patterns) else None
+
 
 class LanguageFilterService:
     
@@ -71,27 +148,19 @@ class LanguageFilterService:
             return False, "No text provided"
         
         text_lower = text.lower()
+        it_match = _IT_ROLE.first_match(text_lower)
         
         # 1. If it's the title, check for explicit non-IT deal breakers
-        if is_title:
-            for pattern in cls.NON_IT_ROLE_TITLES:
-                if re.search(pattern, text_lower):
-                    # But wait, "Sales Engineer" is tech! "Marketing Technology" is tech!
-                    # "Recruiting System Admin" is tech!
-                    # Let's check if it ALSO has tech keywords.
-                    has_tech = False
-                    for tech_pattern in cls.IT_ROLE_KEYWORDS:
-                        if re.search(tech_pattern, text_lower):
-                            has_tech = True
-                            break
-                    
-                    if not has_tech:
-                        return False, f"Detected non-IT role keyword in title: {pattern}"
+        if is_title and it_match is None:
+            # "Sales Engineer" / "Marketing Technology" are tech, so a non-IT
+            # keyword only rejects the title when there are no tech keywords
+            non_it_match = _NON_IT_TITLE.first_match(text_lower)
+            if non_it_match is not None:
+                return False, f"Detected non-IT role keyword in title: {non_it_match}"
         
         # 2. Check for IT keywords
-        for pattern in cls.IT_ROLE_KEYWORDS:
-            if re.search(pattern, text_lower):
-                return True, f"Detected IT role keyword: {pattern}"
+        if it_match is not None:
+            return True, f"Detected IT role keyword: {it_match}"
                 
         return False, "No IT keywords found"
 
@@ -106,18 +175,25 @@ class LanguageFilterService:
         text_lower = text.lower()
         
         # 1. Check for explicit "No Japanese Required"
-        for pattern in cls.ENGLISH_ONLY_KEYWORDS:
-            if re.search(pattern, text_lower):
-                return True, f"Found explicit English-only keyword: {pattern}"
+        pattern = _ENGLISH_ONLY.first_match(text_lower)
+        if pattern is not None:
+            return True, f"Found explicit English-only keyword: {pattern}"
                 
         # 2. Check for Japanese requirements
-        for pattern in cls.JAPANESE_REQUIRED_KEYWORDS:
-            if re.search(pattern, text_lower):
-                return False, f"Detected Japanese requirement keyword: {pattern}"
+        pattern = _JAPANESE_REQUIRED.first_match(text_lower)
+        if pattern is not None:
+            return False, f"Detected Japanese requirement keyword: {pattern}"
                 
         # 3. Default to True
         return True, "No specific Japanese requirements detected"
 
+
+# Compiled once at import; rebuild these if the keyword lists are changed at runtime
+_IT_ROLE = PatternSet(LanguageFilterService.IT_ROLE_KEYWORDS)
+_NON_IT_TITLE = PatternSet(LanguageFilterService.NON_IT_ROLE_TITLES)
+_ENGLISH_ONLY = PatternSet(LanguageFilterService.ENGLISH_ONLY_KEYWORDS)
+_JAPANESE_REQUIRED = PatternSet(LanguageFilterService.JAPANESE_REQUIRED_KEYWORDS)
+
 if __name__ == "__main__":
     # Tests
     test_cases = [
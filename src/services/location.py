@@ -0,0 +1,344 @@
+"""
+Location Normalization
+Small gazetteer that turns free-text job locations ("SF / NYC", "Remote - US",
+"Tokyo, Japan") into structured facets stored on each job:
+
+    country    - ISO 3166 alpha-2 codes, e.g. ['US', 'GB']
+    city       - canonical city names, e.g. ['San Francisco', 'London']
+    region     - coarse regions, e.g. ['North America', 'Europe']
+    is_remote  - posting allows remote work
+
+The same gazetteer resolves the API's location filter values, so filtering is
+equality / $in on indexed fields instead of regexes over location strings.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+# code -> (name, region, aliases)
+COUNTRIES: Dict[str, Tuple[str, str, List[str]]] = {
+    'US': ('United States', 'North America', ['united states', 'usa', 'u.s.', 'u.s.a.', 'us']),
+    'CA': ('Canada', 'North America', ['canada']),
+    'MX': ('Mexico', 'Latin America', ['mexico']),
+    'BR': ('Brazil', 'Latin America', ['brazil', 'brasil']),
+    'AR': ('Argentina', 'Latin America', ['argentina']),
+    'CO': ('Colombia', 'Latin America', ['colombia']),
+    'GB': ('United Kingdom', 'Europe', ['united kingdom', 'uk', 'u.k.', 'england', 'scotland', 'great britain']),
+    'IE': ('Ireland', 'Europe', ['ireland']),
+    'DE': ('Germany', 'Europe', ['germany', 'deutschland']),
+    'FR': ('France', 'Europe', ['france']),
+    'NL': ('Netherlands', 'Europe', ['netherlands', 'the netherlands']),
+    'ES': ('Spain', 'Europe', ['spain']),
+    'PT': ('Portugal', 'Europe', ['portugal']),
+    'IT': ('Italy', 'Europe', ['italy']),
+    'CH': ('Switzerland', 'Europe', ['switzerland']),
+    'SE': ('Sweden', 'Europe', ['sweden']),
+    'DK': ('Denmark', 'Europe', ['denmark']),
+    'NO': ('Norway', 'Europe', ['norway']),
+    'FI': ('Finland', 'Europe', ['finland']),
+    'PL': ('Poland', 'Europe', ['poland']),
+    'CZ': ('Czech Republic', 'Europe', ['czech republic', 'czechia']),
+    'AT': ('Austria', 'Europe', ['austria']),
+    'BE': ('Belgium', 'Europe', ['belgium']),
+    'RO': ('Romania', 'Europe', ['romania']),
+    'UA': ('Ukraine', 'Europe', ['ukraine']),
+    'IL': ('Israel', 'Middle East', ['israel']),
+    'AE': ('United Arab Emirates', 'Middle East', ['united arab emirates', 'uae']),
+    'IN': ('India', 'Asia Pacific', ['india']),
+    'JP': ('Japan', 'Asia Pacific', ['japan', '日本']),
+    'CN': ('China', 'Asia Pacific', ['china', '中国']),
+    'HK': ('Hong Kong', 'Asia Pacific', ['hong kong']),
+    'TW': ('Taiwan', 'Asia Pacific', ['taiwan']),
+    'KR': ('South Korea', 'Asia Pacific', ['south korea', 'korea']),
+    'SG': ('Singapore', 'Asia Pacific', ['singapore']),
+    'AU': ('Australia', 'Asia Pacific', ['australia']),
+    'NZ': ('New Zealand', 'Asia Pacific', ['new zealand']),
+}
+
+# canonical city -> (country code, extra aliases)
+CITIES: Dict[str, Tuple[str, List[str]]] = {
+    'San Francisco': ('US', ['sf', 'san francisco bay area', 'bay area']),
+    'New York': ('US', ['nyc', 'new york city', 'brooklyn', 'manhattan']),
+    'Seattle': ('US', []),
+    'Austin': ('US', []),
+    'Boston': ('US', ['cambridge, ma']),
+    'Los Angeles': ('US', ['santa monica']),
+    'Chicago': ('US', []),
+    'Denver': ('US', ['boulder']),
+    'Mountain View': ('US', []),
+    'Palo Alto': ('US', []),
+    'Menlo Park': ('US', []),
+    'Sunnyvale': ('US', []),
+    'San Jose': ('US', []),
+    'San Mateo': ('US', []),
+    'Redwood City': ('US', []),
+    'San Diego': ('US', []),
+    'Washington DC': ('US', ['washington, dc', 'washington d.c.']),
+    'Atlanta': ('US', []),
+    'Miami': ('US', []),
+    'Portland': ('US', []),
+    'Toronto': ('CA', []),
+    'Vancouver': ('CA', []),
+    'Montreal': ('CA', ['montréal']),
+    'London': ('GB', []),
+    'Manchester': ('GB', []),
+    'Edinburgh': ('GB', []),
+    'Dublin': ('IE', []),
+    'Berlin': ('DE', []),
+    'Munich': ('DE', ['münchen']),
+    'Hamburg': ('DE', []),
+    'Frankfurt': ('DE', []),
+    'Paris': ('FR', []),
+    'Amsterdam': ('NL', []),
+    'Madrid': ('ES', []),
+    'Barcelona': ('ES', []),
+    'Lisbon': ('PT', []),
+    'Zurich': ('CH', ['zürich']),
+    'Stockholm': ('SE', []),
+    'Copenhagen': ('DK', []),
+    'Warsaw': ('PL', []),
+    'Tel Aviv': ('IL', []),
+    'Bangalore': ('IN', ['bengaluru']),
+    'Hyderabad': ('IN', []),
+    'Mumbai': ('IN', []),
+    'Tokyo': ('JP', ['東京']),
+    'Osaka': ('JP', ['大阪']),
+    'Kyoto': ('JP', ['京都']),
+    'Fukuoka': ('JP', []),
+    'Yokohama': ('JP', []),
+    'Shanghai': ('CN', ['上海']),
+    'Beijing': ('CN', ['北京']),
+    'Shenzhen': ('CN', ['深圳']),
+    'Hangzhou': ('CN', ['杭州']),
+    'Seoul': ('KR', []),
+    'Taipei': ('TW', []),
+    'Sydney': ('AU', []),
+    'Melbourne': ('AU', []),
+    'Sao Paulo': ('BR', ['são paulo']),
+    'Buenos Aires': ('AR', []),
+}
+
+# 太短、容易和普通单词冲突的城市简称（"La Jolla"、"La Défense"）：
+# 只有整个地点或某个地点逗号前的整段就是简称时才识别（"LA"、"LA, CA"、"SF / LA"）
+SEGMENT_CITY_ALIASES: Dict[str, str] = {
+    'la': 'Los Angeles',
+    'dc': 'Washington DC',
+}
+
+REGION_ALIASES: Dict[str, List[str]] = {
+    'North America': ['north america', 'americas'],
+    'Latin America': ['latin america', 'latam'],
+    'Europe': ['europe', 'emea', 'eu'],
+    'Middle East': ['middle east'],
+    'Asia Pacific': ['asia pacific', 'apac', 'asia'],
+}
+
+US_STATES = {
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA',
+    'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+    'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT',
+    'VA', 'WA', 'WV', 'WI', 'WY', 'DC',
+}
+US_STATE_NAMES = [
+    'california', 'new york state', 'washington state', 'texas', 'massachusetts', 'colorado',
+    'illinois', 'florida', 'georgia', 'oregon', 'virginia', 'new jersey', 'pennsylvania',
+    'north carolina', 'utah', 'arizona', 'michigan', 'minnesota', 'ohio',
+]
+
+# 既是州缩写又是地名表中国家代码的缩写（CA、IN、AR、DE 等）：没有其他线索时不判断国家
+AMBIGUOUS_CODES = US_STATES & set(COUNTRIES)
+
+REMOTE_RE = re.compile(r'\b(remote|anywhere|work from home|wfh|distributed)\b|リモート|远程', re.I)
+# "Austin, TX" / "Porto, PT" / "Remote (US: CA, NY)" - uppercase codes after a comma/colon/slash
+_CODE_RE = re.compile(r'(?:,|:|/)\s*([A-Z]{2})\b')
+# 一个字符串中的多个地点（"SF / LA"、"London; Berlin"）
+_SEGMENT_SPLIT_RE = re.compile(r'[/;|\n]')
+
+# alias -> ('country' | 'city' | 'region', value)
+_ALIASES: Dict[str, Tuple[str, str]] = {}
+for _code, (_name, _region, _aliases) in COUNTRIES.items():
+    for _alias in [_name.lower()] + _aliases:
+        _ALIASES[_alias] = ('country', _code)
+for _state in US_STATE_NAMES:
+    _ALIASES[_state] = ('country', 'US')
+for _region, _aliases in REGION_ALIASES.items():
+    for _alias in _aliases:
+        _ALIASES[_alias] = ('region', _region)
+# Cities last so e.g. "new york" resolves to the city (its country is implied)
+for _city, (_code, _aliases) in CITIES.items():
+    for _alias in [_city.lower()] + _aliases:
+        _ALIASES[_alias] = ('city', _city)
+
+# Longest alias first so "new york city" wins over "new york"; ASCII-only
+# boundaries so CJK names still match inside e.g. "東京都"
+_ALIAS_RE = re.compile(
+    r'(?<![a-z0-9.])(' + '|'.join(re.escape(a) for a in sorted(_ALIASES, key=len, reverse=True)) + r')(?![a-z0-9])'
+)
+
+
+def _add(values: List[str], value: str):
+    if value not in values:
+        values.append(value)
+
+
+def _resolve_codes(codes: List[str], regions: List[str]) -> List[str]:
+    """
+    把地点中的两位大写代码解析成国家
+
+    1. 地名表中的国家代码（且不是州缩写）："Porto, PT" -> PT
+    2. 州缩写（不会被误认为国家的）："Austin, TX" -> US
+    3. 只有 CA / IN / AR 这类有歧义的代码时，只在已识别的大区和该国家一致时
+       判断为该国家（"Remote, IN - APAC" -> IN），否则不判断
+    """
+    countries = [code for code in codes if code in COUNTRIES and code not in US_STATES]
+    if countries:
+        return countries
+    if any(code in US_STATES and code not in AMBIGUOUS_CODES for code in codes):
+        return ['US']
+    return [code for code in codes
+            if code in AMBIGUOUS_CODES and COUNTRIES[code][1] in regions and COUNTRIES[code][1] != 'North America']
+
+
+def parse_location(text: Optional[str]) -> Dict:
+    """
+    解析一个地点字符串
+
+    Returns:
+        {'country': [...], 'city': [...], 'region': [...], 'is_remote': bool}
+    """
+    result = {'country': [], 'city': [], 'region': [], 'is_remote': False}
+    if not text:
+        return result
+
+    result['is_remote'] = bool(REMOTE_RE.search(text))
+
+    lowered = text.lower()
+    for match in _ALIAS_RE.finditer(lowered):
+        kind, value = _ALIASES[match.group(1)]
+        if kind == 'city':
+            _add(result['city'], value)
+            _add(result['country'], CITIES[value][0])
+        elif kind == 'country':
+            _add(result['country'], value)
+        else:
+            _add(result['region'], value)
+
+    for segment in _SEGMENT_SPLIT_RE.split(lowered):
+        city = SEGMENT_CITY_ALIASES.get(segment.split(',')[0].strip())
+        if city:
+            _add(result['city'], city)
+            _add(result['country'], CITIES[city][0])
+
+    # 国家名、城市都没有识别出来时才看 ", XX" 形式的代码
+    if not result['country']:
+        for code in _resolve_codes(_CODE_RE.findall(text), result['region']):
+            _add(result['country'], code)
+
+    for code in result['country']:
+        _add(result['region'], COUNTRIES[code][1])
+    return result
+
+
+def normalize_location(location: Optional[str], company_location: Optional[str] = None,
+                       is_remote: bool = False) -> Dict:
+    """
+    生成职位的地点字段（入库时调用）
+
+    职位地点中没有可识别的国家时，退回到公司所在地（和旧的 location/company_location
+    双字段匹配保持一致）。
+    """
+    facets = parse_location(location)
+    if not facets['country'] and company_location:
+        fallback = parse_location(company_location)
+        facets['country'] = fallback['country']
+        facets['region'] = list(dict.fromkeys(facets['region'] + fallback['region']))
+    facets['is_remote'] = facets['is_remote'] or bool(is_remote)
+    return facets
+
+
+def resolve_filter_value(value: str) -> Optional[Tuple[str, object]]:
+    """
+    把一个筛选值（"USA" / "Tokyo" / "Europe" / "Remote"）映射到 (字段, 值)
+
+    Returns:
+        ('country', 'US') 等；无法识别时返回 None
+    """
+    key = value.strip().lower()
+    if REMOTE_RE.fullmatch(key):
+        return ('is_remote', True)
+    if key.upper() in COUNTRIES and len(key) == 2:
+        return ('country', key.upper())
+    if key in _ALIASES:
+        return _ALIASES[key]
+    if key in SEGMENT_CITY_ALIASES:
+        return ('city', SEGMENT_CITY_ALIASES[key])
+    return None
+
+
+def location_filter(values: List[str]) -> Optional[Dict]:
+    """
+    把多个筛选值组合成一个 MongoDB 条件（多个值之间是 OR）
+
+    可识别的值使用 country/city/region/is_remote 上的等值或 $in 条件；
+    未收录在地名表中的值退回到 location/company_location 的正则匹配。
+    """
+    grouped: Dict[str, List] = {}
+    conditions = []
+    for value in values:
+        if not value:
+            continue
+        resolved = resolve_filter_value(value)
+        if resolved:
+            field, target = resolved
+            grouped.setdefault(field, [])
+            if target not in grouped[field]:
+                grouped[field].append(target)
+        else:
+            pattern = re.escape(value.strip())
+            conditions.append({'$or': [
+                {'location': {'$regex': pattern, '$options': 'i'}},
+                {'company_location': {'$regex': pattern, '$options': 'i'}},
+            ]})
+
+    for field, targets in grouped.items():
+        if field == 'is_remote':
+            # remote_type 由各抓取器根据描述判断，和 is_remote 一起保留旧的匹配范围
+            conditions.append({'$or': [{'is_remote': True}, {'remote_type': 'Remote'}]})
+        elif len(targets) == 1:
+            conditions.append({field: targets[0]})
+        else:
+            conditions.append({field: {'$in': targets}})
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {'$or': conditions}
+
+
+if __name__ == "__main__":
+    # (location, expected country, expected city)
+    test_cases = [
+        ("SF / NYC", ['US'], ['San Francisco', 'New York']),
+        ("Tokyo, Japan", ['JP'], ['Tokyo']),
+        ("Boise, ID", ['US'], []),
+        ("Remote (US: CA, NY)", ['US'], []),
+        ("Bengaluru, IN", ['IN'], ['Bangalore']),
+        ("Porto, PT", ['PT'], []),
+        ("LA", ['US'], ['Los Angeles']),
+        ("LA, CA", ['US'], ['Los Angeles']),
+        ("SF / LA", ['US'], ['San Francisco', 'Los Angeles']),
+        ("DC", ['US'], ['Washington DC']),
+        ("La Jolla, CA", [], []),
+        ("La Défense, Paris, France", ['FR'], ['Paris']),
+        ("Buenos Aires, AR", ['AR'], ['Buenos Aires']),
+        ("Córdoba, AR", [], []),
+        ("Remote, IN", [], []),
+        ("Remote, IN - APAC", ['IN'], []),
+    ]
+
+    failed = 0
+    for text, country, city in test_cases:
+        facets = parse_location(text)
+        ok = facets['country'] == country and facets['city'] == city
+        failed += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {text:30} -> country={facets['country']} city={facets['city']}")
+    if failed:
+        raise SystemExit(f"{failed} location case(s) failed")
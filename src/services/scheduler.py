@@ -0,0 +1,106 @@
+"""
+Crawl Scheduler
+Mongo-backed due-queue over Company.schedule.
+
+Each run only crawls companies whose schedule.next_scrape_at has passed,
+highest priority first. After a crawl the frequency adapts to how often the
+board actually changes: boards that changed are crawled more often, boards
+that didn't drift towards MAX_FREQUENCY_HOURS.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlScheduler:
+    """
+    抓取调度（基于 companies.schedule 的到期队列）
+
+    - priority 越大越优先（1-5）
+    - 有变化：频率减半（更常抓取），不低于 MIN_FREQUENCY_HOURS
+    - 无变化：频率 ×1.5，不高于 MAX_FREQUENCY_HOURS
+    - 抓取失败：频率不变
+    """
+
+    DEFAULT_FREQUENCY_HOURS = 12
+    MIN_FREQUENCY_HOURS = float(os.getenv('SCRAPE_MIN_FREQUENCY_HOURS', 6))
+    MAX_FREQUENCY_HOURS = float(os.getenv('SCRAPE_MAX_FREQUENCY_HOURS', 72))
+    SPEEDUP_FACTOR = 0.5
+    BACKOFF_FACTOR = 1.5
+    # cron 每 6 小时触发一次，而 next_scrape_at 是抓取结束时写的；
+    # 提前一点视为到期，避免 6 小时的间隔因几秒误差被推迟到下一轮
+    DUE_GRACE = timedelta(minutes=30)
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def due_companies(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        到期的在线公司，按 priority 降序、next_scrape_at 升序（从未抓取过的排最前）
+        """
+        now = now or datetime.utcnow()
+        cursor = self.db.companies.find({
+            'is_active': True,
+            '$or': [
+                {'schedule.next_scrape_at': None},
+                {'schedule.next_scrape_at': {'$lte': now + self.DUE_GRACE}},
+            ]
+        }).sort([
+            ('schedule.priority', DESCENDING),
+            ('schedule.next_scrape_at', ASCENDING),
+        ])
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    @classmethod
+    def next_frequency(cls, frequency_hours: float, changed: Optional[bool]) -> float:
+        """根据本次抓取是否发现变化调整抓取间隔"""
+        if changed is None:
+            return frequency_hours
+        factor = cls.SPEEDUP_FACTOR if changed else cls.BACKOFF_FACTOR
+        return round(min(cls.MAX_FREQUENCY_HOURS, max(cls.MIN_FREQUENCY_HOURS, frequency_hours * factor)), 2)
+
+    def record_crawl(self, company: Dict, changed: Optional[bool], now: Optional[datetime] = None) -> Dict:
+        """
+        写回 last_scraped_at / next_scrape_at / frequency_hours
+
+        Args:
+            company: 公司文档
+            changed: 本次是否有新增/更新/下线的职位；抓取失败时为 None
+
+        Returns:
+            写入的 schedule 字段
+        """
+        now = now or datetime.utcnow()
+        schedule = company.get('schedule') or {}
+        frequency = self.next_frequency(
+            schedule.get('frequency_hours') or self.DEFAULT_FREQUENCY_HOURS, changed
+        )
+        fields = {
+            'schedule.frequency_hours': frequency,
+            'schedule.last_scraped_at': now,
+        }
+        if changed:
+            fields['schedule.last_changed_at'] = now
+        # $max：不覆盖熔断器（src/scrapers/resilience.py）推迟的下次抓取时间
+        next_scrape_at = {'schedule.next_scrape_at': now + timedelta(hours=frequency)}
+        self.db.companies.update_one({'_id': company['_id']}, {'$set': fields, '$max': next_scrape_at})
+        return {**fields, **next_scrape_at}
+
+    def record_skip(self, company: Dict, now: Optional[datetime] = None) -> Dict:
+        """
+        本轮选中但没有抓取（例如没有对应的抓取器）：只推迟 next_scrape_at，
+        不写 last_scraped_at / frequency_hours，last_scraped_at 始终表示真正的抓取时间
+        """
+        now = now or datetime.utcnow()
+        frequency = (company.get('schedule') or {}).get('frequency_hours') or self.DEFAULT_FREQUENCY_HOURS
+        next_scrape_at = {'schedule.next_scrape_at': now + timedelta(hours=frequency)}
+        self.db.companies.update_one({'_id': company['_id']}, {'$max': next_scrape_at})
+        return next_scrape_at
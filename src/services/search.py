@@ -0,0 +1,136 @@
+"""
+Job Search Index
+Tokenizes and stems job text into per-job term arrays stored on the document,
+so keyword search becomes an indexed multikey lookup instead of regex scans.
+
+Stored fields:
+    search_terms   - all stems from title, company, skills and description
+    search_fields  - stems per boosted field {title, company, skills}
+
+Query: every query stem must be in search_terms (AND); relevance is the
+weighted overlap of query stems with each field.
+"""
+import re
+from typing import Dict, Iterable, List
+
+# 检索字段权重：标题 > 公司 > 技能 > 描述
+FIELD_WEIGHTS = {
+    'title': 10,
+    'company': 8,
+    'skills': 5,
+    'description': 1,
+}
+
+SEARCH_FIELDS = ('search_terms', 'search_fields')
+
+# Keep tech tokens like c++, c#, node.js, .net intact
+_TOKEN_RE = re.compile(r"\.?[^\W_][\w+#.]*", re.UNICODE)
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or our
+that the their this to was we were will with you your
+""".split())
+
+
+def _strip_double(stem: str) -> str:
+    """running -> runn -> run"""
+    if len(stem) > 3 and stem[-1] == stem[-2] and stem[-1] not in 'lsz':
+        return stem[:-1]
+    return stem
+
+
+def stem(token: str) -> str:
+    """
+    轻量英文词干提取（复数、-ing、-ed）
+
+    只处理纯字母的词，c++ / node.js / k8s 等技术词原样保留。
+    建索引和查询使用同一个函数，因此只需要保持一致，不需要语言学上完全正确。
+    """
+    if len(token) <= 3 or not token.isalpha() or not token.isascii():
+        return token
+
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('sses'):
+        return token[:-2]
+    if token.endswith('es') and token[-3] in 'xz' or token.endswith(('ches', 'shes')):
+        return token[:-2]
+    if token.endswith('s') and not token.endswith(('ss', 'us')):
+        # analysis / basis 保留，apis -> api
+        if not (token.endswith('is') and len(token) > 4):
+            return token[:-1]
+        return token
+    if token.endswith('ing') and len(token) - 3 >= 4:
+        return _strip_double(token[:-3])
+    if token.endswith('ed') and len(token) - 2 >= 4:
+        return _strip_double(token[:-2])
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """小写、分词、去停用词并提取词干（保留顺序，可能有重复）"""
+    if not text:
+        return []
+    stems = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.rstrip('.')
+        if not token or token in STOPWORDS:
+            continue
+        stems.append(stem(token))
+    return stems
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    return sorted(set(values))
+
+
+def build_search_fields(job: Dict) -> Dict:
+    """
+    为职位生成检索字段（入库时调用）
+
+    Returns:
+        {'search_terms': [...], 'search_fields': {'title': [...], 'company': [...], 'skills': [...]}}
+    """
+    title = tokenize(job.get('title', ''))
+    company = tokenize(job.get('company', ''))
+    skills = tokenize(' '.join(job.get('skills') or []))
+    description = tokenize(job.get('description', ''))
+
+    return {
+        'search_terms': _unique(title + company + skills + description),
+        'search_fields': {
+            'title': _unique(title),
+            'company': _unique(company),
+            'skills': _unique(skills),
+        },
+    }
+
+
+def parse_query(q: str) -> List[str]:
+    """把查询字符串转换为去重后的词干列表"""
+    return list(dict.fromkeys(tokenize(q or '')))
+
+
+def match_stage(stems: List[str]) -> Dict:
+    """AND 语义：所有词干都必须出现"""
+    return {'search_terms': {'$all': stems}}
+
+
+def score_expression(stems: List[str]) -> Dict:
+    """
+    相关度 = 各字段命中词数 × 字段权重
+
+    已经通过 match_stage 的文档一定包含全部词干，描述字段的基础分是常数，
+    标题/公司/技能命中越多排名越靠前。
+    """
+    terms = [{'$literal': s} for s in stems]
+    parts = [FIELD_WEIGHTS['description'] * len(stems)]
+    for field in ('title', 'company', 'skills'):
+        parts.append({'$multiply': [
+            FIELD_WEIGHTS[field],
+            {'$size': {'$setIntersection': [
+                {'$ifNull': [f'$search_fields.{field}', []]},
+                terms
+            ]}}
+        ]})
+    return {'$add': parts}